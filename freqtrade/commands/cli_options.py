@@ -222,6 +222,14 @@ AVAILABLE_CLI_OPTIONS = {
         default=constants.BACKTEST_CACHE_DEFAULT,
         choices=constants.BACKTEST_CACHE_AGE,
     ),
+    "backtest_engine": Arg(
+        '--backtest-engine',
+        help='Candle loop implementation used for backtesting and hyperopt. '
+        '`columnar` keeps candles as numpy arrays and only visits candles with a signal '
+        'or an open trade. `sparse` additionally skips candles where no pair has a signal '
+        'and no trade is open (default: `rows`).',
+        choices=constants.BACKTEST_ENGINES,
+    ),
     # Edge
     "stoploss_range": Arg(
         '--stoplosses',
@@ -262,6 +270,29 @@ AVAILABLE_CLI_OPTIONS = {
         action='store_true',
         default=False,
     ),
+    "hyperopt_async": Arg(
+        '--async-epochs',
+        help='Start a new epoch as soon as a worker is free, instead of waiting for all '
+        'epochs of a batch. Results are no longer reproducible with `--random-state`.',
+        action='store_true',
+        default=False,
+    ),
+    "hyperopt_indicator_cache_size": Arg(
+        '--analyze-cache-size',
+        help='Memory (in MB, shared by all hyperopt processes) used to keep indicators '
+        f'across epochs with `--analyze-per-epoch`. '
+        f'Default: {constants.HYPEROPT_INDICATOR_CACHE_SIZE}.',
+        type=check_int_positive,
+        metavar='MB',
+    ),
+    "hyperopt_prune_interval": Arg(
+        '--prune-epochs',
+        help='Stop unpromising epochs early. The loss is calculated every PERCENT %% of the '
+        'timerange, and epochs with a loss above the median loss of previous epochs at '
+        'the same point are pruned.',
+        type=check_int_positive,
+        metavar='PERCENT',
+    ),
 
     "print_all": Arg(
         '--print-all',
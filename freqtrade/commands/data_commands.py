@@ -139,6 +139,8 @@ def start_list_data(args: Dict[str, Any]) -> None:
             pair, timeframe, candle_type,
             *dhc.ohlcv_data_min_max(pair, timeframe, candle_type)
         ) for pair, timeframe, candle_type in paircombs]
+        # Files not yet in the catalog have been added - don't load them again next time.
+        dhc.catalog.save()
 
         print(tabulate([
             (pair, timeframe, candle_type,
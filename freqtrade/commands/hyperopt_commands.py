@@ -32,8 +32,8 @@ def start_hyperopt_list(args: Dict[str, Any]) -> None:
         config['user_data_dir'] / 'hyperopt_results',
         config.get('hyperoptexportfilename'))
 
-    # Previous evaluations
-    epochs, total_epochs = HyperoptTools.load_filtered_results(results_file, config)
+    # Previous evaluations - key metrics only
+    epochs, total_epochs = HyperoptTools.load_filtered_index(results_file, config)
 
     if print_colorized:
         colorama_init(autoreset=True)
@@ -47,13 +47,13 @@ def start_hyperopt_list(args: Dict[str, Any]) -> None:
             print('User interrupted..')
 
     if epochs and not no_details:
-        sorted_epochs = sorted(epochs, key=itemgetter('loss'))
-        results = sorted_epochs[0]
+        best_epoch = min(epochs, key=itemgetter('loss'))
+        results = HyperoptTools.load_epochs(results_file, [best_epoch])[0]
         HyperoptTools.show_epoch_details(results, total_epochs, print_json, no_header)
 
     if epochs and export_csv:
         HyperoptTools.export_csv_file(
-            config, epochs, export_csv
+            config, HyperoptTools.load_epochs(results_file, epochs), export_csv
         )
 
 
@@ -73,8 +73,8 @@ def start_hyperopt_show(args: Dict[str, Any]) -> None:
 
     n = config.get('hyperopt_show_index', -1)
 
-    # Previous evaluations
-    epochs, total_epochs = HyperoptTools.load_filtered_results(results_file, config)
+    # Previous evaluations - key metrics only
+    epochs, total_epochs = HyperoptTools.load_filtered_index(results_file, config)
 
     filtered_epochs = len(epochs)
 
@@ -90,7 +90,7 @@ def start_hyperopt_show(args: Dict[str, Any]) -> None:
         n -= 1
 
     if epochs:
-        val = epochs[n]
+        val = HyperoptTools.load_epochs(results_file, [epochs[n]])[0]
 
         metrics = val['results_metrics']
         if 'strategy_name' in metrics:
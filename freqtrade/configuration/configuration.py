@@ -276,6 +276,10 @@ class Configuration:
         self._args_to_config(config, argname='backtest_cache',
                              logstring='Parameter --cache={} detected ...')
 
+        self._args_to_config(config, argname='backtest_engine',
+                             logstring='Parameter --backtest-engine detected, '
+                             'using the {} backtest engine ...')
+
         self._args_to_config(config, argname='disableparamexport',
                              logstring='Parameter --disableparamexport detected: {} ...')
 
@@ -314,6 +318,15 @@ class Configuration:
         self._args_to_config(config, argname='analyze_per_epoch',
                              logstring='Parameter --analyze-per-epoch detected.')
 
+        self._args_to_config(config, argname='hyperopt_indicator_cache_size',
+                             logstring='Parameter --analyze-cache-size detected: {} MB')
+
+        self._args_to_config(config, argname='hyperopt_async',
+                             logstring='Parameter --async-epochs detected.')
+
+        self._args_to_config(config, argname='hyperopt_prune_interval',
+                             logstring='Parameter --prune-epochs detected: {}%')
+
         self._args_to_config(config, argname='print_all',
                              logstring='Parameter --print-all detected ...')
 
@@ -11,7 +11,9 @@ from freqtrade.enums import CandleType, PriceType, RPCMessageType
 DOCS_LINK = "https://www.freqtrade.io/en/stable"
 DEFAULT_CONFIG = 'config.json'
 PROCESS_THROTTLE_SECS = 5  # sec
+MAINTENANCE_INTERVAL_SECS = 60  # sec
 HYPEROPT_EPOCH = 100  # epochs
+HYPEROPT_INDICATOR_CACHE_SIZE = 512  # MB, shared by all hyperopt processes
 RETRY_TIMEOUT = 30  # sec
 TIMEOUT_UNITS = ['minutes', 'seconds']
 EXPORT_OPTIONS = ['none', 'trades', 'signals']
@@ -42,6 +44,8 @@ AVAILABLE_DATAHANDLERS = ['json', 'jsongz', 'hdf5', 'feather', 'parquet']
 BACKTEST_BREAKDOWNS = ['day', 'week', 'month']
 BACKTEST_CACHE_AGE = ['none', 'day', 'week', 'month']
 BACKTEST_CACHE_DEFAULT = 'day'
+BACKTEST_ENGINES = ['rows', 'columnar', 'sparse']
+BACKTEST_ENGINE_DEFAULT = 'rows'
 DRY_RUN_WALLET = 1000
 DATETIME_PRINT_FORMAT = '%Y-%m-%d %H:%M:%S'
 MATH_CLOSE_PREC = 1e-14  # Precision used for float comparisons
@@ -182,6 +186,11 @@ CONF_SCHEMA = {
             'type': 'array',
             'items': {'type': 'string', 'enum': BACKTEST_BREAKDOWNS}
         },
+        'backtest_engine': {
+            'type': 'string',
+            'enum': BACKTEST_ENGINES,
+            'default': BACKTEST_ENGINE_DEFAULT
+        },
         'bot_name': {'type': 'string'},
         'unfilledtimeout': {
             'type': 'object',
@@ -449,6 +458,9 @@ CONF_SCHEMA = {
                 'process_throttle_secs': {'type': 'integer'},
                 'interval': {'type': 'integer'},
                 'sd_notify': {'type': 'boolean'},
+                'analyze_workers': {'type': 'integer', 'minimum': 1, 'default': 1},
+                'stream_analysis': {'type': 'boolean', 'default': False},
+                'candle_scheduler': {'type': 'boolean', 'default': False},
             }
         },
         'dataformat_ohlcv': {
@@ -461,6 +473,7 @@ CONF_SCHEMA = {
             'enum': AVAILABLE_DATAHANDLERS,
             'default': 'feather'
         },
+        'derive_timeframes': {'type': 'boolean', 'default': False},
         'position_adjustment_enable': {'type': 'boolean'},
         'max_entry_position_adjustment': {'type': ['integer', 'number'], 'minimum': -1},
     },
@@ -2,11 +2,11 @@
 Functions to convert data from one format to another
 """
 import logging
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Union
 
 import numpy as np
 import pandas as pd
-from pandas import DataFrame, to_datetime
+from pandas import DataFrame, Timestamp, concat, to_datetime
 
 from freqtrade.constants import (DEFAULT_DATAFRAME_COLUMNS, DEFAULT_TRADES_COLUMNS, TRADES_DTYPES,
                                  Config, TradeList)
@@ -127,6 +127,35 @@ def ohlcv_fill_up_missing_data(dataframe: DataFrame, timeframe: str, pair: str)
     return df
 
 
+def resample_ohlcv(dataframe: DataFrame, base_timeframe: str, timeframe: str) -> DataFrame:
+    """
+    Build candles of a higher timeframe from candles of a lower (base) timeframe.
+    Candles whose period is not fully covered by the base candles
+    (usually the first and last one) are dropped.
+    :param dataframe: Candles of base_timeframe - sorted, without gaps
+    :param base_timeframe: Timeframe of dataframe
+    :param timeframe: Timeframe to build (see `timeframe_is_derivable()`)
+    :return: DataFrame with candles of timeframe
+    """
+    from freqtrade.exchange import timeframe_to_seconds
+
+    if dataframe.empty:
+        return DataFrame(columns=DEFAULT_DATAFRAME_COLUMNS)
+    ohlcv_dict = {
+        'open': 'first',
+        'high': 'max',
+        'low': 'min',
+        'close': 'last',
+        'volume': 'sum'
+    }
+    period = pd.Timedelta(seconds=timeframe_to_seconds(timeframe))
+    df = dataframe.resample(period, on='date', origin='epoch').agg(ohlcv_dict)
+    covered_until = dataframe['date'].iloc[-1] + pd.Timedelta(
+        seconds=timeframe_to_seconds(base_timeframe))
+    complete = (df.index >= dataframe['date'].iloc[0]) & (df.index + period <= covered_until)
+    return df.loc[complete].dropna(subset=['close']).reset_index()
+
+
 def trim_dataframe(df: DataFrame, timerange, *, df_date_col: str = 'date',
                    startup_candles: int = 0) -> DataFrame:
     """
@@ -238,11 +267,13 @@ def trades_list_to_df(trades: TradeList, convert: bool = True):
     return df
 
 
-def trades_to_ohlcv(trades: DataFrame, timeframe: str) -> DataFrame:
+def trades_to_ohlcv(trades: DataFrame, timeframe: str, *,
+                    origin: Union[str, Timestamp] = 'start_day') -> DataFrame:
     """
     Converts trades list to OHLCV list
     :param trades: List of trades, as returned by ccxt.fetch_trades.
     :param timeframe: Timeframe to resample data to
+    :param origin: Timestamp candles are aligned to - defaults to midnight of the first trade
     :return: OHLCV Dataframe.
     :raises: ValueError if no trades are provided
     """
@@ -252,14 +283,55 @@ def trades_to_ohlcv(trades: DataFrame, timeframe: str) -> DataFrame:
         raise ValueError('Trade-list empty.')
     df = trades.set_index('date', drop=True)
 
-    df_new = df['price'].resample(f'{timeframe_minutes}min').ohlc()
-    df_new['volume'] = df['amount'].resample(f'{timeframe_minutes}min').sum()
+    df_new = df['price'].resample(f'{timeframe_minutes}min', origin=origin).ohlc()
+    df_new['volume'] = df['amount'].resample(f'{timeframe_minutes}min', origin=origin).sum()
     df_new['date'] = df_new.index
     # Drop 0 volume rows
     df_new = df_new.dropna()
     return df_new.loc[:, DEFAULT_DATAFRAME_COLUMNS]
 
 
+def trades_chunks_to_ohlcv(chunks: Iterable[DataFrame],
+                           timeframes: List[str]) -> Dict[str, DataFrame]:
+    """
+    Converts trades to OHLCV for multiple timeframes, one chunk of trades at a time -
+    so only the resulting candles are kept in memory, not the trades.
+    Gives the same result as `trades_to_ohlcv()` on the concatenated chunks.
+    :param chunks: Time-ordered, consecutive chunks of trades (as returned by
+        `IDataHandler.trades_load_chunks()`)
+    :param timeframes: Timeframes to resample data to
+    :return: Dict of timeframe -> OHLCV Dataframe
+    :raises: ValueError if no trades are provided
+    """
+    candles: Dict[str, List[DataFrame]] = {timeframe: [] for timeframe in timeframes}
+    origin: Optional[Timestamp] = None
+    for trades in chunks:
+        if trades.empty:
+            continue
+        if origin is None:
+            # Align candles of all chunks like the candles of the complete trades history
+            origin = trades['date'].iloc[0].floor('D')
+        for timeframe in timeframes:
+            ohlcv = trades_to_ohlcv(trades, timeframe, origin=origin)
+            previous = candles[timeframe]
+            if previous and previous[-1]['date'].iloc[-1] == ohlcv['date'].iloc[0]:
+                # Candle spanning both chunks
+                last = previous[-1].iloc[-1]
+                previous[-1] = previous[-1].iloc[:-1]
+                ohlcv = ohlcv.copy()
+                first = ohlcv.index[0]
+                ohlcv.loc[first, ['open', 'high', 'low', 'volume']] = [
+                    last['open'],
+                    max(last['high'], ohlcv.at[first, 'high']),
+                    min(last['low'], ohlcv.at[first, 'low']),
+                    last['volume'] + ohlcv.at[first, 'volume'],
+                ]
+            previous.append(ohlcv)
+    if origin is None:
+        raise ValueError('Trade-list empty.')
+    return {timeframe: concat(frames) for timeframe, frames in candles.items()}
+
+
 def convert_trades_format(config: Config, convert_from: str, convert_to: str, erase: bool):
     """
     Convert trades from one format to another format.
@@ -325,24 +397,25 @@ def convert_ohlcv_format(
 
     logger.info(f"Converting candle (OHLCV) data for the following pair combinations:\n"
                 f"{formatted_paircombs}")
-    for pair, timeframe, candle_type in paircombs:
-        data = src.ohlcv_load(pair=pair, timeframe=timeframe,
-                              timerange=None,
-                              fill_missing=False,
-                              drop_incomplete=False,
-                              startup_candles=0,
-                              candle_type=candle_type)
-        logger.info(f"Converting {len(data)} {timeframe} {candle_type} candles for {pair}")
-        if len(data) > 0:
-            trg.ohlcv_store(
-                pair=pair,
-                timeframe=timeframe,
-                data=data,
-                candle_type=candle_type
-            )
-            if erase and convert_from != convert_to:
-                logger.info(f"Deleting source data for {pair} / {timeframe}")
-                src.ohlcv_purge(pair=pair, timeframe=timeframe, candle_type=candle_type)
+    with src.catalog.deferred_save(), trg.catalog.deferred_save():
+        for pair, timeframe, candle_type in paircombs:
+            data = src.ohlcv_load(pair=pair, timeframe=timeframe,
+                                  timerange=None,
+                                  fill_missing=False,
+                                  drop_incomplete=False,
+                                  startup_candles=0,
+                                  candle_type=candle_type)
+            logger.info(f"Converting {len(data)} {timeframe} {candle_type} candles for {pair}")
+            if len(data) > 0:
+                trg.ohlcv_store(
+                    pair=pair,
+                    timeframe=timeframe,
+                    data=data,
+                    candle_type=candle_type
+                )
+                if erase and convert_from != convert_to:
+                    logger.info(f"Deleting source data for {pair} / {timeframe}")
+                    src.ohlcv_purge(pair=pair, timeframe=timeframe, candle_type=candle_type)
 
 
 def reduce_dataframe_footprint(df: DataFrame) -> DataFrame:
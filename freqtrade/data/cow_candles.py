@@ -0,0 +1,147 @@
+"""
+Backtest candles handed out as copy-on-write memory maps.
+"""
+import weakref
+from tempfile import TemporaryFile
+from typing import IO, Any, Dict, Hashable, NamedTuple, Optional, Tuple
+
+import numpy as np
+from pandas import DataFrame, DatetimeTZDtype
+from pandas.arrays import DatetimeArray
+
+
+_UTC = DatetimeTZDtype(tz='UTC')
+# Every private memory map holds a file descriptor and a mapping while it's alive
+MAX_PRIVATE_MAPS = 64
+
+
+class _Entry(NamedTuple):
+    offset: int
+    rows: int
+    columns: Tuple[str, ...]
+    dates: np.ndarray
+
+
+class CopyOnWriteCandles:
+    """
+    Candle dataframes kept in a temporary file, and handed out as private (copy-on-write)
+    memory maps of the file.
+
+    Handing out the first `stop` candles costs O(1) instead of copying them: all callers read
+    the same pages, and only pages which are written to are copied - so modifying a returned
+    dataframe works like modifying a copy, and doesn't affect other callers.
+    Once MAX_PRIVATE_MAPS handed out dataframes are alive (e.g. kept by the strategy), further
+    candles are copied from a shared read-only map instead.
+    Columns are stored as int64 (date) and float64 (all other columns).
+    """
+
+    def __init__(self) -> None:
+        self._file: Optional[IO[bytes]] = None
+        self._entries: Dict[Hashable, _Entry] = {}
+        self._shared: Optional[np.memmap] = None
+        self._private_maps = 0
+
+    def __del__(self) -> None:
+        # Memory maps handed out keep their own mapping - closing the file doesn't affect them.
+        if self._file is not None:
+            self._file.close()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __getstate__(self) -> Dict:
+        # The temporary file can't be pickled - candles are added again on demand.
+        return {}
+
+    def __setstate__(self, state: Dict) -> None:
+        self._file = None
+        self._entries = {}
+        self._shared = None
+        self._private_maps = 0
+
+    def add(self, key: Hashable, data: DataFrame) -> None:
+        """
+        Store candles - must contain a UTC `date` column, all other columns must be numeric.
+        """
+        columns = tuple(data.columns)
+        dates = np.asarray(data['date'].values, dtype='datetime64[ns]').view(np.int64)
+        values = np.vstack([dates.view(np.float64)] + [
+            data[col].to_numpy(dtype=np.float64) for col in columns if col != 'date'])
+        if self._file is None:
+            self._file = TemporaryFile()
+        offset = self._file.seek(0, 2)
+        self._file.write(values.tobytes())
+        self._file.flush()
+        # Map the grown file when it's needed next
+        self._shared = None
+        dates.flags.writeable = False
+        self._entries[key] = _Entry(offset, len(data), columns, dates)
+
+    def dates(self, key: Hashable) -> np.ndarray:
+        """
+        Candle dates (int64 nanoseconds, read-only) of the stored candles.
+        """
+        return self._entries[key].dates
+
+    def get(self, key: Hashable, stop: int) -> DataFrame:
+        """
+        First `stop` candles - as dataframe backed by a copy-on-write memory map.
+        """
+        entry = self._entries[key]
+        shape = (len(entry.columns), entry.rows)
+        if not entry.rows or self._file is None:
+            values = np.empty((len(entry.columns), 0), dtype=np.float64)
+        elif self._private_maps < MAX_PRIVATE_MAPS:
+            private = np.memmap(self._file, dtype=np.float64, mode='c', offset=entry.offset,
+                                shape=shape)
+            self._private_maps += 1
+            weakref.finalize(private, self._release_private_map)
+            values = private[:, :stop]
+        else:
+            if self._shared is None:
+                self._shared = np.memmap(self._file, dtype=np.uint8, mode='r')
+            values = np.ndarray(shape, dtype=np.float64, buffer=self._shared,
+                                offset=entry.offset)[:, :stop].copy()
+        value_rows = iter(values[1:])
+        result = {
+            col: (DatetimeArray(values[0].view('datetime64[ns]'), dtype=_UTC, copy=False)
+                  if col == 'date' else next(value_rows))
+            for col in entry.columns
+        }
+        return DataFrame(result, copy=False)
+
+    def _release_private_map(self) -> None:
+        self._private_maps -= 1
+
+
+def copy_on_write(data: Dict[str, DataFrame]) -> Dict[str, DataFrame]:
+    """
+    Private copies of dataframes loaded with joblib's `mmap_mode`.
+    Memory-mapped columns are mapped again copy-on-write (once per file) - so they still share
+    pages with all other copies, and only pages which are written to are copied.
+    All other columns are copied.
+    """
+    mappings: Dict[str, np.memmap] = {}
+    result = {}
+    for key, df in data.items():
+        columns: Dict[Any, Any] = {}
+        for col, series in df.items():
+            values = series.values
+            root = values
+            while isinstance(getattr(root, 'base', None), np.ndarray):
+                root = root.base
+            if not isinstance(root, np.memmap) or not root.filename:
+                columns[col] = series.copy()
+                continue
+            if root.filename not in mappings:
+                mappings[root.filename] = np.memmap(root.filename, dtype=np.uint8, mode='c')
+            # root's data starts at root.offset in the file
+            offset = (root.offset + values.__array_interface__['data'][0]
+                      - root.__array_interface__['data'][0])
+            columns[col] = np.ndarray(values.shape, dtype=values.dtype,
+                                      buffer=mappings[root.filename], offset=offset,
+                                      strides=values.strides)
+            if isinstance(series.dtype, DatetimeTZDtype):
+                columns[col] = DatetimeArray(columns[col], dtype=series.dtype, copy=False)
+        result[key] = DataFrame(columns, index=df.index, copy=False)
+    return result
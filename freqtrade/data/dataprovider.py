@@ -6,18 +6,24 @@ Common Interface for bot and strategy to access data.
 """
 import logging
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from queue import Queue
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+import numpy as np
 from pandas import DataFrame, Timedelta, Timestamp, to_timedelta
 
 from freqtrade.configuration import TimeRange
 from freqtrade.constants import (FULL_DATAFRAME_THRESHOLD, Config, ListPairsWithTimeframes,
                                  PairWithTimeframe)
+from freqtrade.data.converter import resample_ohlcv
+from freqtrade.data.cow_candles import CopyOnWriteCandles
 from freqtrade.data.history import load_pair_history
 from freqtrade.enums import CandleType, RPCMessageType, RunMode
 from freqtrade.exceptions import ExchangeError, OperationalException
-from freqtrade.exchange import Exchange, timeframe_to_prev_date, timeframe_to_seconds
+from freqtrade.exchange import (Exchange, timeframe_is_derivable, timeframe_to_prev_date,
+                                timeframe_to_seconds)
 from freqtrade.exchange.types import OrderBook
 from freqtrade.misc import append_candles_to_dataframe
 from freqtrade.rpc import RPCManager
@@ -49,6 +55,8 @@ class DataProvider:
         self.__slice_date: Optional[datetime] = None
 
         self.__cached_pairs_backtesting: Dict[PairWithTimeframe, DataFrame] = {}
+        # Cached backtesting candles, as handed out to callbacks
+        self.__cow_pairs_backtesting = CopyOnWriteCandles()
         self.__producer_pairs_df: Dict[str,
                                        Dict[PairWithTimeframe, Tuple[DataFrame, datetime]]] = {}
         self.__producer_pairs: Dict[str, List[str]] = {}
@@ -304,6 +312,19 @@ class DataProvider:
         :param timeframe: timeframe to get data for
         :param candle_type: '', mark, index, premiumIndex, or funding_rate
         """
+        return self._historic_ohlcv_cached(pair, timeframe, candle_type)[1].copy()
+
+    def _historic_ohlcv_cached(
+        self,
+        pair: str,
+        timeframe: str,
+        candle_type: str = ''
+    ) -> Tuple[PairWithTimeframe, DataFrame]:
+        """
+        Load stored historical candle (OHLCV) data once, and keep it for further calls.
+        The cached dataframe must not be handed out without copying it.
+        :return: Tuple of (cache key, cached dataframe)
+        """
         _candle_type = CandleType.from_string(
             candle_type) if candle_type != '' else self._config['candle_type_def']
         saved_pair: PairWithTimeframe = (pair, str(timeframe), _candle_type)
@@ -316,16 +337,33 @@ class DataProvider:
             startup_candles = self.get_required_startup(str(timeframe), False)
             tf_seconds = timeframe_to_seconds(str(timeframe))
             timerange.subtract_start(tf_seconds * startup_candles)
-            self.__cached_pairs_backtesting[saved_pair] = load_pair_history(
-                pair=pair,
-                timeframe=timeframe,
-                datadir=self._config['datadir'],
-                timerange=timerange,
-                data_format=self._config['dataformat_ohlcv'],
-                candle_type=_candle_type,
+            base_timeframe = self._config.get('timeframe', '')
+            if (self._config.get('derive_timeframes', False) and base_timeframe
+                    and _candle_type != CandleType.FUNDING_RATE
+                    and timeframe_is_derivable(base_timeframe, str(timeframe))):
+                # Build candles from the strategy timeframe instead of loading them
+                data = resample_ohlcv(
+                    load_pair_history(
+                        pair=pair,
+                        timeframe=base_timeframe,
+                        datadir=self._config['datadir'],
+                        timerange=timerange,
+                        data_format=self._config['dataformat_ohlcv'],
+                        candle_type=_candle_type,
+                    ),
+                    base_timeframe, str(timeframe))
+            else:
+                data = load_pair_history(
+                    pair=pair,
+                    timeframe=timeframe,
+                    datadir=self._config['datadir'],
+                    timerange=timerange,
+                    data_format=self._config['dataformat_ohlcv'],
+                    candle_type=_candle_type,
 
-            )
-        return self.__cached_pairs_backtesting[saved_pair].copy()
+                )
+            self.__cached_pairs_backtesting[saved_pair] = data
+        return saved_pair, self.__cached_pairs_backtesting[saved_pair]
 
     def get_required_startup(self, timeframe: str, add_train_candles: bool = True) -> int:
         freqai_config = self._config.get('freqai', {})
@@ -366,12 +404,22 @@ class DataProvider:
         else:
             # Get historical OHLCV data (cached on disk).
             timeframe = timeframe or self._config['timeframe']
-            data = self.historic_ohlcv(pair=pair, timeframe=timeframe, candle_type=candle_type)
-            # Cut date to timeframe-specific date.
-            # This is necessary to prevent lookahead bias in callbacks through informative pairs.
             if self.__slice_date:
+                # Cut date to timeframe-specific date.
+                # This is necessary to prevent lookahead bias in callbacks through
+                # informative pairs.
+                # Callbacks run for every candle - so the data is not copied, but handed out
+                # copy-on-write.
+                saved_pair, data = self._historic_ohlcv_cached(pair, timeframe, candle_type)
+                if saved_pair not in self.__cow_pairs_backtesting:
+                    self.__cow_pairs_backtesting.add(saved_pair, data)
                 cutoff_date = timeframe_to_prev_date(timeframe, self.__slice_date)
-                data = data.loc[data['date'] < cutoff_date]
+                stop = int(np.searchsorted(self.__cow_pairs_backtesting.dates(saved_pair),
+                                           Timestamp(cutoff_date).value, side='left'))
+                data = self.__cow_pairs_backtesting.get(saved_pair, stop)
+            else:
+                data = self.historic_ohlcv(pair=pair, timeframe=timeframe,
+                                           candle_type=candle_type)
         if len(data) == 0:
             logger.warning(f"No data found for ({pair}, {timeframe}, {candle_type}).")
         return data
@@ -444,6 +492,72 @@ class DataProvider:
         final_pairs = (pairlist + helping_pairs) if helping_pairs else pairlist
         self._exchange.refresh_latest_ohlcv(final_pairs)
 
+    def refresh_stream(self,
+                       pairlist: ListPairsWithTimeframes,
+                       helping_pairs: Optional[ListPairsWithTimeframes] = None,
+                       shared_pairs: Optional[ListPairsWithTimeframes] = None) -> Iterator[str]:
+        """
+        Refresh data like `refresh()` - but yield every pair of pairlist as soon as its
+        candles are refreshed, while candles of other pairs are still being downloaded.
+        A pair is complete once all combinations of the pair itself (base and informative
+        timeframes) and all shared_pairs are refreshed.
+        Pairs with failed downloads are yielded once the refresh finished.
+        :param pairlist: Pairs to refresh and yield
+        :param helping_pairs: Additional (informative) pairs to refresh
+        :param shared_pairs: Combinations every pair of pairlist depends on
+        """
+        exchange = self._exchange
+        if exchange is None:
+            raise OperationalException(NO_EXCHANGE_EXCEPTION)
+        final_pairs = (pairlist + helping_pairs) if helping_pairs else pairlist
+        pairs = list(dict.fromkeys(pair for pair, _, _ in pairlist))
+        waiting, missing = self._refresh_dependencies(pairs, final_pairs, shared_pairs or [])
+        refreshed: 'Queue[Optional[PairWithTimeframe]]' = Queue()
+
+        def refresh() -> None:
+            try:
+                exchange.refresh_latest_ohlcv(final_pairs, on_refreshed=refreshed.put)
+            finally:
+                # Marks the end of the refresh
+                refreshed.put(None)
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix='refresh') as executor:
+            future = executor.submit(refresh)
+            for pair in pairs:
+                if not missing[pair]:
+                    del missing[pair]
+                    yield pair
+            while missing and (refreshed_pair_tf := refreshed.get()) is not None:
+                for pair in waiting.pop(refreshed_pair_tf, []):
+                    missing[pair] -= 1
+                    if not missing[pair]:
+                        del missing[pair]
+                        yield pair
+            future.result()
+            yield from missing
+
+    @staticmethod
+    def _refresh_dependencies(
+        pairs: List[str], final_pairs: ListPairsWithTimeframes,
+        shared_pairs: ListPairsWithTimeframes
+    ) -> Tuple[Dict[PairWithTimeframe, List[str]], Dict[str, int]]:
+        """
+        Pairs waiting for each refreshed combination,
+        and number of combinations each pair waits for.
+        """
+        waiting: Dict[PairWithTimeframe, List[str]] = {}
+        missing = dict.fromkeys(pairs, 0)
+        shared = set(shared_pairs)
+        for pair_tf in set(final_pairs):
+            if pair_tf in shared:
+                waiting[pair_tf] = pairs
+            elif pair_tf[0] in missing:
+                waiting[pair_tf] = [pair_tf[0]]
+        for waiting_pairs in waiting.values():
+            for pair in waiting_pairs:
+                missing[pair] += 1
+        return waiting, missing
+
     @property
     def available_pairs(self) -> ListPairsWithTimeframes:
         """
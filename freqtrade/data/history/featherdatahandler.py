@@ -1,87 +1,115 @@
 import logging
-from typing import Optional
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
 
+import pyarrow as pa
 from pandas import DataFrame, read_feather, to_datetime
+from pyarrow import ipc
 
 from freqtrade.configuration import TimeRange
 from freqtrade.constants import DEFAULT_DATAFRAME_COLUMNS, DEFAULT_TRADES_COLUMNS
-from freqtrade.enums import CandleType
 
 from .idatahandler import IDataHandler
 
 
 logger = logging.getLogger(__name__)
 
+# Rows per record batch. Batches outside of the requested timerange are not read.
+# ~10 days of 1m candles per batch.
+BATCH_SIZE = 15_000
+
+
+def _read_feather_range(filename: Path, column: str,
+                        start: Optional[int], stop: Optional[int]) -> DataFrame:
+    """
+    Read only the record batches of a feather file which overlap start - stop.
+    Relies on the file being sorted by `column`, so the overlapping batches can be located
+    by binary search - reading the first and last row of a few batches only.
+    :param filename: Feather file to read
+    :param column: Date column, either datetime or timestamp in milliseconds
+    :param start: Start timestamp in milliseconds (inclusive), None for unbounded
+    :param stop: Stop timestamp in milliseconds (inclusive), None for unbounded
+    :return: Rows of all overlapping batches - to be trimmed by the caller
+    """
+    with pa.memory_map(str(filename)) as source:
+        reader = ipc.open_file(source)
+        batches: Dict[int, pa.RecordBatch] = {}
+
+        def get_batch(idx: int) -> pa.RecordBatch:
+            if idx not in batches:
+                batches[idx] = reader.get_record_batch(idx)
+            return batches[idx]
+
+        def batch_bounds(idx: int) -> Tuple[int, int]:
+            batch = get_batch(idx)
+            if batch.num_rows == 0:
+                # Nothing to compare - keep it, it doesn't add any rows.
+                return -sys.maxsize, sys.maxsize
+            ends = batch.column(column).take([0, batch.num_rows - 1])
+            if pa.types.is_timestamp(ends.type):
+                # Datetime columns can be stored in any resolution (s, ms, us, ns)
+                ends = ends.cast(pa.timestamp('ms', tz=ends.type.tz), safe=False)
+            first, last = ends.cast(pa.int64()).to_pylist()
+            return first, last
+
+        # First batch ending at or after start
+        lo, hi = 0, reader.num_record_batches
+        while start is not None and lo < hi:
+            mid = (lo + hi) // 2
+            if batch_bounds(mid)[1] < start:
+                lo = mid + 1
+            else:
+                hi = mid
+        first_batch = lo
+        # First batch starting after stop
+        lo, hi = first_batch, reader.num_record_batches
+        while stop is not None and lo < hi:
+            mid = (lo + hi) // 2
+            if batch_bounds(mid)[0] > stop:
+                hi = mid
+            else:
+                lo = mid + 1
+
+        table = pa.Table.from_batches([get_batch(idx) for idx in range(first_batch, hi)],
+                                      schema=reader.schema)
+        return table.to_pandas()
+
 
 class FeatherDataHandler(IDataHandler):
 
     _columns = DEFAULT_DATAFRAME_COLUMNS
 
-    def ohlcv_store(
-            self, pair: str, timeframe: str, data: DataFrame, candle_type: CandleType) -> None:
+    def _ohlcv_write(self, filename: Path, data: DataFrame) -> None:
         """
-        Store data in json format "values".
-            format looks as follows:
-            [[<date>,<open>,<high>,<low>,<close>]]
-        :param pair: Pair - used to generate filename
-        :param timeframe: Timeframe - used to generate filename
+        Store data in feather format.
+        :param filename: File to write
         :param data: Dataframe containing OHLCV data
-        :param candle_type: Any of the enum CandleType (must match trading mode!)
-        :return: None
         """
-        filename = self._pair_data_filename(self._datadir, pair, timeframe, candle_type)
-        self.create_dir_if_needed(filename)
 
         data.reset_index(drop=True).loc[:, self._columns].to_feather(
-            filename, compression_level=9, compression='lz4')
+            filename, compression_level=9, compression='lz4', chunksize=BATCH_SIZE)
 
-    def _ohlcv_load(self, pair: str, timeframe: str,
-                    timerange: Optional[TimeRange], candle_type: CandleType
-                    ) -> DataFrame:
+    def _ohlcv_read(self, filename: Path, timerange: Optional[TimeRange]) -> DataFrame:
         """
-        Internal method used to load data for one pair from disk.
-        Implements the loading and conversion to a Pandas dataframe.
-        Timerange trimming and dataframe validation happens outside of this method.
-        :param pair: Pair to load data
-        :param timeframe: Timeframe (e.g. "5m")
-        :param timerange: Limit data to be loaded to this timerange.
-                        Optionally implemented by subclasses to avoid loading
-                        all data where possible.
-        :param candle_type: Any of the enum CandleType (must match trading mode!)
-        :return: DataFrame with ohlcv data, or empty DataFrame
+        Read ohlcv data from a file and convert it to a Pandas dataframe.
+        Only record batches overlapping the timerange are read.
+        :param filename: File to read
+        :param timerange: Limit data to be loaded to this timerange
+        :return: DataFrame with ohlcv data
         """
-        filename = self._pair_data_filename(
-            self._datadir, pair, timeframe, candle_type=candle_type)
-        if not filename.exists():
-            # Fallback mode for 1M files
-            filename = self._pair_data_filename(
-                self._datadir, pair, timeframe, candle_type=candle_type, no_timeframe_modify=True)
-            if not filename.exists():
-                return DataFrame(columns=self._columns)
 
-        pairdata = read_feather(filename)
+        if timerange:
+            pairdata = _read_feather_range(filename, 'date', *self._timerange_bounds(timerange))
+        else:
+            pairdata = read_feather(filename)
         pairdata.columns = self._columns
         pairdata = pairdata.astype(dtype={'open': 'float', 'high': 'float',
                                           'low': 'float', 'close': 'float', 'volume': 'float'})
-        pairdata['date'] = to_datetime(pairdata['date'], unit='ms', utc=True)
+        # Files written by other tools may use a different resolution than nanoseconds
+        pairdata['date'] = to_datetime(pairdata['date'], unit='ms', utc=True).dt.as_unit('ns')
         return pairdata
 
-    def ohlcv_append(
-        self,
-        pair: str,
-        timeframe: str,
-        data: DataFrame,
-        candle_type: CandleType
-    ) -> None:
-        """
-        Append data to existing data structures
-        :param pair: Pair
-        :param timeframe: Timeframe this ohlcv data is for
-        :param data: Data to append.
-        :param candle_type: Any of the enum CandleType (must match trading mode!)
-        """
-        raise NotImplementedError()
-
     def _trades_store(self, pair: str, data: DataFrame) -> None:
         """
         Store trades data (list of Dicts) to file
@@ -91,7 +119,8 @@ class FeatherDataHandler(IDataHandler):
         """
         filename = self._pair_trades_filename(self._datadir, pair)
         self.create_dir_if_needed(filename)
-        data.reset_index(drop=True).to_feather(filename, compression_level=9, compression='lz4')
+        data.reset_index(drop=True).to_feather(filename, compression_level=9, compression='lz4',
+                                               chunksize=BATCH_SIZE)
 
     def trades_append(self, pair: str, data: DataFrame):
         """
@@ -105,19 +134,47 @@ class FeatherDataHandler(IDataHandler):
     def _trades_load(self, pair: str, timerange: Optional[TimeRange] = None) -> DataFrame:
         """
         Load a pair from file, either .json.gz or .json
-        # TODO: respect timerange ...
+        Only record batches overlapping the timerange are read.
         :param pair: Load trades for this pair
-        :param timerange: Timerange to load trades for - currently not implemented
+        :param timerange: Timerange to load trades for
         :return: Dataframe containing trades
         """
         filename = self._pair_trades_filename(self._datadir, pair)
         if not filename.exists():
             return DataFrame(columns=DEFAULT_TRADES_COLUMNS)
 
-        tradesdata = read_feather(filename)
+        if timerange:
+            tradesdata = self._trim_trades(_read_feather_range(
+                filename, 'timestamp', *self._timerange_bounds(timerange)), timerange)
+        else:
+            tradesdata = read_feather(filename)
 
         return tradesdata
 
+    def _trades_load_chunks(self, pair: str, chunk_size: int) -> Iterator[DataFrame]:
+        """
+        Load trades in chunks of whole record batches.
+        :param pair: Load trades for this pair
+        :param chunk_size: Minimum number of trades per chunk (except for the last chunk)
+        :return: Iterator of dataframes containing trades
+        """
+        filename = self._pair_trades_filename(self._datadir, pair)
+        if not filename.exists():
+            return
+        with pa.memory_map(str(filename)) as source:
+            reader = ipc.open_file(source)
+            batches: List[pa.RecordBatch] = []
+            rows = 0
+            for idx in range(reader.num_record_batches):
+                batch = reader.get_record_batch(idx)
+                batches.append(batch)
+                rows += batch.num_rows
+                if rows >= chunk_size:
+                    yield pa.Table.from_batches(batches).to_pandas()
+                    batches, rows = [], 0
+            if rows:
+                yield pa.Table.from_batches(batches).to_pandas()
+
     @classmethod
     def _get_file_extension(cls):
         return "feather"
@@ -1,5 +1,5 @@
 import logging
-from typing import Optional
+from typing import Any, Dict, Iterator, Optional
 
 import numpy as np
 import pandas as pd
@@ -17,8 +17,10 @@ logger = logging.getLogger(__name__)
 class HDF5DataHandler(IDataHandler):
 
     _columns = DEFAULT_DATAFRAME_COLUMNS
+    # PyTables is not thread-safe
+    _concurrent_load = False
 
-    def ohlcv_store(
+    def _ohlcv_store(
             self, pair: str, timeframe: str, data: pd.DataFrame, candle_type: CandleType) -> None:
         """
         Store data in hdf5 file.
@@ -84,21 +86,20 @@ class HDF5DataHandler(IDataHandler):
         pairdata = pairdata.reset_index(drop=True)
         return pairdata
 
-    def ohlcv_append(
-        self,
-        pair: str,
-        timeframe: str,
-        data: pd.DataFrame,
-        candle_type: CandleType
-    ) -> None:
+    def _ohlcv_append(self, pair: str, timeframe: str, data: pd.DataFrame,
+                      candle_type: CandleType, entry: Dict[str, Any]) -> None:
         """
-        Append data to existing data structures
-        :param pair: Pair
-        :param timeframe: Timeframe this ohlcv data is for
-        :param data: Data to append.
-        :param candle_type: Any of the enum CandleType (must match trading mode!)
+        Append candles newer than the stored data to the hdf5 table.
+        :param entry: Catalog entry of the stored data
         """
-        raise NotImplementedError()
+        key = self._pair_ohlcv_key(pair, timeframe)
+        filename = self._pair_data_filename(self._datadir, pair, timeframe, candle_type)
+
+        data.loc[:, self._columns].to_hdf(
+            filename, key, mode='a', append=True, complevel=9, complib='blosc',
+            format='table', data_columns=['date']
+        )
+        self.catalog.append(filename, entry, data, timeframe)
 
     def _trades_store(self, pair: str, data: pd.DataFrame) -> None:
         """
@@ -147,6 +148,25 @@ class HDF5DataHandler(IDataHandler):
         trades[['id', 'type']] = trades[['id', 'type']].replace({np.nan: None})
         return trades
 
+    def _trades_load_chunks(self, pair: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+        """
+        Load trades in chunks of chunk_size trades.
+        :param pair: Load trades for this pair
+        :param chunk_size: Number of trades per chunk
+        :return: Iterator of dataframes containing trades
+        """
+        key = self._pair_trades_key(pair)
+        filename = self._pair_trades_filename(self._datadir, pair)
+        if not filename.exists():
+            return
+        chunks = pd.read_hdf(filename, key=key, mode="r", chunksize=chunk_size)
+        try:
+            for trades in chunks:
+                trades[['id', 'type']] = trades[['id', 'type']].replace({np.nan: None})
+                yield trades
+        finally:
+            chunks.close()
+
     @classmethod
     def _get_file_extension(cls):
         return "h5"
@@ -1,5 +1,6 @@
 import logging
 import operator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
@@ -8,10 +9,11 @@ from pandas import DataFrame, concat
 
 from freqtrade.configuration import TimeRange
 from freqtrade.constants import (DATETIME_PRINT_FORMAT, DEFAULT_DATAFRAME_COLUMNS,
-                                 DL_DATA_TIMEFRAMES, Config)
+                                 DL_DATA_TIMEFRAMES, Config, ListPairsWithTimeframes,
+                                 PairWithTimeframe)
 from freqtrade.data.converter import (clean_ohlcv_dataframe, ohlcv_to_dataframe,
-                                      trades_df_remove_duplicates, trades_list_to_df,
-                                      trades_to_ohlcv)
+                                      trades_chunks_to_ohlcv, trades_df_remove_duplicates,
+                                      trades_list_to_df)
 from freqtrade.data.history.idatahandler import IDataHandler, get_datahandler
 from freqtrade.enums import CandleType
 from freqtrade.exceptions import OperationalException
@@ -89,20 +91,86 @@ def load_data(datadir: Path,
     :param candle_type: Any of the enum CandleType (must match trading mode!)
     :return: dict(<pair>:<Dataframe>)
     """
-    result: Dict[str, DataFrame] = {}
     if startup_candles > 0 and timerange:
         logger.info(f'Using indicator startup period: {startup_candles} ...')
 
+    return _load_data_multi(datadir, timeframe, pairs, [candle_type],
+                            timerange=timerange, fill_up_missing=fill_up_missing,
+                            startup_candles=startup_candles,
+                            fail_without_data=fail_without_data, data_format=data_format,
+                            user_futures_funding_rate=user_futures_funding_rate)[candle_type]
+
+
+def load_funding_and_mark_data(datadir: Path,
+                               timeframe: str,
+                               pairs: List[str], *,
+                               mark_candle_type: CandleType,
+                               timerange: Optional[TimeRange] = None,
+                               fail_without_data: bool = False,
+                               data_format: str = 'feather',
+                               ) -> Tuple[Dict[str, DataFrame], Dict[str, DataFrame]]:
+    """
+    Load funding rate and mark candles (the auxiliary data needed to backtest futures)
+    for a list of pairs - in one batch, so both candle types are loaded concurrently.
+    Equivalent to calling `load_data()` for both candle types.
+
+    :param datadir: Path to the data storage location.
+    :param timeframe: Timeframe of the mark candles (e.g. "8h")
+    :param pairs: List of pairs to load
+    :param mark_candle_type: Candle type of the mark candles (mark or index)
+    :param timerange: Limit data to be loaded to this timerange
+    :param fail_without_data: Raise OperationalException if no data is found.
+    :param data_format: Data format which should be used.
+    :return: Tuple of dict(<pair>:<Dataframe>) - funding rates and mark candles
+    """
+    data = _load_data_multi(datadir, timeframe, pairs,
+                            [CandleType.FUNDING_RATE, mark_candle_type],
+                            timerange=timerange, fail_without_data=fail_without_data,
+                            data_format=data_format)
+    return data[CandleType.FUNDING_RATE], data[mark_candle_type]
+
+
+def _load_data_multi(datadir: Path,
+                     timeframe: str,
+                     pairs: List[str],
+                     candle_types: List[CandleType], *,
+                     timerange: Optional[TimeRange] = None,
+                     fill_up_missing: bool = True,
+                     startup_candles: int = 0,
+                     fail_without_data: bool = False,
+                     data_format: str = 'feather',
+                     user_futures_funding_rate: Optional[int] = None,
+                     ) -> Dict[CandleType, Dict[str, DataFrame]]:
+    """
+    Load ohlcv history data of multiple candle types for a list of pairs.
+    See `load_data()` for the parameters.
+    :return: dict(<candle_type>: dict(<pair>:<Dataframe>))
+    """
     data_handler = get_datahandler(datadir, data_format)
+    jobs = [(pair, candle_type) for candle_type in candle_types for pair in pairs]
 
-    for pair in pairs:
-        hist = load_pair_history(pair=pair, timeframe=timeframe,
+    def load_pair(job: Tuple[str, CandleType]) -> DataFrame:
+        pair, candle_type = job
+        return load_pair_history(pair=pair, timeframe=timeframe,
                                  datadir=datadir, timerange=timerange,
                                  fill_up_missing=fill_up_missing,
                                  startup_candles=startup_candles,
                                  data_handler=data_handler,
                                  candle_type=candle_type,
                                  )
+
+    if len(jobs) > 1 and data_handler._concurrent_load:
+        # File reads and decompression release the GIL - so pairs load in parallel.
+        # map() keeps the order of pairs.
+        with ThreadPoolExecutor(thread_name_prefix='load_data') as executor:
+            histories = list(executor.map(load_pair, jobs))
+    else:
+        histories = [load_pair(job) for job in jobs]
+
+    results: Dict[CandleType, Dict[str, DataFrame]] = {
+        candle_type: {} for candle_type in candle_types}
+    for (pair, candle_type), hist in zip(jobs, histories):
+        result = results[candle_type]
         if not hist.empty:
             result[pair] = hist
         else:
@@ -111,9 +179,9 @@ def load_data(datadir: Path,
             elif candle_type not in (CandleType.SPOT, CandleType.FUTURES):
                 result[pair] = DataFrame(columns=["date", "open", "close", "high", "low", "volume"])
 
-    if fail_without_data and not result:
+    if fail_without_data and not all(results.values()):
         raise OperationalException("No data found. Terminating.")
-    return result
+    return results
 
 
 def refresh_data(*, datadir: Path,
@@ -136,12 +204,10 @@ def refresh_data(*, datadir: Path,
     :param candle_type: Any of the enum CandleType (must match trading mode!)
     """
     data_handler = get_datahandler(datadir, data_format)
-    for idx, pair in enumerate(pairs):
-        process = f'{idx}/{len(pairs)}'
-        _download_pair_history(pair=pair, process=process,
-                               timeframe=timeframe, datadir=datadir,
-                               timerange=timerange, exchange=exchange, data_handler=data_handler,
-                               candle_type=candle_type)
+    if pairs:
+        _download_pairs_history([(pair, timeframe, candle_type) for pair in pairs],
+                                datadir=datadir, exchange=exchange, data_handler=data_handler,
+                                timerange=timerange)
 
 
 def _load_cached_data_for_updating(
@@ -187,6 +253,117 @@ def _load_cached_data_for_updating(
     return data, start_ms, end_ms
 
 
+def _get_append_range(
+    pair: str,
+    timeframe: str,
+    timerange: Optional[TimeRange],
+    data_handler: IDataHandler,
+    candle_type: CandleType,
+) -> Optional[Tuple[int, Optional[int]]]:
+    """
+    Range to download to append to the stored data - without loading the stored data.
+    Note: Only used by download_pair_history().
+    :return: (since_ms, until_ms) - or None if no data is stored yet, or the timerange
+        starts before the stored data (so everything has to be redownloaded).
+    """
+    info = data_handler.ohlcv_data_info(pair, timeframe, candle_type)
+    if not info or not info['rows']:
+        return None
+    if timerange and timerange.starttype == 'date' and timerange.startts * 1000 < info['start']:
+        return None
+    until_ms = timerange.stopts * 1000 if timerange and timerange.stoptype == 'date' else None
+    return info['end'], until_ms
+
+
+def _prepare_pair_download(pair: str, timeframe: str, candle_type: CandleType, *,
+                           datadir: Path,
+                           data_handler: IDataHandler,
+                           process: str = '',
+                           timerange: Optional[TimeRange] = None,
+                           erase: bool = False,
+                           prepend: bool = False,
+                           ) -> Tuple[DataFrame, Optional[int], Optional[int], bool]:
+    """
+    Determine what to download for the pair - first step of download_pair_history().
+    :return: (stored data, since_ms, until_ms, append)
+        Stored data is only loaded if it has to be merged with the new data -
+        if append is True, the new data is appended to the stored data instead.
+    """
+    if erase:
+        if data_handler.ohlcv_purge(pair, timeframe, candle_type=candle_type):
+            logger.info(f'Deleting existing data for pair {pair}, {timeframe}, {candle_type}.')
+
+    append_range = None if prepend else _get_append_range(
+        pair, timeframe, timerange, data_handler=data_handler, candle_type=candle_type)
+    if not append_range:
+        data, since_ms, until_ms = _load_cached_data_for_updating(
+            pair, timeframe, timerange,
+            data_handler=data_handler,
+            candle_type=candle_type,
+            prepend=prepend)
+    else:
+        # Only new candles are downloaded and appended - no need to load the stored data.
+        data = DataFrame(columns=DEFAULT_DATAFRAME_COLUMNS)
+        since_ms, until_ms = append_range
+
+    logger.info(f'({process}) - Download history data for "{pair}", {timeframe}, '
+                f'{candle_type} and store in {datadir}. '
+                f'From {format_ms_time(since_ms) if since_ms else "start"} to '
+                f'{format_ms_time(until_ms) if until_ms else "now"}'
+                )
+
+    logger.debug("Current Start: %s",
+                 f"{data.iloc[0]['date']:{DATETIME_PRINT_FORMAT}}"
+                 if not data.empty else 'None')
+    logger.debug("Current End: %s",
+                 f"{data.iloc[-1]['date']:{DATETIME_PRINT_FORMAT}}"
+                 if not data.empty else 'None')
+    return data, since_ms, until_ms, append_range is not None
+
+
+def _store_pair_download(pair: str, timeframe: str, candle_type: CandleType, *,
+                         data_handler: IDataHandler,
+                         data: DataFrame,
+                         new_data: List,
+                         append: bool,
+                         ) -> None:
+    """
+    Parse and store downloaded candles - last step of download_pair_history().
+    :param data: Stored data, as returned by _prepare_pair_download()
+    :param new_data: Downloaded candles
+    :param append: Append to the stored data, as returned by _prepare_pair_download()
+    """
+    # TODO: Maybe move parsing to exchange class (?)
+    new_dataframe = ohlcv_to_dataframe(new_data, timeframe, pair,
+                                       fill_missing=False, drop_incomplete=True)
+    if append:
+        data_handler.ohlcv_append(pair, timeframe, data=new_dataframe, candle_type=candle_type)
+        return
+    if data.empty:
+        data = new_dataframe
+    else:
+        # Run cleaning again to ensure there were no duplicate candles
+        # Especially between existing and new data.
+        data = clean_ohlcv_dataframe(concat([data, new_dataframe], axis=0), timeframe, pair,
+                                     fill_missing=False, drop_incomplete=False)
+
+    logger.debug("New Start: %s",
+                 f"{data.iloc[0]['date']:{DATETIME_PRINT_FORMAT}}"
+                 if not data.empty else 'None')
+    logger.debug("New End: %s",
+                 f"{data.iloc[-1]['date']:{DATETIME_PRINT_FORMAT}}"
+                 if not data.empty else 'None')
+
+    data_handler.ohlcv_store(pair, timeframe, data=data, candle_type=candle_type)
+
+
+def _default_since_ms(since_ms: Optional[int], new_pairs_days: int) -> int:
+    # Default since_ms to 30 days if nothing is given
+    if since_ms:
+        return since_ms
+    return int((datetime.now() - timedelta(days=new_pairs_days)).timestamp()) * 1000
+
+
 def _download_pair_history(pair: str, *,
                            datadir: Path,
                            exchange: Exchange,
@@ -202,7 +379,8 @@ def _download_pair_history(pair: str, *,
     """
     Download latest candles from the exchange for the pair and timeframe passed in parameters
     The data is downloaded starting from the last correct data that
-    exists in a cache. If timerange starts earlier than the data in the cache,
+    exists in a cache, and appended to the stored data.
+    If timerange starts earlier than the data in the cache,
     the full data will be redownloaded
 
     :param pair: pair to download
@@ -215,58 +393,20 @@ def _download_pair_history(pair: str, *,
     data_handler = get_datahandler(datadir, data_handler=data_handler)
 
     try:
-        if erase:
-            if data_handler.ohlcv_purge(pair, timeframe, candle_type=candle_type):
-                logger.info(f'Deleting existing data for pair {pair}, {timeframe}, {candle_type}.')
-
-        data, since_ms, until_ms = _load_cached_data_for_updating(
-            pair, timeframe, timerange,
-            data_handler=data_handler,
-            candle_type=candle_type,
-            prepend=prepend)
-
-        logger.info(f'({process}) - Download history data for "{pair}", {timeframe}, '
-                    f'{candle_type} and store in {datadir}. '
-                    f'From {format_ms_time(since_ms) if since_ms else "start"} to '
-                    f'{format_ms_time(until_ms) if until_ms else "now"}'
-                    )
-
-        logger.debug("Current Start: %s",
-                     f"{data.iloc[0]['date']:{DATETIME_PRINT_FORMAT}}"
-                     if not data.empty else 'None')
-        logger.debug("Current End: %s",
-                     f"{data.iloc[-1]['date']:{DATETIME_PRINT_FORMAT}}"
-                     if not data.empty else 'None')
+        data, since_ms, until_ms, append = _prepare_pair_download(
+            pair, timeframe, candle_type, datadir=datadir, data_handler=data_handler,
+            process=process, timerange=timerange, erase=erase, prepend=prepend)
 
-        # Default since_ms to 30 days if nothing is given
         new_data = exchange.get_historic_ohlcv(pair=pair,
                                                timeframe=timeframe,
-                                               since_ms=since_ms if since_ms else
-                                               int((datetime.now() - timedelta(days=new_pairs_days)
-                                                    ).timestamp()) * 1000,
-                                               is_new_pair=data.empty,
+                                               since_ms=_default_since_ms(since_ms,
+                                                                          new_pairs_days),
+                                               is_new_pair=data.empty and not append,
                                                candle_type=candle_type,
                                                until_ms=until_ms if until_ms else None
                                                )
-        # TODO: Maybe move parsing to exchange class (?)
-        new_dataframe = ohlcv_to_dataframe(new_data, timeframe, pair,
-                                           fill_missing=False, drop_incomplete=True)
-        if data.empty:
-            data = new_dataframe
-        else:
-            # Run cleaning again to ensure there were no duplicate candles
-            # Especially between existing and new data.
-            data = clean_ohlcv_dataframe(concat([data, new_dataframe], axis=0), timeframe, pair,
-                                         fill_missing=False, drop_incomplete=False)
-
-        logger.debug("New Start: %s",
-                     f"{data.iloc[0]['date']:{DATETIME_PRINT_FORMAT}}"
-                     if not data.empty else 'None')
-        logger.debug("New End: %s",
-                     f"{data.iloc[-1]['date']:{DATETIME_PRINT_FORMAT}}"
-                     if not data.empty else 'None')
-
-        data_handler.ohlcv_store(pair, timeframe, data=data, candle_type=candle_type)
+        _store_pair_download(pair, timeframe, candle_type, data_handler=data_handler,
+                             data=data, new_data=new_data, append=append)
         return True
 
     except Exception:
@@ -276,6 +416,49 @@ def _download_pair_history(pair: str, *,
         return False
 
 
+def _download_pairs_history(jobs: ListPairsWithTimeframes, *,
+                            datadir: Path,
+                            exchange: Exchange,
+                            new_pairs_days: int = 30,
+                            data_handler: IDataHandler,
+                            timerange: Optional[TimeRange] = None,
+                            erase: bool = False,
+                            prepend: bool = False,
+                            ) -> Dict[PairWithTimeframe, bool]:
+    """
+    Concurrent counterpart of _download_pair_history() for multiple
+    (pair, timeframe, candle_type) combinations.
+    Downloads run concurrently on the exchange's async loop, while loading and storing data
+    happens in a worker thread.
+    :return: Success state per (pair, timeframe, candle_type)
+    """
+    # Pairs may be listed multiple times - download (and store) every series only once.
+    # Duplicate jobs would also share (and race on) the stored data below.
+    jobs = list(dict.fromkeys(jobs))
+    # Stored data of the jobs currently being downloaded
+    stored: Dict[PairWithTimeframe, Tuple[DataFrame, bool]] = {}
+    positions = {job: idx for idx, job in enumerate(jobs, start=1)}
+
+    def prepare(job: PairWithTimeframe) -> Tuple[int, Optional[int], bool]:
+        pair, timeframe, candle_type = job
+        data, since_ms, until_ms, append = _prepare_pair_download(
+            pair, timeframe, candle_type, datadir=datadir, data_handler=data_handler,
+            process=f'{positions[job]}/{len(jobs)}', timerange=timerange, erase=erase,
+            prepend=prepend)
+        stored[job] = (data, append)
+        return (_default_since_ms(since_ms, new_pairs_days), until_ms,
+                data.empty and not append)
+
+    def process(job: PairWithTimeframe, new_data: List) -> None:
+        pair, timeframe, candle_type = job
+        data, append = stored.pop(job)
+        _store_pair_download(pair, timeframe, candle_type, data_handler=data_handler,
+                             data=data, new_data=new_data, append=append)
+
+    with data_handler.catalog.deferred_save():
+        return exchange.get_historic_ohlcv_concurrently(jobs, prepare, process)
+
+
 def refresh_backtest_ohlcv_data(exchange: Exchange, pairs: List[str], timeframes: List[str],
                                 datadir: Path, trading_mode: str,
                                 timerange: Optional[TimeRange] = None,
@@ -286,27 +469,21 @@ def refresh_backtest_ohlcv_data(exchange: Exchange, pairs: List[str], timeframes
     """
     Refresh stored ohlcv data for backtesting and hyperopt operations.
     Used by freqtrade download-data subcommand.
+    All pairs and timeframes are downloaded concurrently.
     :return: List of pairs that are not available.
     """
     pairs_not_available = []
     data_handler = get_datahandler(datadir, data_format)
     candle_type = CandleType.get_default(trading_mode)
-    process = ''
-    for idx, pair in enumerate(pairs, start=1):
+    jobs: ListPairsWithTimeframes = []
+    for pair in pairs:
         if pair not in exchange.markets:
             pairs_not_available.append(pair)
             logger.info(f"Skipping pair {pair}...")
             continue
         for timeframe in timeframes:
-
             logger.debug(f'Downloading pair {pair}, {candle_type}, interval {timeframe}.')
-            process = f'{idx}/{len(pairs)}'
-            _download_pair_history(pair=pair, process=process,
-                                   datadir=datadir, exchange=exchange,
-                                   timerange=timerange, data_handler=data_handler,
-                                   timeframe=str(timeframe), new_pairs_days=new_pairs_days,
-                                   candle_type=candle_type,
-                                   erase=erase, prepend=prepend)
+            jobs.append((pair, str(timeframe), candle_type))
         if trading_mode == 'futures':
             # Predefined candletype (and timeframe) depending on exchange
             # Downloads what is necessary to backtest based on futures data.
@@ -315,13 +492,12 @@ def refresh_backtest_ohlcv_data(exchange: Exchange, pairs: List[str], timeframes
             # All exchanges need FundingRate for futures trading.
             # The timeframe is aligned to the mark-price timeframe.
             for funding_candle_type in (CandleType.FUNDING_RATE, fr_candle_type):
-                _download_pair_history(pair=pair, process=process,
-                                       datadir=datadir, exchange=exchange,
-                                       timerange=timerange, data_handler=data_handler,
-                                       timeframe=str(tf_mark), new_pairs_days=new_pairs_days,
-                                       candle_type=funding_candle_type,
-                                       erase=erase, prepend=prepend)
+                jobs.append((pair, str(tf_mark), funding_candle_type))
 
+    if jobs:
+        _download_pairs_history(jobs, datadir=datadir, exchange=exchange,
+                                new_pairs_days=new_pairs_days, data_handler=data_handler,
+                                timerange=timerange, erase=erase, prepend=prepend)
     return pairs_not_available
 
 
@@ -440,23 +616,29 @@ def convert_trades_to_ohlcv(
     candle_type: CandleType = CandleType.SPOT
 ) -> None:
     """
-    Convert stored trades data to ohlcv data
+    Convert stored trades data to ohlcv data.
+    Trades are streamed from disk in chunks, and all timeframes are converted in one pass.
     """
     data_handler_trades = get_datahandler(datadir, data_format=data_format_trades)
     data_handler_ohlcv = get_datahandler(datadir, data_format=data_format_ohlcv)
 
-    for pair in pairs:
-        trades = data_handler_trades.trades_load(pair)
-        for timeframe in timeframes:
+    with data_handler_ohlcv.catalog.deferred_save():
+        for pair in pairs:
             if erase:
-                if data_handler_ohlcv.ohlcv_purge(pair, timeframe, candle_type=candle_type):
-                    logger.info(f'Deleting existing data for pair {pair}, interval {timeframe}.')
+                for timeframe in timeframes:
+                    if data_handler_ohlcv.ohlcv_purge(pair, timeframe, candle_type=candle_type):
+                        logger.info(f'Deleting existing data for pair {pair}, '
+                                    f'interval {timeframe}.')
             try:
-                ohlcv = trades_to_ohlcv(trades, timeframe)
-                # Store ohlcv
-                data_handler_ohlcv.ohlcv_store(pair, timeframe, data=ohlcv, candle_type=candle_type)
+                ohlcv = trades_chunks_to_ohlcv(data_handler_trades.trades_load_chunks(pair),
+                                               timeframes)
             except ValueError:
                 logger.exception(f'Could not convert {pair} to OHLCV.')
+                continue
+            for timeframe, data in ohlcv.items():
+                # Store ohlcv
+                data_handler_ohlcv.ohlcv_store(pair, timeframe, data=data,
+                                               candle_type=candle_type)
 
 
 def get_timerange(data: Dict[str, DataFrame]) -> Tuple[datetime, datetime]:
@@ -5,32 +5,43 @@ It's subclasses handle and storing data from disk.
 """
 import logging
 import re
+import shutil
 from abc import ABC, abstractmethod
 from copy import deepcopy
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Optional, Tuple, Type
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type
 
-from pandas import DataFrame
+from pandas import DataFrame, concat, to_datetime
 
 from freqtrade import misc
 from freqtrade.configuration import TimeRange
-from freqtrade.constants import DEFAULT_TRADES_COLUMNS, ListPairsWithTimeframes
+from freqtrade.constants import (DEFAULT_DATAFRAME_COLUMNS, DEFAULT_TRADES_COLUMNS,
+                                 ListPairsWithTimeframes)
 from freqtrade.data.converter import (clean_ohlcv_dataframe, trades_convert_types,
                                       trades_df_remove_duplicates, trim_dataframe)
+from freqtrade.data.history.ohlcv_catalog import OhlcvCatalog
 from freqtrade.enums import CandleType, TradingMode
 from freqtrade.exchange import timeframe_to_seconds
 
 
 logger = logging.getLogger(__name__)
 
+# Number of appended segments per data file before they are merged into the data file.
+OHLCV_MAX_SEGMENTS = 30
+# Approximate number of trades loaded at once by `trades_load_chunks()`.
+TRADES_CHUNK_SIZE = 500_000
+
 
 class IDataHandler(ABC):
 
     _OHLCV_REGEX = r'^([a-zA-Z_\d-]+)\-(\d+[a-zA-Z]{1,2})\-?([a-zA-Z_]*)?(?=\.)'
+    # Files of different pairs can be loaded from multiple threads at once
+    _concurrent_load = True
 
     def __init__(self, datadir: Path) -> None:
         self._datadir = datadir
+        self.catalog = OhlcvCatalog(datadir)
 
     @classmethod
     def _get_file_extension(cls) -> str:
@@ -81,10 +92,25 @@ class IDataHandler(ABC):
         # Check if regex found something and only return these results
         return [cls.rebuild_pair_from_filename(match[0]) for match in _tmp if match]
 
-    @abstractmethod
     def ohlcv_store(
             self, pair: str, timeframe: str, data: DataFrame, candle_type: CandleType) -> None:
         """
+        Store ohlcv data and record it in the ohlcv catalog.
+        Replaces all stored data, including appended segments.
+        :param pair: Pair - used to generate filename
+        :param timeframe: Timeframe - used to generate filename
+        :param data: Dataframe containing OHLCV data
+        :param candle_type: Any of the enum CandleType (must match trading mode!)
+        :return: None
+        """
+        self._ohlcv_store(pair, timeframe, data, candle_type)
+        filename = self._pair_data_filename(self._datadir, pair, timeframe, candle_type)
+        self._ohlcv_remove_segments(filename)
+        self.catalog.update(filename, data, timeframe)
+
+    def _ohlcv_store(
+            self, pair: str, timeframe: str, data: DataFrame, candle_type: CandleType) -> None:
+        """
         Store ohlcv data.
         :param pair: Pair - used to generate filename
         :param timeframe: Timeframe - used to generate filename
@@ -92,6 +118,79 @@ class IDataHandler(ABC):
         :param candle_type: Any of the enum CandleType (must match trading mode!)
         :return: None
         """
+        filename = self._pair_data_filename(self._datadir, pair, timeframe, candle_type)
+        self.create_dir_if_needed(filename)
+        self._ohlcv_write(filename, data)
+
+    def _ohlcv_write(self, filename: Path, data: DataFrame) -> None:
+        """
+        Write ohlcv data to a file (data file or segment).
+        Implemented by all datahandlers which don't override `_ohlcv_store()`, `_ohlcv_load()`
+        and `ohlcv_append()`.
+        :param filename: File to write
+        :param data: Dataframe containing OHLCV data
+        """
+        raise NotImplementedError()
+
+    def _ohlcv_read(self, filename: Path, timerange: Optional[TimeRange]) -> DataFrame:
+        """
+        Read ohlcv data from a file (data file or segment) and convert it to a Pandas dataframe.
+        :param filename: File to read
+        :param timerange: Limit data to be loaded to this timerange.
+                        Optionally implemented by subclasses to avoid loading
+                        all data where possible.
+        :return: DataFrame with ohlcv data
+        """
+        raise NotImplementedError()
+
+    @staticmethod
+    def _ohlcv_segment_dir(filename: Path) -> Path:
+        """
+        Directory containing the segments appended to a data file.
+        """
+        return filename.with_name(f"{filename.name}.segments")
+
+    def _ohlcv_segments(self, filename: Path) -> List[Path]:
+        """
+        Segments appended to a data file, in order.
+        """
+        segment_dir = self._ohlcv_segment_dir(filename)
+        if not segment_dir.is_dir():
+            return []
+        return sorted(segment_dir.glob(f"*.{self._get_file_extension()}"))
+
+    def _ohlcv_remove_segments(self, filename: Path) -> None:
+        segment_dir = self._ohlcv_segment_dir(filename)
+        if segment_dir.is_dir():
+            shutil.rmtree(segment_dir)
+
+    def ohlcv_data_info(self, pair: str, timeframe: str,
+                        candle_type: CandleType) -> Optional[Dict[str, Any]]:
+        """
+        Returns row count, first / last candle (timestamps in ms), gaps and checksum
+        of the stored data for the given pair and timeframe.
+        Served from the ohlcv catalog - files which are not cataloged yet are loaded once
+        and added to the catalog. The catalog is saved by `ohlcv_store()` / `ohlcv_purge()`,
+        or explicitly by calling `catalog.save()`.
+        :param pair: Pair to get information for
+        :param timeframe: Timeframe to get information for
+        :param candle_type: Any of the enum CandleType (must match trading mode!)
+        :return: Catalog entry, None if there is no data
+        """
+        filename = self._pair_data_filename(self._datadir, pair, timeframe, candle_type)
+        if not filename.exists():
+            # Fallback mode for 1M files
+            filename = self._pair_data_filename(
+                self._datadir, pair, timeframe, candle_type, no_timeframe_modify=True)
+            if not filename.exists():
+                return None
+        segments = self._ohlcv_segments(filename)
+        entry = self.catalog.get(filename, len(segments))
+        if entry is None:
+            data = self._ohlcv_load(pair, timeframe, None, candle_type)
+            self.catalog.update(filename, data, timeframe, save=False, segments=segments)
+            entry = self.catalog.get(filename, len(segments))
+        return entry
 
     def ohlcv_data_min_max(self, pair: str, timeframe: str,
                            candle_type: CandleType) -> Tuple[datetime, datetime]:
@@ -102,15 +201,15 @@ class IDataHandler(ABC):
         :param candle_type: Any of the enum CandleType (must match trading mode!)
         :return: (min, max)
         """
-        data = self._ohlcv_load(pair, timeframe, None, candle_type)
-        if data.empty:
+        info = self.ohlcv_data_info(pair, timeframe, candle_type)
+        if not info or not info['rows']:
             return (
                 datetime.fromtimestamp(0, tz=timezone.utc),
                 datetime.fromtimestamp(0, tz=timezone.utc)
             )
-        return data.iloc[0]['date'].to_pydatetime(), data.iloc[-1]['date'].to_pydatetime()
+        return (datetime.fromtimestamp(info['start'] / 1000, tz=timezone.utc),
+                datetime.fromtimestamp(info['end'] / 1000, tz=timezone.utc))
 
-    @abstractmethod
     def _ohlcv_load(self, pair: str, timeframe: str, timerange: Optional[TimeRange],
                     candle_type: CandleType
                     ) -> DataFrame:
@@ -126,6 +225,21 @@ class IDataHandler(ABC):
         :param candle_type: Any of the enum CandleType (must match trading mode!)
         :return: DataFrame with ohlcv data, or empty DataFrame
         """
+        filename = self._pair_data_filename(
+            self._datadir, pair, timeframe, candle_type=candle_type)
+        if not filename.exists():
+            # Fallback mode for 1M files
+            filename = self._pair_data_filename(
+                self._datadir, pair, timeframe, candle_type=candle_type, no_timeframe_modify=True)
+            if not filename.exists():
+                return DataFrame(columns=DEFAULT_DATAFRAME_COLUMNS)
+
+        pairdata = self._ohlcv_read(filename, timerange)
+        segments = self._ohlcv_segments(filename)
+        if segments:
+            pairdata = concat([pairdata] + [self._ohlcv_read(segment, timerange)
+                                            for segment in segments], ignore_index=True)
+        return pairdata
 
     def ohlcv_purge(self, pair: str, timeframe: str, candle_type: CandleType) -> bool:
         """
@@ -138,10 +252,11 @@ class IDataHandler(ABC):
         filename = self._pair_data_filename(self._datadir, pair, timeframe, candle_type)
         if filename.exists():
             filename.unlink()
+            self._ohlcv_remove_segments(filename)
+            self.catalog.remove(filename)
             return True
         return False
 
-    @abstractmethod
     def ohlcv_append(
         self,
         pair: str,
@@ -150,12 +265,47 @@ class IDataHandler(ABC):
         candle_type: CandleType
     ) -> None:
         """
-        Append data to existing data structures
+        Append data to existing data structures.
+        The cost doesn't depend on the size of the stored data - by default, data is written
+        as a new segment. Segments are merged into the data file once there are
+        `OHLCV_MAX_SEGMENTS` of them.
+        Candles which are not newer than the stored data are ignored.
         :param pair: Pair
         :param timeframe: Timeframe this ohlcv data is for
         :param data: Data to append.
         :param candle_type: Any of the enum CandleType (must match trading mode!)
         """
+        filename = self._pair_data_filename(self._datadir, pair, timeframe, candle_type)
+        entry = self.ohlcv_data_info(pair, timeframe, candle_type) if filename.exists() else None
+        if not entry or not entry['rows']:
+            self.ohlcv_store(pair, timeframe, data, candle_type)
+            return
+        data = data.loc[data['date'] > to_datetime(entry['end'], unit='ms', utc=True)]
+        if not data.empty:
+            self._ohlcv_append(pair, timeframe, data, candle_type, entry)
+        # Keep the catalog entry - even if there was nothing to append
+        self.catalog.autosave()
+
+    def _ohlcv_append(self, pair: str, timeframe: str, data: DataFrame, candle_type: CandleType,
+                      entry: Dict[str, Any]) -> None:
+        """
+        Append candles newer than the stored data by writing a new segment.
+        :param entry: Catalog entry of the stored data
+        """
+        filename = self._pair_data_filename(self._datadir, pair, timeframe, candle_type)
+        segments = self._ohlcv_segments(filename)
+        if len(segments) >= OHLCV_MAX_SEGMENTS:
+            logger.info(f"Merging {len(segments)} segments into {filename}.")
+            stored = self._ohlcv_load(pair, timeframe, None, candle_type)
+            self.ohlcv_store(pair, timeframe, concat([stored, data], ignore_index=True),
+                             candle_type)
+            return
+
+        segment = (self._ohlcv_segment_dir(filename)
+                   / f"{len(segments) + 1:05d}.{self._get_file_extension()}")
+        segment.parent.mkdir(exist_ok=True)
+        self._ohlcv_write(segment, data)
+        self.catalog.append(filename, entry, data, timeframe, segment=segment)
 
     @classmethod
     def trades_get_pairs(cls, datadir: Path) -> List[str]:
@@ -193,7 +343,8 @@ class IDataHandler(ABC):
         """
         Load a pair from file, either .json.gz or .json
         :param pair: Load trades for this pair
-        :param timerange: Timerange to load trades for - currently not implemented
+        :param timerange: Timerange to load trades for.
+                          Start is inclusive, stop is exclusive.
         :return: Dataframe containing trades
         """
 
@@ -224,7 +375,8 @@ class IDataHandler(ABC):
         Load a pair from file, either .json.gz or .json
         Removes duplicates in the process.
         :param pair: Load trades for this pair
-        :param timerange: Timerange to load trades for - currently not implemented
+        :param timerange: Timerange to load trades for.
+                          Start is inclusive, stop is exclusive.
         :return: List of trades
         """
         trades = trades_df_remove_duplicates(self._trades_load(pair, timerange=timerange))
@@ -232,6 +384,67 @@ class IDataHandler(ABC):
         trades = trades_convert_types(trades)
         return trades
 
+    def _trades_load_chunks(self, pair: str, chunk_size: int) -> Iterator[DataFrame]:
+        """
+        Load trades of a pair in time-ordered chunks of about chunk_size trades.
+        Formats which can't be read partially load all trades as one chunk.
+        :param pair: Load trades for this pair
+        :param chunk_size: Number of trades per chunk
+        :return: Iterator of dataframes containing trades
+        """
+        yield self._trades_load(pair)
+
+    def trades_load_chunks(self, pair: str,
+                           chunk_size: int = TRADES_CHUNK_SIZE) -> Iterator[DataFrame]:
+        """
+        Load trades of a pair in time-ordered chunks, so the complete trades history
+        is never in memory at once.
+        Removes duplicates in the process - trades with identical timestamps are always
+        part of the same chunk.
+        :param pair: Load trades for this pair
+        :param chunk_size: Number of trades per chunk (approximately)
+        :return: Iterator of dataframes containing trades - in the format of `trades_load()`
+        """
+        carry = None
+        for chunk in self._trades_load_chunks(pair, chunk_size):
+            if carry is not None:
+                chunk = concat([carry, chunk], ignore_index=True)
+            if chunk.empty:
+                continue
+            # Trades with the last timestamp may continue in the next chunk
+            split = int(chunk['timestamp'].searchsorted(chunk['timestamp'].iloc[-1]))
+            carry = chunk.iloc[split:]
+            if split:
+                yield trades_convert_types(trades_df_remove_duplicates(chunk.iloc[:split]))
+        if carry is not None and not carry.empty:
+            yield trades_convert_types(trades_df_remove_duplicates(carry))
+
+    @staticmethod
+    def _timerange_bounds(
+            timerange: Optional[TimeRange]) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Start and stop of the timerange as timestamps in milliseconds.
+        None where the timerange is unbounded.
+        """
+        if not timerange:
+            return None, None
+        start = timerange.startts * 1000 if timerange.starttype == 'date' else None
+        stop = timerange.stopts * 1000 if timerange.stoptype == 'date' else None
+        return start, stop
+
+    @classmethod
+    def _trim_trades(cls, trades: DataFrame, timerange: Optional[TimeRange]) -> DataFrame:
+        """
+        Remove trades outside of the timerange (stop is exclusive - same as hdf5 does).
+        Used by handlers which can only skip parts of a file which are entirely out of range.
+        """
+        start, stop = cls._timerange_bounds(timerange)
+        if start is not None:
+            trades = trades.loc[trades['timestamp'] >= start]
+        if stop is not None:
+            trades = trades.loc[trades['timestamp'] < stop]
+        return trades.reset_index(drop=True)
+
     @classmethod
     def create_dir_if_needed(cls, datadir: Path):
         """
@@ -402,6 +615,10 @@ class IDataHandler(ABC):
             logger.warning(f"{file_new} exists already, can't migrate {pair}.")
             return
         file_old.rename(file_new)
+        segment_dir = self._ohlcv_segment_dir(file_old)
+        if segment_dir.is_dir():
+            segment_dir.rename(self._ohlcv_segment_dir(file_new))
+        self.catalog.remove(file_old)
 
 
 def get_datahandlerclass(datatype: str) -> Type[IDataHandler]:
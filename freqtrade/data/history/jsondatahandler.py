@@ -1,5 +1,10 @@
+import gzip
 import logging
-from typing import Optional
+import mmap
+import re
+from io import BufferedIOBase, BytesIO
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
 
 import numpy as np
 from pandas import DataFrame, read_json, to_datetime
@@ -15,26 +20,131 @@ from .idatahandler import IDataHandler
 
 logger = logging.getLogger(__name__)
 
+# Separator between two rows of a list of lists, e.g. "],["
+_ROW_SEPARATOR = re.compile(rb'\]\s*,\s*\[')
+_LEADING_NUMBER = re.compile(rb'\s*(-?[\d.]+(?:[eE][+-]?\d+)?)\s*,')
+_LIST_OF_LISTS = re.compile(rb'\s*\[\s*\[')
+# Approximate size of one trade in json format, in bytes
+_TRADE_BYTES = 100
+
+
+def _slice_json_rows(raw, start: Optional[int], stop: Optional[int]) -> Optional[bytes]:
+    """
+    Cut the rows between start and stop (both inclusive) out of a json list of lists,
+    as written with orient="values". Rows must start with a timestamp in milliseconds and
+    be sorted by it - so they can be located by binary search on the raw bytes,
+    and only the selected rows need to be parsed.
+    :param raw: json data (bytes or a memory map)
+    :param start: Start timestamp in milliseconds, None for unbounded
+    :param stop: Stop timestamp in milliseconds, None for unbounded
+    :return: json list containing the selected rows,
+        None if the data is not in the expected format
+    """
+    head = _LIST_OF_LISTS.match(raw)
+    if not head:
+        return None
+    first_row = head.end() - 1
+    # Closing bracket of the outer list
+    end = raw.rfind(b']')
+
+    def row_at(pos: int) -> Tuple[int, float]:
+        """ Offset and timestamp of the first row starting at or after pos """
+        row = first_row
+        if pos > first_row:
+            separator = _ROW_SEPARATOR.search(raw, pos, end)
+            if not separator:
+                return end, float('inf')
+            row = separator.end() - 1
+        timestamp = _LEADING_NUMBER.match(raw, row + 1)
+        if not timestamp:
+            raise ValueError("Rows don't start with a timestamp.")
+        return row, float(timestamp.group(1))
+
+    def find_row(timestamp: int, after: bool) -> int:
+        """ Offset of the first row at (or after) timestamp """
+        lo, hi = first_row, end
+        while lo < hi:
+            mid = (lo + hi) // 2
+            row_ts = row_at(mid)[1]
+            if row_ts > timestamp or (row_ts == timestamp and not after):
+                hi = mid
+            else:
+                lo = mid + 1
+        return row_at(lo)[0]
+
+    try:
+        begin = find_row(start, after=False) if start is not None else first_row
+        finish = find_row(stop, after=True) if stop is not None else end
+    except ValueError:
+        return None
+    if begin >= finish:
+        return b'[]'
+    return b'[' + raw[begin:finish].rstrip(b' \t\r\n,') + b']'
+
+
+def _load_json_rows(filename: Path, start: Optional[int], stop: Optional[int]
+                    ) -> Optional[bytes]:
+    """
+    Load the rows between start and stop from a (gzipped) json file - see `_slice_json_rows`.
+    Plain json files are memory mapped, so only the selected part of the file is read.
+    """
+    if filename.suffix == '.gz':
+        with gzip.open(filename) as gzfile:
+            return _slice_json_rows(gzfile.read(), start, stop)
+    with filename.open('rb') as file:
+        if filename.stat().st_size == 0:
+            return None
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as raw:
+            return _slice_json_rows(raw, start, stop)
+
+
+def _iter_json_rows(file: BufferedIOBase, block_size: int) -> Iterator[bytes]:
+    """
+    Split a json list of lists into json lists of complete rows, reading the file
+    block by block - so the complete file is never in memory at once.
+    :param file: File positioned at the start of a json list of lists (as written
+        with orient="values")
+    :param block_size: Number of bytes to read at once
+    :return: Iterator of json lists, in file order
+    """
+    pending = b''
+    first = True
+    while True:
+        block = file.read(block_size)
+        pending += block
+        if first:
+            head = _LIST_OF_LISTS.match(pending)
+            if head:
+                pending = pending[head.end() - 1:]
+                first = False
+        if not block:
+            # Remaining rows, without the closing bracket of the outer list
+            rows = pending.rstrip()[:-1]
+            if not first and rows.strip():
+                yield b'[' + rows + b']'
+            return
+        last = None
+        for last in _ROW_SEPARATOR.finditer(pending):
+            pass
+        if first or last is None:
+            continue
+        yield b'[' + pending[:last.start() + 1] + b']'
+        pending = pending[last.end() - 1:]
+
 
 class JsonDataHandler(IDataHandler):
 
     _use_zip = False
     _columns = DEFAULT_DATAFRAME_COLUMNS
 
-    def ohlcv_store(
-            self, pair: str, timeframe: str, data: DataFrame, candle_type: CandleType) -> None:
+    def _ohlcv_write(self, filename: Path, data: DataFrame) -> None:
         """
         Store data in json format "values".
             format looks as follows:
             [[<date>,<open>,<high>,<low>,<close>]]
-        :param pair: Pair - used to generate filename
-        :param timeframe: Timeframe - used to generate filename
+        :param filename: File to write
         :param data: Dataframe containing OHLCV data
-        :param candle_type: Any of the enum CandleType (must match trading mode!)
-        :return: None
         """
-        filename = self._pair_data_filename(self._datadir, pair, timeframe, candle_type)
-        self.create_dir_if_needed(filename)
         _data = data.copy()
         # Convert date to int
         _data['date'] = _data['date'].view(np.int64) // 1000 // 1000
@@ -44,55 +154,39 @@ class JsonDataHandler(IDataHandler):
             filename, orient="values",
             compression='gzip' if self._use_zip else None)
 
+    def _ohlcv_read(self, filename: Path, timerange: Optional[TimeRange]) -> DataFrame:
+        """
+        Read ohlcv data from a file and convert it to a Pandas dataframe.
+        Only rows within the timerange are parsed.
+        :param filename: File to read
+        :param timerange: Limit data to be loaded to this timerange
+        :return: DataFrame with ohlcv data
+        """
+        rows = None
+        if timerange:
+            rows = _load_json_rows(filename, *self._timerange_bounds(timerange))
+        if rows == b'[]':
+            pairdata = DataFrame(columns=self._columns)
+        else:
+            pairdata = read_json(BytesIO(rows) if rows else filename, orient='values')
+        pairdata.columns = self._columns
+        pairdata = pairdata.astype(dtype={'open': 'float', 'high': 'float',
+                                          'low': 'float', 'close': 'float', 'volume': 'float'})
+        pairdata['date'] = to_datetime(pairdata['date'], unit='ms', utc=True)
+        return pairdata
+
     def _ohlcv_load(self, pair: str, timeframe: str,
                     timerange: Optional[TimeRange], candle_type: CandleType
                     ) -> DataFrame:
         """
         Internal method used to load data for one pair from disk.
-        Implements the loading and conversion to a Pandas dataframe.
-        Timerange trimming and dataframe validation happens outside of this method.
-        :param pair: Pair to load data
-        :param timeframe: Timeframe (e.g. "5m")
-        :param timerange: Limit data to be loaded to this timerange.
-                        Optionally implemented by subclasses to avoid loading
-                        all data where possible.
-        :param candle_type: Any of the enum CandleType (must match trading mode!)
-        :return: DataFrame with ohlcv data, or empty DataFrame
+        Invalid files are logged and treated as empty.
         """
-        filename = self._pair_data_filename(
-            self._datadir, pair, timeframe, candle_type=candle_type)
-        if not filename.exists():
-            # Fallback mode for 1M files
-            filename = self._pair_data_filename(
-                self._datadir, pair, timeframe, candle_type=candle_type, no_timeframe_modify=True)
-            if not filename.exists():
-                return DataFrame(columns=self._columns)
         try:
-            pairdata = read_json(filename, orient='values')
-            pairdata.columns = self._columns
+            return super()._ohlcv_load(pair, timeframe, timerange, candle_type)
         except ValueError:
             logger.error(f"Could not load data for {pair}.")
             return DataFrame(columns=self._columns)
-        pairdata = pairdata.astype(dtype={'open': 'float', 'high': 'float',
-                                          'low': 'float', 'close': 'float', 'volume': 'float'})
-        pairdata['date'] = to_datetime(pairdata['date'], unit='ms', utc=True)
-        return pairdata
-
-    def ohlcv_append(
-        self,
-        pair: str,
-        timeframe: str,
-        data: DataFrame,
-        candle_type: CandleType
-    ) -> None:
-        """
-        Append data to existing data structures
-        :param pair: Pair
-        :param timeframe: Timeframe this ohlcv data is for
-        :param data: Data to append.
-        :param candle_type: Any of the enum CandleType (must match trading mode!)
-        """
-        raise NotImplementedError()
 
     def _trades_store(self, pair: str, data: DataFrame) -> None:
         """
@@ -117,12 +211,20 @@ class JsonDataHandler(IDataHandler):
     def _trades_load(self, pair: str, timerange: Optional[TimeRange] = None) -> DataFrame:
         """
         Load a pair from file, either .json.gz or .json
-        # TODO: respect timerange ...
+        With a timerange, only the trades within the timerange are parsed.
         :param pair: Load trades for this pair
-        :param timerange: Timerange to load trades for - currently not implemented
+        :param timerange: Timerange to load trades for
         :return: Dataframe containing trades
         """
         filename = self._pair_trades_filename(self._datadir, pair)
+        if timerange and filename.is_file():
+            rows = _load_json_rows(filename, *self._timerange_bounds(timerange))
+            if rows is not None:
+                tradesdata = misc.json_load(BytesIO(rows))
+                if not tradesdata:
+                    return DataFrame(columns=DEFAULT_TRADES_COLUMNS)
+                return self._trim_trades(trades_list_to_df(tradesdata, convert=False), timerange)
+
         tradesdata = misc.file_load_json(filename)
 
         if not tradesdata:
@@ -133,7 +235,26 @@ class JsonDataHandler(IDataHandler):
             logger.info("Old trades format detected - converting")
             tradesdata = trades_dict_to_list(tradesdata)
             pass
-        return trades_list_to_df(tradesdata, convert=False)
+        return self._trim_trades(trades_list_to_df(tradesdata, convert=False), timerange)
+
+    def _trades_load_chunks(self, pair: str, chunk_size: int) -> Iterator[DataFrame]:
+        """
+        Load trades in chunks of about chunk_size trades, parsing the file block by block.
+        Trades in the old (dict) format are loaded as one chunk.
+        :param pair: Load trades for this pair
+        :param chunk_size: Approximate number of trades per chunk
+        :return: Iterator of dataframes containing trades
+        """
+        filename = self._pair_trades_filename(self._datadir, pair)
+        if not filename.is_file():
+            return
+        with (gzip.open(filename) if filename.suffix == '.gz' else filename.open('rb')) as file:
+            if not _LIST_OF_LISTS.match(file.read(64)):
+                yield self._trades_load(pair)
+                return
+            file.seek(0)
+            for rows in _iter_json_rows(file, chunk_size * _TRADE_BYTES):
+                yield trades_list_to_df(misc.json_load(BytesIO(rows)), convert=False)
 
     @classmethod
     def _get_file_extension(cls):
@@ -0,0 +1,255 @@
+"""
+Catalog of the ohlcv files within a datadir.
+Allows answering min / max / coverage queries without loading the data files.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Sequence
+
+import numpy as np
+import rapidjson
+from pandas import DataFrame
+
+from freqtrade.exchange import timeframe_to_seconds
+
+
+logger = logging.getLogger(__name__)
+
+CATALOG_FILENAME = '.ohlcv-catalog.json'
+# Changes collected before saving, while saving is deferred
+CATALOG_SAVE_BATCH = 100
+
+# Catalog files can be shared by multiple datahandlers of the same datadir.
+_catalog_locks: Dict[Path, threading.Lock] = {}
+_catalog_locks_lock = threading.Lock()
+
+
+def _catalog_lock(filename: Path) -> threading.Lock:
+    with _catalog_locks_lock:
+        return _catalog_locks.setdefault(filename, threading.Lock())
+
+
+def file_checksum(filename: Path) -> str:
+    """
+    sha256 checksum of a file's content.
+    """
+    digest = hashlib.sha256()
+    with filename.open('rb') as fp:
+        for chunk in iter(lambda: fp.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def summarize_ohlcv(data: DataFrame, timeframe: str) -> Dict[str, Any]:
+    """
+    Row count, first / last candle and missing candles of a (sorted) ohlcv dataframe.
+    Timestamps are in milliseconds.
+    Gaps are [first missing candle, last missing candle] ranges.
+    """
+    dates = np.asarray(data['date'].values, dtype='datetime64[ms]').view(np.int64)
+    if len(dates) == 0:
+        return {'rows': 0, 'start': None, 'end': None, 'gaps': []}
+    timeframe_ms = timeframe_to_seconds(timeframe) * 1000
+    gap_idx = np.flatnonzero(np.diff(dates) > timeframe_ms)
+    return {
+        'rows': len(dates),
+        'start': int(dates[0]),
+        'end': int(dates[-1]),
+        'gaps': [[int(dates[idx]) + timeframe_ms, int(dates[idx + 1]) - timeframe_ms]
+                 for idx in gap_idx],
+    }
+
+
+class OhlcvCatalog:
+    """
+    Sidecar index of all ohlcv files within a datadir.
+    Records row count, first / last candle, gaps and checksum of every data file
+    (and its appended segments).
+
+    Entries are validated against the size and modification time of the data file,
+    so files changed outside of freqtrade are not reported with stale information.
+    """
+
+    def __init__(self, datadir: Path) -> None:
+        self._datadir = datadir
+        self.filename = datadir / CATALOG_FILENAME
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        # Modification time of the catalog file when it was last read
+        self._loaded_mtime: Optional[int] = None
+        # Changes not yet saved - None marks removed entries
+        self._pending: Dict[str, Optional[Dict[str, Any]]] = {}
+        # Nesting depth of deferred_save()
+        self._deferred = 0
+
+    def _key(self, file: Path) -> str:
+        try:
+            return file.relative_to(self._datadir).as_posix()
+        except ValueError:
+            return file.as_posix()
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            mtime = self.filename.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._entries = {}
+            self._loaded_mtime = None
+            return self._entries
+        if mtime != self._loaded_mtime:
+            try:
+                with self.filename.open('r') as fp:
+                    self._entries = rapidjson.load(fp, number_mode=rapidjson.NM_NATIVE)
+            except (ValueError, OSError) as e:
+                logger.warning(f"Could not read ohlcv catalog {self.filename}, ignoring it. {e}")
+                self._entries = {}
+            self._loaded_mtime = mtime
+        return self._entries
+
+    def get(self, file: Path, segments: int = 0) -> Optional[Dict[str, Any]]:
+        """
+        Catalog entry of a data file.
+        :param file: Data file
+        :param segments: Number of segments appended to the data file
+        :return: Entry, or None if the file is not cataloged or was changed since.
+        """
+        key = self._key(file)
+        if key in self._pending:
+            entry = self._pending[key]
+        else:
+            entry = self._read().get(key)
+        if not entry:
+            return None
+        try:
+            stat = file.stat()
+        except FileNotFoundError:
+            return None
+        if (entry['size'] != stat.st_size or entry['mtime_ns'] != stat.st_mtime_ns
+                or len(entry.get('segments', [])) != segments):
+            return None
+        return entry
+
+    def update(self, file: Path, data: DataFrame, timeframe: str, save: bool = True,
+               segments: Sequence[Path] = ()) -> None:
+        """
+        Record the content of a data file.
+        :param file: Data file - must already be written
+        :param data: Data as stored in the file (and its segments)
+        :param timeframe: Timeframe of the data
+        :param save: Save the catalog (see `autosave()`) - otherwise `save()` must be called.
+        :param segments: Segments appended to the data file
+        """
+        stat = file.stat()
+        self._pending[self._key(file)] = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'checksum': file_checksum(file),
+            'segments': [file_checksum(segment) for segment in segments],
+            **summarize_ohlcv(data, timeframe),
+        }
+        if save:
+            self.autosave()
+
+    def append(self, file: Path, entry: Dict[str, Any], data: DataFrame, timeframe: str,
+               segment: Optional[Path] = None) -> None:
+        """
+        Record data appended to a data file - without reading the complete data file.
+        :param file: Data file
+        :param entry: Catalog entry of the data file before appending
+        :param data: Appended data - must be newer than the existing data
+        :param timeframe: Timeframe of the data
+        :param segment: Segment the data was written to.
+            None if the data was appended to the data file itself.
+        """
+        appended = summarize_ohlcv(data, timeframe)
+        if not appended['rows']:
+            return
+        gaps = list(entry['gaps'])
+        timeframe_ms = timeframe_to_seconds(timeframe) * 1000
+        if entry['rows'] and appended['start'] - entry['end'] > timeframe_ms:
+            gaps.append([entry['end'] + timeframe_ms, appended['start'] - timeframe_ms])
+        gaps.extend(appended['gaps'])
+        updated = {
+            **entry,
+            'rows': entry['rows'] + appended['rows'],
+            'start': entry['start'] if entry['rows'] else appended['start'],
+            'end': appended['end'],
+            'gaps': gaps,
+        }
+        if segment:
+            updated['segments'] = entry.get('segments', []) + [file_checksum(segment)]
+        else:
+            stat = file.stat()
+            # Hashing the complete file would defeat the purpose of appending.
+            updated.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns, checksum=None)
+        self._pending[self._key(file)] = updated
+        self.autosave()
+
+    def remove(self, file: Path) -> None:
+        """
+        Remove a data file from the catalog.
+        """
+        key = self._key(file)
+        if key in self._pending or key in self._read():
+            self._pending[key] = None
+            self.autosave()
+
+    @contextmanager
+    def deferred_save(self) -> Iterator[None]:
+        """
+        Collect changes and save them in batches of CATALOG_SAVE_BATCH - and on exit.
+        Avoids rewriting the complete catalog for every file when storing many files.
+        """
+        self._deferred += 1
+        try:
+            yield
+        finally:
+            self._deferred -= 1
+            self.autosave()
+
+    def autosave(self) -> None:
+        """
+        Save pending changes - unless saving is deferred and the batch is not full yet.
+        """
+        if not self._deferred or len(self._pending) >= CATALOG_SAVE_BATCH:
+            self.save()
+
+    def save(self) -> None:
+        """
+        Write pending changes to disk.
+        Changes written by other handlers in the meantime are kept.
+        If the catalog can't be written (e.g. read-only datadir), changes are kept in memory.
+        """
+        if not self._pending:
+            return
+        try:
+            self._save()
+        except OSError as e:
+            logger.warning(f"Could not write ohlcv catalog {self.filename}. {e}")
+
+    def _save(self) -> None:
+        with _catalog_lock(self.filename):
+            entries = self._read()
+            for key, entry in self._pending.items():
+                if entry is None:
+                    entries.pop(key, None)
+                else:
+                    entries[key] = entry
+            if not entries and not self.filename.exists():
+                self._pending = {}
+                return
+            self._datadir.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first, so readers never see a partial catalog.
+            fd, tmpname = tempfile.mkstemp(dir=self._datadir, prefix=CATALOG_FILENAME)
+            try:
+                with os.fdopen(fd, 'w') as fp:
+                    rapidjson.dump(entries, fp, number_mode=rapidjson.NM_NATIVE)
+                Path(tmpname).replace(self.filename)
+            except OSError:
+                Path(tmpname).unlink(missing_ok=True)
+                raise
+            self._loaded_mtime = self.filename.stat().st_mtime_ns
+            self._pending = {}
@@ -1,86 +1,59 @@
 import logging
-from typing import Optional
+from pathlib import Path
+from typing import Iterator, Optional
 
-from pandas import DataFrame, read_parquet, to_datetime
+import pyarrow.parquet as pq
+from pandas import DataFrame, Timestamp, read_parquet, to_datetime
 
 from freqtrade.configuration import TimeRange
 from freqtrade.constants import DEFAULT_DATAFRAME_COLUMNS, DEFAULT_TRADES_COLUMNS, TradeList
-from freqtrade.enums import CandleType
 
 from .idatahandler import IDataHandler
 
 
 logger = logging.getLogger(__name__)
 
+# Row group statistics allow skipping row groups which are out of the requested timerange.
+# ~10 days of 1m candles per row group.
+ROW_GROUP_SIZE = 15_000
+
 
 class ParquetDataHandler(IDataHandler):
 
     _columns = DEFAULT_DATAFRAME_COLUMNS
 
-    def ohlcv_store(
-            self, pair: str, timeframe: str, data: DataFrame, candle_type: CandleType) -> None:
+    def _ohlcv_write(self, filename: Path, data: DataFrame) -> None:
         """
-        Store data in json format "values".
-            format looks as follows:
-            [[<date>,<open>,<high>,<low>,<close>]]
-        :param pair: Pair - used to generate filename
-        :param timeframe: Timeframe - used to generate filename
+        Store data in parquet format.
+        :param filename: File to write
         :param data: Dataframe containing OHLCV data
-        :param candle_type: Any of the enum CandleType (must match trading mode!)
-        :return: None
         """
-        filename = self._pair_data_filename(self._datadir, pair, timeframe, candle_type)
-        self.create_dir_if_needed(filename)
 
-        data.reset_index(drop=True).loc[:, self._columns].to_parquet(filename)
+        data.reset_index(drop=True).loc[:, self._columns].to_parquet(
+            filename, row_group_size=ROW_GROUP_SIZE)
 
-    def _ohlcv_load(self, pair: str, timeframe: str,
-                    timerange: Optional[TimeRange], candle_type: CandleType
-                    ) -> DataFrame:
+    def _ohlcv_read(self, filename: Path, timerange: Optional[TimeRange]) -> DataFrame:
         """
-        Internal method used to load data for one pair from disk.
-        Implements the loading and conversion to a Pandas dataframe.
-        Timerange trimming and dataframe validation happens outside of this method.
-        :param pair: Pair to load data
-        :param timeframe: Timeframe (e.g. "5m")
-        :param timerange: Limit data to be loaded to this timerange.
-                        Optionally implemented by subclasses to avoid loading
-                        all data where possible.
-        :param candle_type: Any of the enum CandleType (must match trading mode!)
-        :return: DataFrame with ohlcv data, or empty DataFrame
+        Read ohlcv data from a file and convert it to a Pandas dataframe.
+        Row groups outside of the timerange are skipped based on their statistics.
+        :param filename: File to read
+        :param timerange: Limit data to be loaded to this timerange
+        :return: DataFrame with ohlcv data
         """
-        filename = self._pair_data_filename(
-            self._datadir, pair, timeframe, candle_type=candle_type)
-        if not filename.exists():
-            # Fallback mode for 1M files
-            filename = self._pair_data_filename(
-                self._datadir, pair, timeframe, candle_type=candle_type, no_timeframe_modify=True)
-            if not filename.exists():
-                return DataFrame(columns=self._columns)
 
-        pairdata = read_parquet(filename)
+        start, stop = self._timerange_bounds(timerange)
+        filters = []
+        if start is not None:
+            filters.append(('date', '>=', Timestamp(start, unit='ms', tz='UTC')))
+        if stop is not None:
+            filters.append(('date', '<=', Timestamp(stop, unit='ms', tz='UTC')))
+        pairdata = read_parquet(filename, filters=filters or None)
         pairdata.columns = self._columns
         pairdata = pairdata.astype(dtype={'open': 'float', 'high': 'float',
                                           'low': 'float', 'close': 'float', 'volume': 'float'})
         pairdata['date'] = to_datetime(pairdata['date'], unit='ms', utc=True)
         return pairdata
 
-    def ohlcv_append(
-        self,
-        pair: str,
-        timeframe: str,
-        data: DataFrame,
-        candle_type: CandleType
-    ) -> None:
-        """
-        Append data to existing data structures
-        :param pair: Pair
-        :param timeframe: Timeframe this ohlcv data is for
-        :param data: Data to append.
-        :param candle_type: Any of the enum CandleType (must match trading mode!)
-        """
-        raise NotImplementedError()
-
     def _trades_store(self, pair: str, data: DataFrame) -> None:
         """
         Store trades data (list of Dicts) to file
@@ -90,7 +63,7 @@ class ParquetDataHandler(IDataHandler):
         """
         filename = self._pair_trades_filename(self._datadir, pair)
         self.create_dir_if_needed(filename)
-        data.reset_index(drop=True).to_parquet(filename)
+        data.reset_index(drop=True).to_parquet(filename, row_group_size=ROW_GROUP_SIZE)
 
     def trades_append(self, pair: str, data: DataFrame):
         """
@@ -104,19 +77,38 @@ class ParquetDataHandler(IDataHandler):
     def _trades_load(self, pair: str, timerange: Optional[TimeRange] = None) -> TradeList:
         """
         Load a pair from file, either .json.gz or .json
-        # TODO: respect timerange ...
+        Row groups outside of the timerange are skipped based on their statistics.
         :param pair: Load trades for this pair
-        :param timerange: Timerange to load trades for - currently not implemented
+        :param timerange: Timerange to load trades for
         :return: List of trades
         """
         filename = self._pair_trades_filename(self._datadir, pair)
         if not filename.exists():
             return DataFrame(columns=DEFAULT_TRADES_COLUMNS)
 
-        tradesdata = read_parquet(filename)
+        start, stop = self._timerange_bounds(timerange)
+        filters = []
+        if start is not None:
+            filters.append(('timestamp', '>=', start))
+        if stop is not None:
+            filters.append(('timestamp', '<', stop))
+        tradesdata = read_parquet(filename, filters=filters or None)
 
         return tradesdata
 
+    def _trades_load_chunks(self, pair: str, chunk_size: int) -> Iterator[DataFrame]:
+        """
+        Load trades in batches of chunk_size trades.
+        :param pair: Load trades for this pair
+        :param chunk_size: Number of trades per chunk
+        :return: Iterator of dataframes containing trades
+        """
+        filename = self._pair_trades_filename(self._datadir, pair)
+        if not filename.exists():
+            return
+        for batch in pq.ParquetFile(filename).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+
     @classmethod
     def _get_file_extension(cls):
         return "parquet"
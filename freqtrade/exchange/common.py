@@ -35,6 +35,11 @@ def _get_logging_mixin():
 API_RETRY_COUNT = 4
 API_FETCH_ORDER_RETRY_COUNT = 5
 
+# Number of candle histories downloaded concurrently by `get_historic_ohlcv_concurrently()`.
+# Every download issues up to 100 requests at once, which ccxt throttles to the rate limit -
+# so this must stay well below the capacity of the ccxt throttle queue (2000).
+HISTORIC_OHLCV_CONCURRENCY = 8
+
 BAD_EXCHANGES = {
     "bitmex": "Various reasons.",
     "phemex": "Does not provide history.",
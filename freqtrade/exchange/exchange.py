@@ -6,11 +6,12 @@ import asyncio
 import inspect
 import logging
 import signal
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 from datetime import datetime, timedelta, timezone
 from math import floor
 from threading import Lock
-from typing import Any, Coroutine, Dict, List, Literal, Optional, Tuple, Union
+from typing import Any, Callable, Coroutine, Dict, List, Literal, Optional, Tuple, Union
 
 import ccxt
 import ccxt.async_support as ccxt_async
@@ -22,22 +23,24 @@ from pandas import DataFrame, concat
 from freqtrade.constants import (DEFAULT_AMOUNT_RESERVE_PERCENT, NON_OPEN_EXCHANGE_STATES, BidAsk,
                                  BuySell, Config, EntryExit, ExchangeConfig,
                                  ListPairsWithTimeframes, MakerTaker, OBLiteral, PairWithTimeframe)
-from freqtrade.data.converter import clean_ohlcv_dataframe, ohlcv_to_dataframe, trades_dict_to_list
+from freqtrade.data.converter import (clean_ohlcv_dataframe, ohlcv_to_dataframe, resample_ohlcv,
+                                      trades_dict_to_list)
 from freqtrade.enums import OPTIMIZE_MODES, CandleType, MarginMode, TradingMode
 from freqtrade.enums.pricetype import PriceType
 from freqtrade.exceptions import (DDosProtection, ExchangeError, InsufficientFundsError,
                                   InvalidOrderException, OperationalException, PricingError,
                                   RetryableOrderError, TemporaryError)
-from freqtrade.exchange.common import (API_FETCH_ORDER_RETRY_COUNT, remove_exchange_credentials,
-                                       retrier, retrier_async)
+from freqtrade.exchange.common import (API_FETCH_ORDER_RETRY_COUNT, HISTORIC_OHLCV_CONCURRENCY,
+                                       remove_exchange_credentials, retrier, retrier_async)
 from freqtrade.exchange.exchange_utils import (ROUND, ROUND_DOWN, ROUND_UP, CcxtModuleType,
                                                amount_to_contract_precision, amount_to_contracts,
                                                amount_to_precision, contracts_to_amount,
                                                date_minus_candles, is_exchange_known_ccxt,
                                                market_is_active, price_to_precision,
-                                               timeframe_to_minutes, timeframe_to_msecs,
-                                               timeframe_to_next_date, timeframe_to_prev_date,
-                                               timeframe_to_seconds)
+                                               timeframe_is_derivable, timeframe_to_minutes,
+                                               timeframe_to_msecs, timeframe_to_next_date,
+                                               timeframe_to_prev_date, timeframe_to_seconds)
+from freqtrade.exchange.kline_buffer import KlineBuffer
 from freqtrade.exchange.types import OHLCVResponse, OrderBook, Ticker, Tickers
 from freqtrade.misc import (chunks, deep_merge_dicts, file_dump_json, file_load_json,
                             safe_value_fallback2)
@@ -129,6 +132,8 @@ class Exchange:
 
         # Holds candles
         self._klines: Dict[PairWithTimeframe, DataFrame] = {}
+        # Storage of cached candles - `_klines` holds views of these buffers
+        self._kline_buffers: Dict[PairWithTimeframe, KlineBuffer] = {}
 
         # Holds all open sell orders for dry_run
         self._dry_run_open_orders: Dict[str, Any] = {}
@@ -1919,6 +1924,63 @@ class Exchange:
         logger.info(f"Downloaded data for {pair} with length {len(data)}.")
         return data
 
+    def get_historic_ohlcv_concurrently(
+        self,
+        jobs: ListPairsWithTimeframes,
+        prepare: Callable[[PairWithTimeframe], Optional[Tuple[int, Optional[int], bool]]],
+        process: Callable[[PairWithTimeframe, List], None],
+        max_concurrent: int = HISTORIC_OHLCV_CONCURRENCY,
+    ) -> Dict[PairWithTimeframe, bool]:
+        """
+        Get candle history for multiple (pair, timeframe, candle_type) combinations.
+        Up to `max_concurrent` downloads run concurrently on the async loop - requests of all
+        downloads share ccxt's rate limiting.
+        Callbacks run in a (single) worker thread - so loading, parsing and storing data
+        overlaps with network waits of other downloads, but callbacks never run concurrently.
+        :param jobs: (pair, timeframe, candle_type) combinations to download
+        :param prepare: Called before downloading a job.
+            Returns (since_ms, until_ms, is_new_pair) - or None to skip the job.
+        :param process: Called with the downloaded candles of a job
+        :param max_concurrent: Maximum number of concurrent downloads
+        :return: Success state per job
+        """
+        semaphore = asyncio.Semaphore(max_concurrent)
+        executor = ThreadPoolExecutor(max_workers=1)
+
+        async def download(job: PairWithTimeframe) -> Tuple[PairWithTimeframe, bool]:
+            pair, timeframe, candle_type = job
+            async with semaphore:
+                try:
+                    request = await self.loop.run_in_executor(executor, prepare, job)
+                    if request is None:
+                        return job, True
+                    since_ms, until_ms, is_new_pair = request
+                    _, _, _, data, _ = await self._async_get_historic_ohlcv(
+                        pair=pair, timeframe=timeframe, since_ms=since_ms, until_ms=until_ms,
+                        is_new_pair=is_new_pair, candle_type=candle_type)
+                    await self.loop.run_in_executor(executor, process, job, data)
+                except Exception:
+                    logger.exception(f'Failed to download history data for pair: "{pair}", '
+                                     f'timeframe: {timeframe}, candle type: {candle_type}.')
+                    return job, False
+            logger.info(f"Downloaded data for {pair}, {timeframe}, {candle_type} "
+                        f"with length {len(data)}.")
+            return job, True
+
+        async def download_all() -> Dict[PairWithTimeframe, bool]:
+            results: Dict[PairWithTimeframe, bool] = {}
+            for done in asyncio.as_completed([download(job) for job in jobs]):
+                job, success = await done
+                results[job] = success
+                logger.info(f"Downloaded {len(results)}/{len(jobs)} pairs / timeframes.")
+            return results
+
+        try:
+            with self._loop_lock:
+                return self.loop.run_until_complete(download_all())
+        finally:
+            executor.shutdown(wait=True)
+
     async def _async_get_historic_ohlcv(self, pair: str, timeframe: str,
                                         since_ms: int, candle_type: CandleType,
                                         is_new_pair: bool = False, raise_: bool = False,
@@ -1977,6 +2039,7 @@ class Exchange:
                 logger.info(
                     f"Time jump detected. Evicting cache for {pair}, {timeframe}, {candle_type}")
                 del self._klines[(pair, timeframe, candle_type)]
+                self._kline_buffers.pop((pair, timeframe, candle_type), None)
 
         if (not since_ms and (self._ft_has["ohlcv_require_since"] or not_all_data)):
             # Multiple calls for one pair - to get more history
@@ -2035,23 +2098,101 @@ class Exchange:
         ohlcv_df = ohlcv_to_dataframe(ticks, timeframe, pair=pair, fill_missing=True,
                                       drop_incomplete=drop_incomplete)
         if cache:
-            if (pair, timeframe, c_type) in self._klines:
-                old = self._klines[(pair, timeframe, c_type)]
-                # Reassign so we return the updated, combined df
-                ohlcv_df = clean_ohlcv_dataframe(concat([old, ohlcv_df], axis=0), timeframe, pair,
-                                                 fill_missing=True, drop_incomplete=False)
+            key = (pair, timeframe, c_type)
+            buffer = self._kline_buffers.get(key)
+            # Candles can only be merged in place if `_klines` still holds the buffer's view.
+            if buffer is None or self._klines.get(key) is not buffer.view or not buffer.update(
+                    ohlcv_df):
+                if key in self._klines:
+                    ohlcv_df = clean_ohlcv_dataframe(concat([self._klines[key], ohlcv_df], axis=0),
+                                                     timeframe, pair, fill_missing=True,
+                                                     drop_incomplete=False)
                 candle_limit = self.ohlcv_candle_limit(timeframe, self._config['candle_type_def'])
                 # Age out old candles
-                ohlcv_df = ohlcv_df.tail(candle_limit + self._startup_candle_count)
-                ohlcv_df = ohlcv_df.reset_index(drop=True)
-                self._klines[(pair, timeframe, c_type)] = ohlcv_df
-            else:
-                self._klines[(pair, timeframe, c_type)] = ohlcv_df
+                buffer = KlineBuffer(ohlcv_df, timeframe, candle_limit + self._startup_candle_count)
+                self._kline_buffers[key] = buffer
+            # Reassign so we return the updated, combined df
+            ohlcv_df = self._klines[key] = buffer.view
         return ohlcv_df
 
+    def _split_derived_pairs(
+            self, pair_list: ListPairsWithTimeframes
+    ) -> Tuple[ListPairsWithTimeframes, Dict[PairWithTimeframe, str]]:
+        """
+        Split pair_list into combinations to download, and combinations to derive
+        from the lowest timeframe requested for the same pair and candle type.
+        Timeframes are only derived if the cached base candles cover at least
+        `startup_candle_count` candles of the derived timeframe.
+        :return: Tuple of (combinations to download, {derived combination: base timeframe})
+        """
+        base_timeframes: Dict[Tuple[str, CandleType], str] = {}
+        for pair, timeframe, candle_type in pair_list:
+            base = base_timeframes.get((pair, candle_type))
+            if base is None or timeframe_to_seconds(timeframe) < timeframe_to_seconds(base):
+                base_timeframes[(pair, candle_type)] = timeframe
+
+        download: ListPairsWithTimeframes = []
+        derived: Dict[PairWithTimeframe, str] = {}
+        for pair, timeframe, candle_type in set(pair_list):
+            base = base_timeframes[(pair, candle_type)]
+            if candle_type != CandleType.FUNDING_RATE and timeframe_is_derivable(base, timeframe):
+                candle_limit = self.ohlcv_candle_limit(base, candle_type)
+                base_candles = min(candle_limit + self._startup_candle_count,
+                                   candle_limit * self.required_candle_call_count)
+                # The first derived candle is usually incomplete
+                candles = base_candles * timeframe_to_seconds(base) // timeframe_to_seconds(
+                    timeframe) - 1
+                if candles >= max(self._startup_candle_count, 1):
+                    derived[(pair, timeframe, candle_type)] = base
+                    continue
+            download.append((pair, timeframe, candle_type))
+        return download, derived
+
+    def _derive_ohlcv_df(self, pair_tf: PairWithTimeframe, base_timeframe: str,
+                         base: DataFrame) -> DataFrame:
+        """
+        Update the cached candles of pair_tf from the candles of base_timeframe.
+        Only base candles from the newest derived candle onwards are resampled.
+        """
+        pair, timeframe, c_type = pair_tf
+        buffer = self._kline_buffers.get(pair_tf)
+        if buffer is not None and len(buffer) and self._klines.get(pair_tf) is buffer.view:
+            idx = base['date'].searchsorted(buffer.view['date'].iloc[-1])
+            if buffer.update(resample_ohlcv(base.iloc[idx:], base_timeframe, timeframe)):
+                self._klines[pair_tf] = buffer.view
+                return buffer.view
+
+        candle_limit = self.ohlcv_candle_limit(timeframe, self._config['candle_type_def'])
+        buffer = KlineBuffer(resample_ohlcv(base, base_timeframe, timeframe), timeframe,
+                             candle_limit + self._startup_candle_count)
+        self._kline_buffers[pair_tf] = buffer
+        self._klines[pair_tf] = buffer.view
+        return buffer.view
+
+    @staticmethod
+    async def _gather_ohlcv_results(
+        coroutines: List[Coroutine[Any, Any, OHLCVResponse]],
+        on_result: Optional[Callable[[Union[OHLCVResponse, Exception]], None]]
+    ) -> List[Union[OHLCVResponse, Exception]]:
+        """
+        Run coroutines concurrently.
+        :param on_result: Called with every result (or exception) as soon as it arrives.
+            If given, results are not returned.
+        """
+        if on_result is None:
+            return await asyncio.gather(*coroutines, return_exceptions=True)
+        for completed in asyncio.as_completed(coroutines):
+            try:
+                res: Union[OHLCVResponse, Exception] = await completed
+            except Exception as e:
+                res = e
+            on_result(res)
+        return []
+
     def refresh_latest_ohlcv(self, pair_list: ListPairsWithTimeframes, *,
                              since_ms: Optional[int] = None, cache: bool = True,
-                             drop_incomplete: Optional[bool] = None
+                             drop_incomplete: Optional[bool] = None,
+                             on_refreshed: Optional[Callable[[PairWithTimeframe], None]] = None
                              ) -> Dict[PairWithTimeframe, DataFrame]:
         """
         Refresh in-memory OHLCV asynchronously and set `_klines` with the result
@@ -2060,42 +2201,64 @@ class Exchange:
         :param pair_list: List of 2 element tuples containing pair, interval to refresh
         :param since_ms: time since when to download, in milliseconds
         :param cache: Assign result to _klines. Usefull for one-off downloads like for pairlists
+            With `derive_timeframes` enabled, higher timeframes are derived from the cached
+            candles of the lowest timeframe of the same pair instead of being downloaded.
         :param drop_incomplete: Control candle dropping.
             Specifying None defaults to _ohlcv_partial_candle
+        :param on_refreshed: Called with every (pair, timeframe, candle_type) as soon as its
+            candles are available - while downloads of other combinations are still running.
+            Not called for combinations which failed to download.
         :return: Dict of [{(pair, timeframe): Dataframe}]
         """
         logger.debug("Refreshing candle (OHLCV) data for %d pairs", len(pair_list))
 
+        derived_pairs: Dict[PairWithTimeframe, str] = {}
+        if cache and not since_ms and self._config.get('derive_timeframes', False):
+            pair_list, derived_pairs = self._split_derived_pairs(pair_list)
+        derived_by_base: Dict[PairWithTimeframe, List[PairWithTimeframe]] = {}
+        for (pair, timeframe, c_type), base_timeframe in derived_pairs.items():
+            derived_by_base.setdefault((pair, base_timeframe, c_type), []).append(
+                (pair, timeframe, c_type))
+
         # Gather coroutines to run
         input_coroutines, cached_pairs = self._build_ohlcv_dl_jobs(pair_list, since_ms, cache)
 
-        results_df = {}
+        results_df: Dict[PairWithTimeframe, DataFrame] = {}
+
+        def store_result(pair_tf: PairWithTimeframe, ohlcv_df: DataFrame) -> None:
+            results_df[pair_tf] = ohlcv_df
+            refreshed = [pair_tf]
+            for derived in derived_by_base.get(pair_tf, []):
+                results_df[derived] = self._derive_ohlcv_df(derived, pair_tf[1], ohlcv_df)
+                refreshed.append(derived)
+            if on_refreshed:
+                for refreshed_pair_tf in refreshed:
+                    on_refreshed(refreshed_pair_tf)
+
+        def process_result(res: Union[OHLCVResponse, Exception]) -> None:
+            if isinstance(res, Exception):
+                logger.warning(f"Async code raised an exception: {repr(res)}")
+                return
+            # Deconstruct tuple (has 5 elements)
+            pair, timeframe, c_type, ticks, drop_hint = res
+            drop_incomplete_ = drop_hint if drop_incomplete is None else drop_incomplete
+            ohlcv_df = self._process_ohlcv_df(
+                pair, timeframe, c_type, ticks, cache, drop_incomplete_)
+            store_result((pair, timeframe, c_type), ohlcv_df)
+
+        # Cached klines are available right away
+        for pair, timeframe, c_type in cached_pairs:
+            store_result((pair, timeframe, c_type),
+                         self.klines((pair, timeframe, c_type), copy=False))
+
         # Chunk requests into batches of 100 to avoid overwelming ccxt Throttling
         for input_coro in chunks(input_coroutines, 100):
-            async def gather_stuff():
-                return await asyncio.gather(*input_coro, return_exceptions=True)
-
             with self._loop_lock:
-                results = self.loop.run_until_complete(gather_stuff())
+                results = self.loop.run_until_complete(self._gather_ohlcv_results(
+                    input_coro, process_result if on_refreshed else None))
 
             for res in results:
-                if isinstance(res, Exception):
-                    logger.warning(f"Async code raised an exception: {repr(res)}")
-                    continue
-                # Deconstruct tuple (has 5 elements)
-                pair, timeframe, c_type, ticks, drop_hint = res
-                drop_incomplete_ = drop_hint if drop_incomplete is None else drop_incomplete
-                ohlcv_df = self._process_ohlcv_df(
-                    pair, timeframe, c_type, ticks, cache, drop_incomplete_)
-
-                results_df[(pair, timeframe, c_type)] = ohlcv_df
-
-        # Return cached klines
-        for pair, timeframe, c_type in cached_pairs:
-            results_df[(pair, timeframe, c_type)] = self.klines(
-                (pair, timeframe, c_type),
-                copy=False
-            )
+                process_result(res)
 
         return results_df
 
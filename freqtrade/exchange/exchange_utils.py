@@ -118,6 +118,17 @@ def timeframe_to_msecs(timeframe: str) -> int:
     return ccxt.Exchange.parse_timeframe(timeframe) * 1000
 
 
+def timeframe_is_derivable(base_timeframe: str, timeframe: str) -> bool:
+    """
+    Check if candles of timeframe can be built from candles of base_timeframe.
+    Only timeframes which evenly divide a day are supported,
+    so candles of both timeframes align to midnight UTC.
+    """
+    base_seconds = timeframe_to_seconds(base_timeframe)
+    seconds = timeframe_to_seconds(timeframe)
+    return seconds > base_seconds and seconds % base_seconds == 0 and 86400 % seconds == 0
+
+
 def timeframe_to_prev_date(timeframe: str, date: Optional[datetime] = None) -> datetime:
     """
     Use Timeframe and determine the candle start date for this date.
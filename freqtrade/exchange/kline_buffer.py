@@ -0,0 +1,147 @@
+"""
+Fixed capacity in-memory storage for cached candles (klines).
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+from pandas import DataFrame, DatetimeTZDtype
+from pandas.arrays import DatetimeArray
+
+from freqtrade.exchange.exchange_utils import timeframe_to_seconds
+
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+_UTC = DatetimeTZDtype(tz='UTC')
+
+
+def _to_arrays(data: DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Dates (int64 nanoseconds) and ohlcv values (one row per column) of a candle dataframe.
+    """
+    dates = np.asarray(data['date'].values, dtype='datetime64[ns]').view(np.int64)
+    return dates, data[OHLCV_COLUMNS].to_numpy(dtype=np.float64).T
+
+
+class KlineBuffer:
+    """
+    Candles of one (pair, timeframe, candle_type), kept in preallocated numpy arrays.
+
+    Holds the newest `window` candles. The storage has twice this capacity: candles are
+    appended (or overwritten) in place, and the newest candles are only moved to the front
+    once the storage is full - so updates cost O(new candles), amortized.
+    `view` is a read-only dataframe backed by the storage (no copy). Candles a view was handed
+    out for are never written to again: updates which would modify them (or move them to the
+    front) switch to new storage instead, so views stay valid.
+    """
+    __slots__ = ('window', 'timeframe_ns', '_dates', '_values', '_start', '_end', '_view',
+                 '_frozen')
+
+    def __init__(self, data: DataFrame, timeframe: str, window: int) -> None:
+        """
+        :param data: Initial candles - sorted and without gaps
+        :param timeframe: Timeframe of the candles
+        :param window: Number of candles to keep
+        """
+        self.window = max(window, 1)
+        self.timeframe_ns = timeframe_to_seconds(timeframe) * 10**9
+        self._dates = np.empty(2 * self.window, dtype=np.int64)
+        self._values = np.empty((len(OHLCV_COLUMNS), 2 * self.window), dtype=np.float64)
+        self._start = 0
+        self._end = 0
+        self._view: Optional[DataFrame] = None
+        # Storage before this index is referenced by views which were handed out
+        self._frozen = 0
+        self._append(*_to_arrays(data))
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def view(self) -> DataFrame:
+        """
+        Buffered candles as dataframe - without copying the data.
+        Read-only - it's not modified by later updates either.
+        """
+        if self._view is None:
+            start, end = self._start, self._end
+            dates = self._dates[start:end].view('datetime64[ns]')
+            values = self._values[:, start:end]
+            dates.flags.writeable = False
+            values.flags.writeable = False
+            columns = {'date': DatetimeArray(dates, dtype=_UTC, copy=False)}
+            columns.update(zip(OHLCV_COLUMNS, values))
+            self._view = DataFrame(columns, copy=False)
+            self._frozen = max(self._frozen, end)
+        return self._view
+
+    def update(self, data: DataFrame) -> bool:
+        """
+        Merge new candles into the buffer.
+        Buffered candles are replaced by new candles of the same date, missing candles between
+        buffered and new candles are filled up (like `ohlcv_fill_up_missing_data()`).
+        :param data: New candles - sorted and without gaps
+        :return: False if the candles can't be merged in place - because they start before the
+            buffered candles, don't reach the newest buffered candle, are not aligned to the
+            buffered candles or leave a gap larger than the window.
+            The buffer is unchanged in this case.
+        """
+        if data.empty:
+            return True
+        dates, values = _to_arrays(data)
+        if len(self):
+            buffered = self._dates[self._start:self._end]
+            first = int(dates[0])
+            offset, remainder = divmod(first - int(buffered[0]), self.timeframe_ns)
+            missing = offset - len(buffered)
+            if (offset < 0 or remainder or int(dates[-1]) < int(buffered[-1])
+                    or missing >= self.window):
+                return False
+            if missing > 0:
+                self._fill_up(missing)
+            else:
+                overlap = len(buffered) - offset
+                if np.array_equal(values[:, :overlap],
+                                  self._values[:, self._start + offset:self._end],
+                                  equal_nan=True):
+                    # Buffered candles are unchanged - only append the new ones
+                    dates, values = dates[overlap:], values[:, overlap:]
+                else:
+                    # Drop buffered candles which are replaced by new candles
+                    self._end = self._start + offset
+        self._append(dates, values)
+        return True
+
+    def _fill_up(self, count: int) -> None:
+        last = self._end - 1
+        dates = self._dates[last] + self.timeframe_ns * np.arange(1, count + 1, dtype=np.int64)
+        values = np.zeros((len(OHLCV_COLUMNS), count), dtype=np.float64)
+        # open, high, low are set to the last close, volume to 0
+        values[:4] = self._values[3, last]
+        self._append(dates, values)
+
+    def _append(self, dates: np.ndarray, values: np.ndarray) -> None:
+        count = len(dates)
+        if not count:
+            return
+        if count > self.window:
+            dates, values = dates[-self.window:], values[:, -self.window:]
+            count = self.window
+        if self._end + count > len(self._dates) or self._end < self._frozen:
+            # Storage is full (or candles seen by a view are replaced) - move the candles
+            # which stay within the window to the front. Of new storage if views were handed
+            # out, so they are not modified.
+            keep = min(len(self), self.window - count)
+            dates_keep = self._dates[self._end - keep:self._end]
+            values_keep = self._values[:, self._end - keep:self._end]
+            if self._frozen:
+                self._dates = np.empty(2 * self.window, dtype=np.int64)
+                self._values = np.empty((len(OHLCV_COLUMNS), 2 * self.window), dtype=np.float64)
+                self._frozen = 0
+            self._dates[:keep] = dates_keep
+            self._values[:, :keep] = values_keep
+            self._start, self._end = 0, keep
+        self._dates[self._end:self._end + count] = dates
+        self._values[:, self._end:self._end + count] = values
+        self._end += count
+        self._start = max(self._start, self._end - self.window)
+        self._view = None
@@ -206,7 +206,14 @@ class FreqtradeBot(LoggingMixin):
         otherwise a new trade is created.
         :return: True if one or more trades has been created or closed, False otherwise
         """
+        self.process_maintenance()
+        self.process_candles()
+        self.process_trades()
 
+    def process_maintenance(self) -> None:
+        """
+        Reload markets (if necessary) and refresh the active whitelist.
+        """
         # Check whether markets have to be reloaded and reload them when it's needed
         self.exchange.reload_markets()
 
@@ -217,15 +224,39 @@ class FreqtradeBot(LoggingMixin):
 
         self.active_pair_whitelist = self._refresh_active_whitelist(trades)
 
-        # Refreshing candles
-        self.dataprovider.refresh(self.pairlists.create_pair_list(self.active_pair_whitelist),
-                                  self.strategy.gather_informative_pairs())
+    def process_candles(self) -> None:
+        """
+        Refresh candles and analyze the active whitelist.
+        """
+        if self.config.get('internals', {}).get('stream_analysis', False):
+            strategy_safe_wrapper(self.strategy.bot_loop_start, supress_error=True)(
+                current_time=datetime.now(timezone.utc))
+            # Analyze pairs while candles of other pairs are still being refreshed
+            self.strategy.analyze_stream(self.dataprovider.refresh_stream(
+                self.pairlists.create_pair_list(self.active_pair_whitelist),
+                self.strategy.gather_informative_pairs(),
+                self.strategy.gather_informative_pairs(shared_only=True)))
+        else:
+            # Refreshing candles
+            self.dataprovider.refresh(self.pairlists.create_pair_list(self.active_pair_whitelist),
+                                      self.strategy.gather_informative_pairs())
 
-        strategy_safe_wrapper(self.strategy.bot_loop_start, supress_error=True)(
-            current_time=datetime.now(timezone.utc))
+            strategy_safe_wrapper(self.strategy.bot_loop_start, supress_error=True)(
+                current_time=datetime.now(timezone.utc))
 
-        self.strategy.analyze(self.active_pair_whitelist)
+            self.strategy.analyze(self.active_pair_whitelist)
 
+    def process_late_candles(self, pairs: List[str]) -> None:
+        """
+        Refresh and analyze candles of pairs whose latest candle was late in `process_candles()`.
+        """
+        self.dataprovider.refresh(self.pairlists.create_pair_list(pairs))
+        self.strategy.analyze(pairs)
+
+    def process_trades(self) -> None:
+        """
+        Handle open orders and trades, and look for new trades - based on the latest analysis.
+        """
         with self._exit_lock:
             # Check for exchange cancelations, timeouts and user requested replace
             self.manage_open_orders()
@@ -252,6 +283,21 @@ class FreqtradeBot(LoggingMixin):
         self.rpc.process_msg_queue(self.dataprovider._msg_queue)
         self.last_process = datetime.now(timezone.utc)
 
+    def late_pairs(self, candle_date: datetime) -> List[str]:
+        """
+        Whitelisted pairs for which the candle starting at candle_date is not yet available.
+        Pairs without candles, or without a candle before candle_date either, are not late -
+        they didn't trade recently, so the candle may never arrive.
+        """
+        timeframe = self.strategy.timeframe
+        previous_date = candle_date - timedelta(seconds=timeframe_to_seconds(timeframe))
+        late = []
+        for pair in self.active_pair_whitelist:
+            candles = self.dataprovider.ohlcv(pair, timeframe, copy=False)
+            if not candles.empty and previous_date <= candles['date'].iloc[-1] < candle_date:
+                late.append(pair)
+        return late
+
     def process_stopped(self) -> None:
         """
         Close all orders that were left open
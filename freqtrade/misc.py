@@ -4,7 +4,7 @@ Various tool function for Freqtrade and scripts
 import gzip
 import logging
 from pathlib import Path
-from typing import Any, Dict, Iterator, List, Mapping, Optional, TextIO, Union
+from typing import Any, BinaryIO, Dict, Iterator, List, Mapping, Optional, TextIO, Union
 from urllib.parse import urlparse
 
 import pandas as pd
@@ -87,7 +87,7 @@ def file_dump_joblib(filename: Path, data: Any, log: bool = True) -> None:
     logger.debug(f'done joblib dump to "{filename}"')
 
 
-def json_load(datafile: Union[gzip.GzipFile, TextIO]) -> Any:
+def json_load(datafile: Union[gzip.GzipFile, TextIO, BinaryIO]) -> Any:
     """
     load data with rapidjson
     Use this to have a consistent experience,
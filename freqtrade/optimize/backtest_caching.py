@@ -5,6 +5,8 @@ from typing import Union
 
 import rapidjson
 
+from freqtrade.constants import BACKTEST_ENGINE_DEFAULT
+
 
 def get_strategy_run_id(strategy) -> str:
     """
@@ -21,6 +23,10 @@ def get_strategy_run_id(strategy) -> str:
     for k in not_important_keys:
         if k in config:
             del config[k]
+    # The columnar engine gives the same results as the rows engine - the sparse engine doesn't
+    # (e.g. if bot_loop_start() is implemented).
+    if config.get('backtest_engine', BACKTEST_ENGINE_DEFAULT) in ('rows', 'columnar'):
+        config.pop('backtest_engine', None)
 
     # Explicitly allow NaN values (e.g. max_open_trades).
     # as it does not matter for getting the hash.
@@ -0,0 +1,279 @@
+"""
+Columnar candle storage and candle scheduling for the `columnar` and `sparse` backtest engines,
+as well as the indexed detail timeframe storage used by `--timeframe-detail`.
+"""
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from pandas import DataFrame, DatetimeIndex, Timestamp, factorize
+
+
+# Column layout matches `HEADERS` in backtesting.py
+OHLC_COLUMNS = ['open', 'high', 'low', 'close']
+SIGNAL_COLUMNS = ['enter_long', 'exit_long', 'enter_short', 'exit_short']
+TAG_COLUMNS = ['enter_tag', 'exit_tag']
+
+
+def signal_codes(signals: DataFrame) -> np.ndarray:
+    """
+    Encode signal columns as int8.
+    Signals are evaluated either with `== 1` or by truthiness - so values equal to 1 become 1,
+    other truthy values become 2 and everything else (including NaN) becomes 0.
+    """
+    values = signals.fillna(0).to_numpy()
+    return np.where(values == 1, 1, np.where(values.astype(bool), 2, 0)).astype(np.int8)
+
+
+def shift_signals(frames: Dict[str, DataFrame]) -> Dict[str, 'ColumnarPairData']:
+    """
+    Convert the analyzed dataframes of all pairs into columnar candles.
+    To avoid using data from the future, signals and tags are taken from the previous candle -
+    so the first candle of every pair is dropped.
+    Tags of all pairs are encoded in one pass, sharing a single lookup table.
+    :param frames: Analyzed dataframes (left unchanged). Missing signal / tag columns
+        are treated as "no signal".
+    """
+    columns: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+    tag_values = []
+    for pair, df in frames.items():
+        if df.empty:
+            df = df.reindex(columns=['date'] + OHLC_COLUMNS)
+        dates = np.asarray(df['date'].values, dtype='datetime64[ns]').view(np.int64)
+        ohlc = df[OHLC_COLUMNS].to_numpy(dtype=np.float64)
+        columns[pair] = (dates, ohlc, signal_codes(df.reindex(columns=SIGNAL_COLUMNS)))
+        tag_values.append(df.reindex(columns=TAG_COLUMNS).to_numpy(dtype=object))
+
+    codes, uniques = factorize(
+        np.concatenate(tag_values).ravel() if tag_values else np.empty(0, dtype=object))
+    # Appending None resolves code -1 (missing tag) to None.
+    tags: List[Optional[str]] = list(uniques) + [None]
+    tag_codes = np.split(codes.astype(np.int32).reshape(-1, len(TAG_COLUMNS)),
+                         np.cumsum([len(values) for values in tag_values])[:-1])
+
+    return {
+        pair: ColumnarPairData(dates[1:], ohlc[1:], signals[:-1], pair_tag_codes[:-1], tags)
+        for (pair, (dates, ohlc, signals)), pair_tag_codes in zip(columns.items(), tag_codes)
+    }
+
+
+class ColumnarPairData:
+    """
+    Backtest candles of one pair, kept as typed NumPy columns
+    (int64 timestamps, float64 OHLC, int8 signals and int32 tag codes).
+
+    Indexing returns a row tuple laid out like `HEADERS`, so a single candle can be handed
+    to every method which works with the list-based representation.
+    Rows are only materialized for candles the backtest actually visits.
+    """
+    __slots__ = ('dates', 'ohlc', 'signals', 'tag_codes', 'tags', 'steps', '_step_offset')
+
+    def __init__(self, dates: np.ndarray, ohlc: np.ndarray, signals: np.ndarray,
+                 tag_codes: np.ndarray, tags: List[Optional[str]]) -> None:
+        """
+        Use `shift_signals()` to create instances from analyzed dataframes.
+        :param signals: Signal codes, see `signal_codes()`
+        :param tags: Tag lookup table (usually shared by all pairs).
+            The last entry must be None, so code -1 resolves to "no tag".
+        """
+        self.dates = dates
+        self.ohlc = ohlc
+        self.signals = signals
+        self.tag_codes = tag_codes
+        self.tags = tags
+        self.steps: np.ndarray = np.empty(0, dtype=np.int64)
+        self._step_offset: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __getitem__(self, idx: int) -> Tuple:
+        enter_tag, exit_tag = self.tag_codes[idx].tolist()
+        return (
+            Timestamp(self.dates[idx], tz='UTC'),
+            *self.ohlc[idx].tolist(),
+            *self.signals[idx].tolist(),
+            self.tags[enter_tag],
+            self.tags[exit_tag],
+        )
+
+    def to_lists(self) -> List[List]:
+        """
+        All candles as lists laid out like `HEADERS` - used by the `rows` backtest engine.
+        """
+        rows = np.empty((len(self.dates), 11), dtype=object)
+        rows[:, 0] = DatetimeIndex(self.dates, tz='UTC').astype(object)
+        rows[:, 1:5] = self.ohlc
+        rows[:, 5:9] = self.signals
+        rows[:, 9:] = np.array(self.tags, dtype=object)[self.tag_codes]
+        return rows.tolist()
+
+    def entry_signal_mask(self, can_short: bool) -> np.ndarray:
+        """
+        Candles which may result in a new trade.
+        This is a superset of the candles `Backtesting.check_for_trade_entry()` accepts.
+        """
+        mask = self.signals[:, 0] == 1
+        if can_short:
+            mask |= self.signals[:, 2] == 1
+        return mask
+
+    def assign_steps(self, start_ns: int, timeframe_ns: int) -> None:
+        """
+        Calculate the loop step (1 = first candle after start_date) at which each candle
+        is processed.
+        Mirrors the row-based loop, which consumes at most one candle per pair and step,
+        and only once the candle date is reached.
+        """
+        if len(self.dates) == 0:
+            self.steps = np.empty(0, dtype=np.int64)
+            self._step_offset = None
+            return
+        # First step with current_time >= candle date (ceil division)
+        reached = np.maximum(-((start_ns - self.dates) // timeframe_ns), 1)
+        positions = np.arange(len(reached), dtype=np.int64)
+        self.steps = np.maximum.accumulate(reached - positions) + positions
+        offset = int(self.steps[0])
+        # Without gaps, the row can be calculated from the step directly
+        self._step_offset = offset if int(self.steps[-1]) - offset == len(self.steps) - 1 else None
+
+    def row_index_at(self, step: int) -> int:
+        """
+        Return the index of the candle processed at this step, -1 if there is none.
+        """
+        if self._step_offset is not None:
+            idx = step - self._step_offset
+            return idx if 0 <= idx < len(self.steps) else -1
+        idx = int(np.searchsorted(self.steps, step))
+        if idx < len(self.steps) and self.steps[idx] == step:
+            return idx
+        return -1
+
+
+class ColumnarSchedule:
+    """
+    Precomputed candle schedule for all pairs of one backtest run.
+    Allows the backtest loop to visit only pairs that have an entry signal or an open trade.
+    """
+
+    def __init__(self, data: Dict[str, ColumnarPairData], start_date: datetime,
+                 end_date: datetime, timeframe_min: int, can_short: bool) -> None:
+        timeframe = timedelta(minutes=timeframe_min)
+        self.total_steps: int = int((end_date - start_date) / timeframe)
+        self.pairs: List[str] = list(data)
+        self.pair_index: Dict[str, int] = {pair: idx for idx, pair in enumerate(self.pairs)}
+
+        start_ns = Timestamp(start_date).value
+        timeframe_ns = timeframe_min * 60 * 10**9
+        # Last pair (in pair order) with a candle at a given step - and the candle count
+        # of this pair at that step. Used to keep the dataprovider in sync with the row loop.
+        self.last_pair = np.full(self.total_steps + 1, -1, dtype=np.int32)
+        self.last_row = np.zeros(self.total_steps + 1, dtype=np.int64)
+
+        signal_steps = []
+        signal_pairs = []
+        for idx, pair_data in enumerate(data.values()):
+            pair_data.assign_steps(start_ns, timeframe_ns)
+            in_range = pair_data.steps <= self.total_steps
+            steps = pair_data.steps[in_range]
+            self.last_pair[steps] = idx
+            self.last_row[steps] = np.flatnonzero(in_range) + 1
+
+            sig_steps = pair_data.steps[in_range & pair_data.entry_signal_mask(can_short)]
+            signal_steps.append(sig_steps)
+            signal_pairs.append(np.full(len(sig_steps), idx, dtype=np.int64))
+
+        self.signals: Dict[int, List[int]] = {}
+        # Sorted steps with at least one entry signal
+        self.signal_steps: List[int] = []
+        if signal_steps:
+            all_steps = np.concatenate(signal_steps)
+            all_pairs = np.concatenate(signal_pairs)
+            order = np.lexsort((all_pairs, all_steps))
+            all_steps = all_steps[order]
+            all_pairs = all_pairs[order]
+            unique_steps, starts = np.unique(all_steps, return_index=True)
+            self.signals = {
+                step: pairs.tolist()
+                for step, pairs in zip(unique_steps.tolist(), np.split(all_pairs, starts[1:]))
+            }
+            self.signal_steps = list(self.signals)
+
+    def next_signal_step(self, step: int) -> int:
+        """
+        First step after `step` where any pair has an entry signal.
+        Returns `total_steps + 1` if there is none.
+        """
+        idx = bisect_right(self.signal_steps, step)
+        return self.signal_steps[idx] if idx < len(self.signal_steps) else self.total_steps + 1
+
+    def last_candle_step(self, first_step: int) -> int:
+        """
+        Last step >= first_step where any pair has a candle, -1 if there is none.
+        """
+        steps = np.flatnonzero(self.last_pair[first_step:] >= 0)
+        return first_step + int(steps[-1]) if len(steps) else -1
+
+    def active_pairs(self, step: int, open_pairs: Sequence[str]) -> List[int]:
+        """
+        Pair indexes (in pair order) which need processing at this step.
+        :param step: Loop step
+        :param open_pairs: Pairs with open trades
+        """
+        signals = self.signals.get(step, [])
+        if not open_pairs:
+            return signals
+        return sorted(set(signals).union(self.pair_index[pair] for pair in open_pairs))
+
+
+class DetailPairData:
+    """
+    Detail timeframe candles of one pair, kept as contiguous numpy arrays.
+    An offset index maps each main candle start to the range of detail candles within
+    this main candle, so no dataframe needs to be filtered while backtesting.
+    """
+    __slots__ = ('source', 'dates', 'ohlc', 'timeframe_ns', 'first_start', 'bounds')
+
+    def __init__(self, df: DataFrame, timeframe_min: int) -> None:
+        """
+        :param df: Detail candles (sorted by date)
+        :param timeframe_min: Main (strategy) timeframe in minutes
+        """
+        # Dataframe the index was built from - allows detecting reassigned detail data.
+        self.source = df
+        self.dates: np.ndarray = np.asarray(df['date'].values, dtype='datetime64[ns]').view(
+            np.int64)
+        self.ohlc: np.ndarray = df[OHLC_COLUMNS].to_numpy(dtype=np.float64)
+        self.timeframe_ns = timeframe_min * 60 * 10**9
+        self.first_start = 0
+        self.bounds: np.ndarray = np.zeros(1, dtype=np.int64)
+        if len(self.dates) > 0:
+            self.first_start = int(self.dates[0] - self.dates[0] % self.timeframe_ns)
+            # Complete grid of main candle starts - gaps in the data become empty ranges.
+            # bounds[i]:bounds[i + 1] are the detail candles of the i-th main candle.
+            grid = np.arange(self.first_start, int(self.dates[-1]) + self.timeframe_ns + 1,
+                             self.timeframe_ns, dtype=np.int64)
+            self.bounds = np.searchsorted(self.dates, grid)
+
+    def candle_range(self, candle_start: int) -> Tuple[int, int]:
+        """
+        Range of detail candles with candle_start <= date < candle_start + timeframe.
+        :param candle_start: main candle date as timestamp in nanoseconds
+        """
+        idx, remainder = divmod(candle_start - self.first_start, self.timeframe_ns)
+        if remainder == 0 and 0 <= idx < len(self.bounds) - 1:
+            return int(self.bounds[idx]), int(self.bounds[idx + 1])
+        # Candle not aligned to the index grid (or outside of it)
+        return (int(np.searchsorted(self.dates, candle_start)),
+                int(np.searchsorted(self.dates, candle_start + self.timeframe_ns)))
+
+    def rows(self, start: int, stop: int, signals: Sequence) -> List[Tuple]:
+        """
+        Detail candles in `HEADERS` layout, with signals and tags taken from the main candle.
+        """
+        return [
+            (Timestamp(date, tz='UTC'), *ohlc, *signals)
+            for date, ohlc in zip(self.dates[start:stop].tolist(),
+                                  self.ohlc[start:stop].tolist())
+        ]
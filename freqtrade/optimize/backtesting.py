@@ -7,9 +7,8 @@ import logging
 from collections import defaultdict
 from copy import deepcopy
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from numpy import nan
 from pandas import DataFrame
 
 from freqtrade import constants
@@ -27,6 +26,8 @@ from freqtrade.exchange import (amount_to_contract_precision, price_to_precision
 from freqtrade.exchange.exchange import Exchange
 from freqtrade.mixins import LoggingMixin
 from freqtrade.optimize.backtest_caching import get_strategy_run_id
+from freqtrade.optimize.backtest_columnar import (ColumnarPairData, ColumnarSchedule,
+                                                  DetailPairData, shift_signals)
 from freqtrade.optimize.bt_progress import BTProgress
 from freqtrade.optimize.optimize_reports import (generate_backtest_stats, generate_rejected_signals,
                                                  generate_trade_signal_candles,
@@ -156,6 +157,8 @@ class Backtesting:
         self._can_short = self.trading_mode != TradingMode.SPOT
         self._position_stacking: bool = self.config.get('position_stacking', False)
         self.enable_protections: bool = self.config.get('enable_protections', False)
+        self.backtest_engine: str = self.config.get('backtest_engine',
+                                                    constants.BACKTEST_ENGINE_DEFAULT)
         migrate_binance_futures_data(config)
 
         self.init_backtest()
@@ -190,9 +193,22 @@ class Backtesting:
         else:
             self.timeframe_detail_min = 0
         self.detail_data: Dict[str, DataFrame] = {}
+        self.detail_index: Dict[str, DetailPairData] = {}
         self.futures_data: Dict[str, DataFrame] = {}
 
-    def init_backtest(self):
+    def index_detail_data(self) -> None:
+        """
+        Build the offset index into the detail timeframe candles of each pair.
+        Pairs whose detail dataframe did not change since the last call keep their index.
+        """
+        self.detail_index = {
+            pair: (self.detail_index[pair]
+                   if pair in self.detail_index and self.detail_index[pair].source is df
+                   else DetailPairData(df, self.timeframe_min))
+            for pair, df in self.detail_data.items()
+        }
+
+    def init_backtest(self) -> None:
 
         self.prepare_backtest(False)
 
@@ -200,6 +216,10 @@ class Backtesting:
 
         self.progress = BTProgress()
         self.abort = False
+        # Intermediate results are passed to checkpoint_callback once these dates are reached
+        self.checkpoints: List[datetime] = []
+        self.checkpoint_callback: Optional[Callable[[Dict[str, Any], datetime], None]] = None
+        self._next_checkpoint = 0
 
     def _set_strategy(self, strategy: IStrategy):
         """
@@ -215,6 +235,12 @@ class Backtesting:
         self.strategy.order_types['stoploss_on_exchange'] = False
         # Update can_short flag
         self._can_short = self.trading_mode != TradingMode.SPOT and strategy.can_short
+        if (self.backtest_engine == 'sparse'
+                and type(strategy).bot_loop_start is not IStrategy.bot_loop_start):
+            logger.warning(
+                f"Strategy {strategy.get_strategy_name()} implements bot_loop_start(), which "
+                "is not called on candles skipped by the `sparse` backtest engine. "
+                "Results may differ from the `rows` engine.")
 
         self.strategy.ft_bot_start()
 
@@ -274,29 +300,19 @@ class Backtesting:
             )
         else:
             self.detail_data = {}
+        self.index_detail_data()
         if self.trading_mode == TradingMode.FUTURES:
             # Load additional futures data.
-            funding_rates_dict = history.load_data(
-                datadir=self.config['datadir'],
-                pairs=self.pairlists.whitelist,
-                timeframe=self.exchange.get_option('mark_ohlcv_timeframe'),
-                timerange=self.timerange,
-                startup_candles=0,
-                fail_without_data=True,
-                data_format=self.config['dataformat_ohlcv'],
-                candle_type=CandleType.FUNDING_RATE
-            )
-
             # For simplicity, assign to CandleType.Mark (might contian index candles!)
-            mark_rates_dict = history.load_data(
+            funding_rates_dict, mark_rates_dict = history.load_funding_and_mark_data(
                 datadir=self.config['datadir'],
                 pairs=self.pairlists.whitelist,
                 timeframe=self.exchange.get_option('mark_ohlcv_timeframe'),
+                mark_candle_type=CandleType.from_string(
+                    self.exchange.get_option("mark_ohlcv_price")),
                 timerange=self.timerange,
-                startup_candles=0,
                 fail_without_data=True,
                 data_format=self.config['dataformat_ohlcv'],
-                candle_type=CandleType.from_string(self.exchange.get_option("mark_ohlcv_price"))
             )
             # Combine data to avoid combining the data per trade.
             unavailable_pairs = []
@@ -346,25 +362,30 @@ class Backtesting:
             self.abort = False
             raise DependencyException("Stop requested")
 
-    def _get_ohlcv_as_lists(self, processed: Dict[str, DataFrame]) -> Dict[str, Tuple]:
+    def check_checkpoint(self, current_time: datetime) -> None:
         """
-        Helper function to convert a processed dataframes into lists for performance reasons.
-
-        Used by backtest() - so keep this optimized for performance.
-
-        :param processed: a processed dictionary with format {pair, data}, which gets cleared to
-        optimize memory usage!
+        Pass the results so far (closed trades only) to `checkpoint_callback` for every
+        checkpoint reached. The callback may stop the backtest by raising an exception.
+        """
+        results = None
+        while (self._next_checkpoint < len(self.checkpoints)
+               and current_time >= self.checkpoints[self._next_checkpoint]):
+            self._next_checkpoint += 1
+            if self.checkpoint_callback:
+                results = results or self._get_backtest_results()
+                self.checkpoint_callback(results, current_time)
+
+    def _advise_signals(self, processed: Dict[str, DataFrame]) -> None:
+        """
+        Generate signals for all pairs and trim the startup period.
+        The trimmed dataframes replace the entries in `processed` - signals remain on the
+        correct candle for callbacks.
         """
-
-        data: Dict = {}
         self.progress.init_step(BacktestState.CONVERT, len(processed))
-
-        # Create dict with data
         for pair in processed.keys():
-            pair_data = processed[pair]
             self.check_abort()
             self.progress.increment()
-
+            pair_data = processed[pair]
             if not pair_data.empty:
                 # Cleanup from prior runs
                 pair_data.drop(HEADERS[5:] + ['buy', 'sell'], axis=1, errors='ignore')
@@ -374,29 +395,35 @@ class Backtesting:
                 pair, self.timeframe, df_analyzed, self.config['candle_type_def'])
 
             # Trim startup period from analyzed dataframe
-            df_analyzed = processed[pair] = pair_data = trim_dataframe(
+            processed[pair] = trim_dataframe(
                 df_analyzed, self.timerange, startup_candles=self.required_startup)
 
-            # Create a copy of the dataframe before shifting, that way the entry signal/tag
-            # remains on the correct candle for callbacks.
-            df_analyzed = df_analyzed.copy()
+    def _get_ohlcv_as_lists(self, processed: Dict[str, DataFrame]) -> Dict[str, List]:
+        """
+        Helper function to convert a processed dataframes into lists for performance reasons.
 
-            # To avoid using data from future, we use entry/exit signals shifted
-            # from the previous candle
-            for col in HEADERS[5:]:
-                tag_col = col in ('enter_tag', 'exit_tag')
-                if col in df_analyzed.columns:
-                    df_analyzed[col] = df_analyzed.loc[:, col].replace(
-                        [nan], [0 if not tag_col else None]).shift(1)
-                elif not df_analyzed.empty:
-                    df_analyzed[col] = 0 if not tag_col else None
+        Used by backtest() - so keep this optimized for performance.
 
-            df_analyzed = df_analyzed.drop(df_analyzed.head(1).index)
+        :param processed: a processed dictionary with format {pair, data}, which gets cleared to
+        optimize memory usage!
+        """
+        data = self._get_ohlcv_as_columns(processed)
+        # Convert to list for performance reasons
+        # (Looping Pandas is slow.)
+        return {pair: data.pop(pair).to_lists() for pair in list(data)}
 
-            # Convert from Pandas to list for performance reasons
-            # (Looping Pandas is slow.)
-            data[pair] = df_analyzed[HEADERS].values.tolist() if not df_analyzed.empty else []
-        return data
+    def _get_ohlcv_as_columns(
+            self, processed: Dict[str, DataFrame]) -> Dict[str, ColumnarPairData]:
+        """
+        Generate signals and convert processed dataframes into columnar candles, with signals
+        shifted by one candle (to avoid using data from the future).
+        Used as is by the `columnar` and `sparse` backtest engines.
+
+        :param processed: a processed dictionary with format {pair, data}, which gets cleared to
+        optimize memory usage!
+        """
+        self._advise_signals(processed)
+        return shift_signals(processed)
 
     def _get_close_rate(self, row: Tuple, trade: LocalTrade, exit: ExitCheckTuple,
                         trade_dur: int) -> float:
@@ -1163,28 +1190,53 @@ class Backtesting:
                 self.run_protections(pair, current_time, trade.trade_direction)
         return open_trade_count_start
 
-    def backtest(self, processed: Dict,
-                 start_date: datetime, end_date: datetime) -> Dict[str, Any]:
+    def backtest_pair_candle(
+            self, row: Tuple, pair: str, row_index: int, current_time: datetime,
+            end_date: datetime, open_trade_count_start: int) -> int:
         """
-        Implement backtesting functionality
-
         NOTE: This method is used by Hyperopt at each iteration. Please keep it optimized.
-        Of course try to not have ugly code. By some accessor are sometime slower than functions.
-        Avoid extensive logging in this method and functions it calls.
 
-        :param processed: a processed dictionary with format {pair, data}, which gets cleared to
-        optimize memory usage!
-        :param start_date: backtesting timerange start datetime
-        :param end_date: backtesting timerange end datetime
-        :return: DataFrame with trades (results of backtesting)
+        Process one candle of one pair - spreading it out into the detail timeframe if necessary.
+        :param row_index: Number of candles of this pair processed so far (including this one)
+        :return: updated open_trade_count_start
         """
-        self.prepare_backtest(self.enable_protections)
-        # Ensure wallets are uptodate (important for --strategy-list)
-        self.wallets.update()
-        # Use dict of lists with data for performance
-        # (looping lists is a lot faster than pandas DataFrames)
-        data: Dict = self._get_ohlcv_as_lists(processed)
+        self.dataprovider._set_dataframe_max_index(self.required_startup + row_index)
+        trade_dir: Optional[LongShort] = self.check_for_trade_entry(row)
 
+        if (
+            (trade_dir is not None or len(LocalTrade.bt_trades_open_pp[pair]) > 0)
+            and self.timeframe_detail and pair in self.detail_data
+        ):
+            # Spread out into detail timeframe.
+            # Should only happen when we are either in a trade for this pair
+            # or when we got the signal for a new trade.
+            detail = self.detail_index[pair]
+            start, stop = detail.candle_range(row[DATE_IDX].value)
+            if start == stop:
+                # Fall back to "regular" data if no detail data was found for this candle
+                return self.backtest_loop(
+                    row, pair, current_time, end_date,
+                    open_trade_count_start, trade_dir)
+            is_first = True
+            current_time_det = current_time
+            for det_row in detail.rows(start, stop, row[LONG_IDX:EXIT_TAG_IDX + 1]):
+                self.dataprovider._set_dataframe_max_date(current_time_det)
+                open_trade_count_start = self.backtest_loop(
+                    det_row, pair, current_time_det, end_date,
+                    open_trade_count_start, trade_dir, is_first)
+                current_time_det += timedelta(minutes=self.timeframe_detail_min)
+                is_first = False
+            return open_trade_count_start
+
+        self.dataprovider._set_dataframe_max_date(current_time)
+        return self.backtest_loop(
+            row, pair, current_time, end_date, open_trade_count_start, trade_dir)
+
+    def backtest_rows(self, data: Dict, start_date: datetime, end_date: datetime) -> None:
+        """
+        Candle loop of the default (`rows`) backtest engine.
+        Visits every pair on every candle.
+        """
         # Indexes per pair, so some pairs are allowed to have a missing start.
         indexes: Dict = defaultdict(int)
         current_time = start_date + timedelta(minutes=self.timeframe_min)
@@ -1195,6 +1247,7 @@ class Backtesting:
         while current_time <= end_date:
             open_trade_count_start = LocalTrade.bt_open_open_trade_count
             self.check_abort()
+            self.check_checkpoint(current_time)
             strategy_safe_wrapper(self.strategy.bot_loop_start, supress_error=True)(
                 current_time=current_time)
             for i, pair in enumerate(data):
@@ -1205,59 +1258,115 @@ class Backtesting:
 
                 row_index += 1
                 indexes[pair] = row_index
-                self.dataprovider._set_dataframe_max_index(self.required_startup + row_index)
-                self.dataprovider._set_dataframe_max_date(current_time)
-                current_detail_time: datetime = row[DATE_IDX].to_pydatetime()
-                trade_dir: Optional[LongShort] = self.check_for_trade_entry(row)
-
-                if (
-                    (trade_dir is not None or len(LocalTrade.bt_trades_open_pp[pair]) > 0)
-                    and self.timeframe_detail and pair in self.detail_data
-                ):
-                    # Spread out into detail timeframe.
-                    # Should only happen when we are either in a trade for this pair
-                    # or when we got the signal for a new trade.
-                    exit_candle_end = current_detail_time + timedelta(minutes=self.timeframe_min)
-
-                    detail_data = self.detail_data[pair]
-                    detail_data = detail_data.loc[
-                        (detail_data['date'] >= current_detail_time) &
-                        (detail_data['date'] < exit_candle_end)
-                    ].copy()
-                    if len(detail_data) == 0:
-                        # Fall back to "regular" data if no detail data was found for this candle
-                        open_trade_count_start = self.backtest_loop(
-                            row, pair, current_time, end_date,
-                            open_trade_count_start, trade_dir)
-                        continue
-                    detail_data.loc[:, 'enter_long'] = row[LONG_IDX]
-                    detail_data.loc[:, 'exit_long'] = row[ELONG_IDX]
-                    detail_data.loc[:, 'enter_short'] = row[SHORT_IDX]
-                    detail_data.loc[:, 'exit_short'] = row[ESHORT_IDX]
-                    detail_data.loc[:, 'enter_tag'] = row[ENTER_TAG_IDX]
-                    detail_data.loc[:, 'exit_tag'] = row[EXIT_TAG_IDX]
-                    is_first = True
-                    current_time_det = current_time
-                    for det_row in detail_data[HEADERS].values.tolist():
-                        self.dataprovider._set_dataframe_max_date(current_time_det)
-                        open_trade_count_start = self.backtest_loop(
-                            det_row, pair, current_time_det, end_date,
-                            open_trade_count_start, trade_dir, is_first)
-                        current_time_det += timedelta(minutes=self.timeframe_detail_min)
-                        is_first = False
-                else:
-                    self.dataprovider._set_dataframe_max_date(current_time)
-                    open_trade_count_start = self.backtest_loop(
-                        row, pair, current_time, end_date,
-                        open_trade_count_start, trade_dir)
+                open_trade_count_start = self.backtest_pair_candle(
+                    row, pair, row_index, current_time, end_date, open_trade_count_start)
 
             # Move time one configured time_interval ahead.
             self.progress.increment()
             current_time += timedelta(minutes=self.timeframe_min)
 
+    def backtest_columnar(self, data: Dict[str, ColumnarPairData],
+                          start_date: datetime, end_date: datetime) -> None:
+        """
+        Candle loop of the `columnar` and `sparse` backtest engines.
+        Only pairs with an entry signal or an open trade are visited on a candle,
+        results are identical to `backtest_rows()`.
+        The `sparse` engine additionally jumps straight to the next entry signal while no
+        trade is open - skipping `bot_loop_start()` for the candles in between.
+        """
+        schedule = ColumnarSchedule(data, start_date, end_date, self.timeframe_min,
+                                    self._can_short)
+        pairs = schedule.pairs
+        sparse = self.backtest_engine == 'sparse'
+        timeframe = timedelta(minutes=self.timeframe_min)
+
+        self.progress.init_step(BacktestState.BACKTEST, schedule.total_steps)
+        step = schedule.next_signal_step(0) if sparse else 1
+        self.progress.increment(step - 1)
+        visited = 0
+        while step <= schedule.total_steps:
+            current_time = start_date + step * timeframe
+            open_trade_count_start = LocalTrade.bt_open_open_trade_count
+            self.check_abort()
+            self.check_checkpoint(current_time)
+            strategy_safe_wrapper(self.strategy.bot_loop_start, supress_error=True)(
+                current_time=current_time)
+            processed_idx = -1
+            for pair_idx in schedule.active_pairs(
+                    step, [t.pair for t in LocalTrade.trades_open]):
+                pair = pairs[pair_idx]
+                row_index = data[pair].row_index_at(step)
+                if row_index < 0:
+                    continue
+                open_trade_count_start = self.backtest_pair_candle(
+                    data[pair][row_index], pair, row_index + 1, current_time, end_date,
+                    open_trade_count_start)
+                processed_idx = pair_idx
+
+            last_pair = schedule.last_pair[step]
+            if last_pair >= 0 and last_pair != processed_idx:
+                # Leave the dataprovider in the state the row loop would leave it in.
+                self._sync_dataprovider(schedule, step, start_date)
+
+            visited = step
+            next_step = step + 1
+            if sparse and not LocalTrade.trades_open:
+                next_step = schedule.next_signal_step(step)
+            self.progress.increment(next_step - step)
+            step = next_step
+
+        if sparse:
+            last_step = schedule.last_candle_step(visited + 1)
+            if last_step > 0:
+                self._sync_dataprovider(schedule, last_step, start_date)
+
+    def _sync_dataprovider(self, schedule: ColumnarSchedule, step: int,
+                           start_date: datetime) -> None:
+        """
+        Set the dataprovider to the last candle the row loop processed at this step.
+        """
+        self.dataprovider._set_dataframe_max_index(
+            self.required_startup + int(schedule.last_row[step]))
+        self.dataprovider._set_dataframe_max_date(
+            start_date + step * timedelta(minutes=self.timeframe_min))
+
+    def backtest(self, processed: Dict,
+                 start_date: datetime, end_date: datetime) -> Dict[str, Any]:
+        """
+        Implement backtesting functionality
+
+        NOTE: This method is used by Hyperopt at each iteration. Please keep it optimized.
+        Of course try to not have ugly code. By some accessor are sometime slower than functions.
+        Avoid extensive logging in this method and functions it calls.
+
+        :param processed: a processed dictionary with format {pair, data}, which gets cleared to
+        optimize memory usage!
+        :param start_date: backtesting timerange start datetime
+        :param end_date: backtesting timerange end datetime
+        :return: DataFrame with trades (results of backtesting)
+        """
+        self.prepare_backtest(self.enable_protections)
+        # Ensure wallets are uptodate (important for --strategy-list)
+        self.wallets.update()
+        # Picks up detail data which was replaced since loading (no-op otherwise)
+        self.index_detail_data()
+        self._next_checkpoint = 0
+        data: Dict
+        if self.backtest_engine in ('columnar', 'sparse'):
+            data = self._get_ohlcv_as_columns(processed)
+            self.backtest_columnar(data, start_date, end_date)
+        else:
+            # Use dict of lists with data for performance
+            # (looping lists is a lot faster than pandas DataFrames)
+            data = self._get_ohlcv_as_lists(processed)
+            self.backtest_rows(data, start_date, end_date)
+
         self.handle_left_open(LocalTrade.bt_trades_open_pp, data=data)
         self.wallets.update()
 
+        return self._get_backtest_results()
+
+    def _get_backtest_results(self) -> Dict[str, Any]:
         results = trade_list_to_dataframe(LocalTrade.trades)
         return {
             'results': results,
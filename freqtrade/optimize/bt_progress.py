@@ -17,8 +17,8 @@ class BTProgress:
     def set_new_value(self, new_value: float):
         self._progress = new_value
 
-    def increment(self):
-        self._progress += 1
+    def increment(self, steps: int = 1):
+        self._progress += steps
 
     @property
     def progress(self):
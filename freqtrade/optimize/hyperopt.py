@@ -8,21 +8,28 @@ import logging
 import random
 import sys
 import warnings
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, Future, wait
 from datetime import datetime, timezone
+from functools import partial
 from math import ceil
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
+from uuid import uuid4
 
-import rapidjson
+import numpy as np
 from colorama import init as colorama_init
 from joblib import Parallel, cpu_count, delayed, dump, load, wrap_non_picklable_objects
 from joblib.externals import cloudpickle
+from joblib.externals.loky import get_reusable_executor
 from pandas import DataFrame
-from rich.progress import (BarColumn, MofNCompleteColumn, Progress, TaskProgressColumn, TextColumn,
-                           TimeElapsedColumn, TimeRemainingColumn)
+from rich.progress import (BarColumn, MofNCompleteColumn, Progress, TaskID, TaskProgressColumn,
+                           TextColumn, TimeElapsedColumn, TimeRemainingColumn)
 
-from freqtrade.constants import DATETIME_PRINT_FORMAT, FTHYPT_FILEVERSION, LAST_BT_RESULT_FN, Config
+from freqtrade.constants import (DATETIME_PRINT_FORMAT, FTHYPT_FILEVERSION,
+                                 HYPEROPT_INDICATOR_CACHE_SIZE, LAST_BT_RESULT_FN, Config)
 from freqtrade.data.converter import trim_dataframes
+from freqtrade.data.cow_candles import copy_on_write
 from freqtrade.data.history import get_timerange
 from freqtrade.data.metrics import calculate_market_change
 from freqtrade.enums import HyperoptState
@@ -31,9 +38,10 @@ from freqtrade.misc import deep_merge_dicts, file_dump_json, plural
 from freqtrade.optimize.backtesting import Backtesting
 # Import IHyperOpt and IHyperOptLoss to allow unpickling classes from these modules
 from freqtrade.optimize.hyperopt_auto import HyperOptAuto
+from freqtrade.optimize.hyperopt_indicator_cache import HyperoptIndicatorCache
 from freqtrade.optimize.hyperopt_loss_interface import IHyperOptLoss
-from freqtrade.optimize.hyperopt_tools import (HyperoptStateContainer, HyperoptTools,
-                                               hyperopt_serializer)
+from freqtrade.optimize.hyperopt_tools import (HyperoptResultsStore, HyperoptStateContainer,
+                                               HyperoptTools)
 from freqtrade.optimize.optimize_reports import generate_strategy_stats
 from freqtrade.resolvers.hyperopt_resolver import HyperOptLossResolver
 
@@ -55,6 +63,29 @@ SKOPT_MODEL_QUEUE_SIZE = 10
 
 MAX_LOSS = 100000  # just a big enough number to be bad result in loss optimization
 
+# Write evaluated epochs to the results file at most every RESULTS_FLUSH_INTERVAL seconds
+RESULTS_FLUSH_INTERVAL = 5
+
+# With --prune-epochs, epochs are only pruned at a checkpoint once at least
+# PRUNE_MIN_EPOCHS epochs reported their loss at this checkpoint
+PRUNE_MIN_EPOCHS = INITIAL_POINTS
+
+
+# Processed data loaded by this (worker) process, reused across epochs.
+# See Hyperopt._load_processed_data()
+_processed_data: Dict[str, Any] = {}
+
+
+class EpochPruned(Exception):
+    """
+    Raised at a backtest checkpoint to stop an unpromising epoch.
+    """
+
+    def __init__(self, backtesting_results: Dict[str, Any], checkpoint: datetime) -> None:
+        super().__init__(f"Epoch pruned at {checkpoint}")
+        self.backtesting_results = backtesting_results
+        self.checkpoint = checkpoint
+
 
 class Hyperopt:
     """
@@ -83,6 +114,10 @@ class Hyperopt:
         self.pairlist = self.backtesting.pairlists.whitelist
         self.custom_hyperopt: HyperOptAuto
         self.analyze_per_epoch = self.config.get('analyze_per_epoch', False)
+        # Memory limit for indicators cached with --analyze-per-epoch - split between the
+        # worker processes once their number is known.
+        self.indicator_cache_max_bytes = self.config.get(
+            'hyperopt_indicator_cache_size', HYPEROPT_INDICATOR_CACHE_SIZE) * 1024 * 1024
         HyperoptStateContainer.set_state(HyperoptState.STARTUP)
 
         if not self.config.get('hyperopt'):
@@ -105,11 +140,14 @@ class Hyperopt:
                                    f'strategy_{strategy}_{time_now}.fthypt')
         self.data_pickle_file = (self.config['user_data_dir'] /
                                  'hyperopt_results' / 'hyperopt_tickerdata.pkl')
+        # Identifies the content of data_pickle_file - changes whenever it's rewritten.
+        self.data_pickle_version = uuid4().hex
         self.total_epochs = config.get('epochs', 0)
 
         self.current_best_loss = 100
 
         self.clean_hyperopt()
+        self.results_store = HyperoptResultsStore(self.results_file, RESULTS_FLUSH_INTERVAL)
 
         self.market_change = 0.0
         self.num_epochs_saved = 0
@@ -130,6 +168,28 @@ class Hyperopt:
         self.print_colorized = self.config.get('print_colorized', False)
         self.print_json = self.config.get('print_json', False)
 
+        self.prune_interval = self.config.get('hyperopt_prune_interval', 0)
+        # Losses of all evaluated epochs at each checkpoint (main process only)
+        self._checkpoint_losses: Dict[int, List[float]] = defaultdict(list)
+        # Epochs with a loss above the threshold of a checkpoint are pruned.
+        self.prune_thresholds: Dict[int, float] = {}
+
+        # Index of points evaluated by the optimizer, see _get_evaluated_points()
+        self._evaluated_points: Set[Tuple] = set()
+        self._evaluated_points_count = 0
+        self._evaluated_points_opt: Optional[Optimizer] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Workers don't need the (potentially large) index of evaluated points,
+        # nor buffered results or the losses at checkpoints.
+        state = self.__dict__.copy()
+        state['_checkpoint_losses'] = defaultdict(list)
+        state['_evaluated_points'] = set()
+        state['_evaluated_points_count'] = 0
+        state['_evaluated_points_opt'] = None
+        state['results_store'] = HyperoptResultsStore(self.results_file)
+        return state
+
     @staticmethod
     def get_lock_filename(config: Config) -> str:
 
@@ -139,7 +199,10 @@ class Hyperopt:
         """
         Remove hyperopt pickle files to restart hyperopt.
         """
-        for f in [self.data_pickle_file, self.results_file]:
+        # Release memory-mapped data of a previous run
+        _processed_data.clear()
+        for f in [self.data_pickle_file, self.results_file,
+                  HyperoptResultsStore(self.results_file).index_file]:
             p = Path(f)
             if p.is_file():
                 logger.info(f"Removing `{p}`.")
@@ -172,21 +235,24 @@ class Hyperopt:
         Save hyperopt results to file
         Store one line per epoch.
         While not a valid json object - this allows appending easily.
+        Epochs are buffered for up to RESULTS_FLUSH_INTERVAL seconds,
+        call `self.results_store.flush()` to write them immediately.
         :param epoch: result dictionary for this epoch.
         """
         epoch[FTHYPT_FILEVERSION] = 2
-        with self.results_file.open('a') as f:
-            rapidjson.dump(epoch, f, default=hyperopt_serializer,
-                           number_mode=rapidjson.NM_NATIVE | rapidjson.NM_NAN)
-            f.write("\n")
+        if self.results_store.results_file != self.results_file:
+            self.results_store.flush()
+            self.results_store = HyperoptResultsStore(self.results_file, RESULTS_FLUSH_INTERVAL)
+        self.results_store.append(epoch)
 
         self.num_epochs_saved += 1
         logger.debug(f"{self.num_epochs_saved} {plural(self.num_epochs_saved, 'epoch')} "
                      f"saved to '{self.results_file}'.")
-        # Store hyperopt filename
-        latest_filename = Path.joinpath(self.results_file.parent, LAST_BT_RESULT_FN)
-        file_dump_json(latest_filename, {'latest_hyperopt': str(self.results_file.name)},
-                       log=False)
+        if self.num_epochs_saved == 1:
+            # Store hyperopt filename
+            latest_filename = Path.joinpath(self.results_file.parent, LAST_BT_RESULT_FN)
+            file_dump_json(latest_filename, {'latest_hyperopt': str(self.results_file.name)},
+                           log=False)
 
     def _get_params_details(self, params: Dict) -> Dict:
         """
@@ -351,30 +417,120 @@ class Hyperopt:
 
             self.backtesting.strategy.max_open_trades = updated_max_open_trades
 
-        with self.data_pickle_file.open('rb') as f:
-            processed = load(f, mmap_mode='r')
-            if self.analyze_per_epoch:
-                # Data is not yet analyzed, rerun populate_indicators.
-                processed = self.advise_and_trim(processed)
+        processed = self._load_processed_data()
+        if self.analyze_per_epoch:
+            # Data is not yet analyzed, rerun populate_indicators.
+            processed = self.advise_and_trim(processed)
 
-        bt_results = self.backtesting.backtest(
-            processed=processed,
-            start_date=self.min_date,
-            end_date=self.max_date
-        )
+        checkpoint_losses: List[float] = []
+        bt_results, pruned_at = self._backtest_epoch(processed, checkpoint_losses)
         backtest_end_time = datetime.now(timezone.utc)
         bt_results.update({
             'backtest_start_time': int(backtest_start_time.timestamp()),
             'backtest_end_time': int(backtest_end_time.timestamp()),
         })
 
-        return self._get_results_dict(bt_results, self.min_date, self.max_date,
-                                      params_dict,
-                                      processed=processed)
+        if pruned_at is None:
+            return self._get_results_dict(bt_results, self.min_date, self.max_date,
+                                          params_dict,
+                                          processed=processed,
+                                          checkpoint_losses=checkpoint_losses)
+
+        # Incomplete - cast this point away from the optimization path
+        result = self._get_results_dict(bt_results, self.min_date, pruned_at,
+                                        params_dict,
+                                        processed=processed,
+                                        checkpoint_losses=checkpoint_losses,
+                                        pruned=True)
+        result['results_explanation'] += f" Pruned at {pruned_at.strftime(DATETIME_PRINT_FORMAT)}."
+        return result
+
+    def _backtest_epoch(self, processed: Dict[str, DataFrame], checkpoint_losses: List[float]
+                        ) -> Tuple[Dict[str, Any], Optional[datetime]]:
+        """
+        Backtest the current parameters, reporting the loss at checkpoints with --prune-epochs.
+        :param checkpoint_losses: Receives the loss at every checkpoint reached
+        :return: Backtest results and the date the epoch was pruned at (None if not pruned)
+        """
+        if self.prune_interval:
+            self.backtesting.checkpoints = self._get_checkpoints()
+            self.backtesting.checkpoint_callback = partial(
+                self._check_prune, processed=processed, checkpoint_losses=checkpoint_losses)
+        try:
+            return self.backtesting.backtest(
+                processed=processed,
+                start_date=self.min_date,
+                end_date=self.max_date
+            ), None
+        except EpochPruned as e:
+            return e.backtesting_results, e.checkpoint
+        finally:
+            # Don't keep this epoch's data referenced - hyperopt (including backtesting)
+            # is pickled for every epoch sent to the workers.
+            self.backtesting.checkpoints = []
+            self.backtesting.checkpoint_callback = None
+
+    def _get_checkpoints(self) -> List[datetime]:
+        """
+        Dates every `prune_interval` percent of the timerange.
+        """
+        timerange = self.max_date - self.min_date
+        return [self.min_date + timerange * percent / 100
+                for percent in range(self.prune_interval, 100, self.prune_interval)]
+
+    def _check_prune(self, backtesting_results: Dict[str, Any], checkpoint: datetime,
+                     processed: Dict[str, DataFrame], checkpoint_losses: List[float]) -> None:
+        """
+        Backtest checkpoint callback. Calculates the loss of the trades closed so far,
+        and stops the epoch if it's worse than the threshold for this checkpoint.
+        """
+        # Run time of the backtest is irrelevant for the loss
+        now = int(datetime.now(timezone.utc).timestamp())
+        strat_stats = generate_strategy_stats(
+            self.pairlist, self.backtesting.strategy.get_strategy_name(),
+            {**backtesting_results, 'backtest_start_time': now, 'backtest_end_time': now},
+            self.min_date, checkpoint, market_change=self.market_change, is_hyperopt=True,
+        )
+        loss = self._calculate_loss(backtesting_results, strat_stats, self.min_date, checkpoint,
+                                    processed)
+        threshold = self.prune_thresholds.get(len(checkpoint_losses))
+        checkpoint_losses.append(loss)
+        if threshold is not None and loss > threshold:
+            raise EpochPruned(backtesting_results, checkpoint)
+
+    def _update_prune_thresholds(self, checkpoint_losses: List[float]) -> None:
+        """
+        Use the median loss of all epochs at a checkpoint as threshold for pruning.
+        """
+        for checkpoint, loss in enumerate(checkpoint_losses):
+            losses = self._checkpoint_losses[checkpoint]
+            losses.append(loss)
+            if len(losses) >= PRUNE_MIN_EPOCHS:
+                self.prune_thresholds[checkpoint] = float(np.median(losses))
+
+    def _load_processed_data(self) -> Dict[str, DataFrame]:
+        """
+        Load the data published by `prepare_hyperopt_data()`.
+        Every (worker) process loads the file only once - and as numeric columns are
+        memory-mapped, all workers share the same pages instead of holding a copy each.
+        Each epoch gets copy-on-write copies of the dataframes, so columns added or modified
+        while generating signals don't leak into the next epoch.
+        """
+        if _processed_data.get('version') != self.data_pickle_version:
+            _processed_data.clear()
+            # mmap_mode only applies when loading from a path - not from a file object
+            _processed_data['data'] = load(self.data_pickle_file, mmap_mode='r')
+            _processed_data['version'] = self.data_pickle_version
+        return copy_on_write(_processed_data['data'])
 
     def _get_results_dict(self, backtesting_results, min_date, max_date,
-                          params_dict, processed: Dict[str, DataFrame]
-                          ) -> Dict[str, Any]:
+                          params_dict, processed: Dict[str, DataFrame],
+                          checkpoint_losses: Optional[List[float]] = None,
+                          pruned: bool = False) -> Dict[str, Any]:
+        """
+        :param checkpoint_losses: Losses at the checkpoints reached with --prune-epochs
+        :param pruned: Epoch was pruned at max_date - it's assigned the max. loss
+        """
         params_details = self._get_params_details(params_dict)
 
         strat_stats = generate_strategy_stats(
@@ -388,21 +544,12 @@ class Hyperopt:
         not_optimized = self.backtesting.strategy.get_no_optimize_params()
         not_optimized = deep_merge_dicts(not_optimized, self._get_no_optimize_details())
 
-        trade_count = strat_stats['total_trades']
         total_profit = strat_stats['profit_total']
-
-        # If this evaluation contains too short amount of trades to be
-        # interesting -- consider it as 'bad' (assigned max. loss value)
-        # in order to cast this hyperspace point away from optimization
-        # path. We do not want to optimize 'hodl' strategies.
         loss: float = MAX_LOSS
-        if trade_count >= self.config['hyperopt_min_trades']:
-            loss = self.calculate_loss(results=backtesting_results['results'],
-                                       trade_count=trade_count,
-                                       min_date=min_date, max_date=max_date,
-                                       config=self.config, processed=processed,
-                                       backtest_stats=strat_stats)
-        return {
+        if not pruned:
+            loss = self._calculate_loss(backtesting_results, strat_stats, min_date, max_date,
+                                        processed)
+        result = {
             'loss': loss,
             'params_dict': params_dict,
             'params_details': params_details,
@@ -411,6 +558,26 @@ class Hyperopt:
             'results_explanation': results_explanation,
             'total_profit': total_profit,
         }
+        if self.prune_interval:
+            result['checkpoint_losses'] = checkpoint_losses or []
+            result['pruned'] = pruned
+        return result
+
+    def _calculate_loss(self, backtesting_results: Dict[str, Any], strat_stats: Dict[str, Any],
+                        min_date: datetime, max_date: datetime,
+                        processed: Dict[str, DataFrame]) -> float:
+        trade_count = strat_stats['total_trades']
+        # If this evaluation contains too short amount of trades to be
+        # interesting -- consider it as 'bad' (assigned max. loss value)
+        # in order to cast this hyperspace point away from optimization
+        # path. We do not want to optimize 'hodl' strategies.
+        if trade_count < self.config['hyperopt_min_trades']:
+            return MAX_LOSS
+        return self.calculate_loss(results=backtesting_results['results'],
+                                   trade_count=trade_count,
+                                   min_date=min_date, max_date=max_date,
+                                   config=self.config, processed=processed,
+                                   backtest_stats=strat_stats)
 
     def get_optimizer(self, dimensions: List[Dimension], cpu_count) -> Optimizer:
         estimator = self.custom_hyperopt.generate_estimator(dimensions=dimensions)
@@ -439,11 +606,60 @@ class Hyperopt:
         return parallel(delayed(
                         wrap_non_picklable_objects(self.generate_optimizer))(v) for v in asked)
 
+    def run_optimizer_async(self, jobs: int, start: int, pbar: Progress, task: TaskID) -> None:
+        """
+        Run the remaining epochs without batch barriers.
+        A new point is asked for as soon as a worker is free, and results are passed to the
+        optimizer as they arrive.
+        Epochs are numbered in the order they complete.
+        :param jobs: Number of worker processes
+        :param start: Number of epochs evaluated already
+        """
+        executor = get_reusable_executor(max_workers=jobs)
+        optimizer = wrap_non_picklable_objects(self.generate_optimizer)
+        # Future -> (point, is_random), in submission order
+        pending: Dict[Future, Tuple[List[Any], bool]] = {}
+        submitted = current = start
+        try:
+            while current < self.total_epochs:
+                n_points = min(jobs - len(pending), self.total_epochs - submitted)
+                if n_points > 0:
+                    asked, is_random = self.get_asked_points(
+                        n_points=n_points, pending=[x for x, _ in pending.values()])
+                    for x, rand in zip(asked, is_random):
+                        pending[executor.submit(optimizer, x)] = (x, rand)
+                    submitted += len(asked)
+                if not pending:
+                    # Nothing to wait for - the optimizer didn't return any new point
+                    logger.warning("No new points to evaluate, stopping hyperopt after "
+                                   f"{current} epochs.")
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                finished = [(pending.pop(future), future.result())
+                            for future in list(pending) if future in done]
+                self.opt.tell([x for (x, _), _ in finished], [val['loss'] for _, val in finished])
+
+                for (_, rand), val in finished:
+                    # Use human-friendly indexes here (starting from 1)
+                    current += 1
+                    self.evaluate_result(val, current, rand)
+                    pbar.update(task, advance=1)
+        finally:
+            for future in pending:
+                future.cancel()
+
     def _set_random_state(self, random_state: Optional[int]) -> int:
         return random_state or random.randint(1, 2**16 - 1)
 
     def advise_and_trim(self, data: Dict[str, DataFrame]) -> Dict[str, DataFrame]:
-        preprocessed = self.backtesting.strategy.advise_all_indicators(data)
+        if self.analyze_per_epoch:
+            # Reuse indicators of prior epochs (in this process) with the same parameter values
+            indicator_cache = _processed_data.setdefault(
+                'indicators', HyperoptIndicatorCache(self.indicator_cache_max_bytes))
+            preprocessed = indicator_cache.advise_all_indicators(self.backtesting.strategy, data)
+        else:
+            preprocessed = self.backtesting.strategy.advise_all_indicators(data)
 
         # Trim startup period from analyzed dataframe to get correct dates for output.
         # This is only used to keep track of min/max date after trimming.
@@ -475,10 +691,30 @@ class Hyperopt:
             dump(preprocessed, self.data_pickle_file)
         else:
             dump(data, self.data_pickle_file)
+        self.data_pickle_version = uuid4().hex
 
-    def get_asked_points(self, n_points: int) -> Tuple[List[List[Any]], List[bool]]:
+    def _get_evaluated_points(self) -> Set[Tuple]:
+        """
+        Hashed index of all points known to the optimizer (`self.opt.Xi`).
+        Only points told since the last call are added - so the index stays in sync with
+        `self.opt.tell()` at O(1) cost per point.
+        """
+        if self._evaluated_points_opt is not self.opt:
+            # New optimizer
+            self._evaluated_points_opt = self.opt
+            self._evaluated_points = set()
+            self._evaluated_points_count = 0
+        points = self.opt.Xi
+        self._evaluated_points.update(
+            tuple(x) for x in points[self._evaluated_points_count:])
+        self._evaluated_points_count = len(points)
+        return self._evaluated_points
+
+    def get_asked_points(self, n_points: int, pending: Optional[List[List[Any]]] = None
+                         ) -> Tuple[List[List[Any]], List[bool]]:
         """
         Enforce points returned from `self.opt.ask` have not been already evaluated
+        :param pending: Points currently being evaluated - treated as evaluated
 
         Steps:
         1. Try to get points using `self.opt.ask` first
@@ -488,29 +724,26 @@ class Hyperopt:
         5. Repeat until at least `n_points` points in the `asked_non_tried` list
         6. Return a list with length truncated at `n_points`
         """
-        def unique_list(a_list):
-            new_list = []
-            for item in a_list:
-                if item not in new_list:
-                    new_list.append(item)
-            return new_list
+        evaluated = self._get_evaluated_points()
+        # Hashed, so checking a candidate is O(1) regardless of the number of epochs
+        seen = evaluated.union(tuple(x) for x in pending) if pending else set(evaluated)
         i = 0
         asked_non_tried: List[List[Any]] = []
         is_random_non_tried: List[bool] = []
         while i < 5 and len(asked_non_tried) < n_points:
             if i < 3:
                 self.opt.cache_ = {}
-                asked = unique_list(self.opt.ask(n_points=n_points * 5))
-                is_random = [False for _ in range(len(asked))]
+                asked = self.opt.ask(n_points=n_points * 5)
+                is_random = False
             else:
-                asked = unique_list(self.opt.space.rvs(n_samples=n_points * 5))
-                is_random = [True for _ in range(len(asked))]
-            is_random_non_tried += [rand for x, rand in zip(asked, is_random)
-                                    if x not in self.opt.Xi
-                                    and x not in asked_non_tried]
-            asked_non_tried += [x for x in asked
-                                if x not in self.opt.Xi
-                                and x not in asked_non_tried]
+                asked = self.opt.space.rvs(n_samples=n_points * 5)
+                is_random = True
+            for x in asked:
+                key = tuple(x)
+                if key not in seen:
+                    seen.add(key)
+                    asked_non_tried.append(x)
+                    is_random_non_tried.append(is_random)
             i += 1
 
         if asked_non_tried:
@@ -543,6 +776,8 @@ class Hyperopt:
             self.current_best_loss = val['loss']
             self.current_best_epoch = val
 
+        if self.prune_interval:
+            self._update_prune_thresholds(val.get('checkpoint_losses', []))
         self._save_result(val)
 
     def start(self) -> None:
@@ -578,6 +813,7 @@ class Hyperopt:
             with Parallel(n_jobs=config_jobs) as parallel:
                 jobs = parallel._effective_n_jobs()
                 logger.info(f'Effective number of parallel workers used: {jobs}')
+                self.indicator_cache_max_bytes //= jobs
 
                 # Define progressbar
                 with Progress(
@@ -605,26 +841,31 @@ class Hyperopt:
                         pbar.update(task, advance=1)
                         start += 1
 
-                    evals = ceil((self.total_epochs - start) / jobs)
-                    for i in range(evals):
-                        # Correct the number of epochs to be processed for the last
-                        # iteration (should not exceed self.total_epochs in total)
-                        n_rest = (i + 1) * jobs - (self.total_epochs - start)
-                        current_jobs = jobs - n_rest if n_rest > 0 else jobs
+                    if self.config.get('hyperopt_async', False) and jobs > 1:
+                        self.run_optimizer_async(jobs, start, pbar, task)
+                    else:
+                        evals = ceil((self.total_epochs - start) / jobs)
+                        for i in range(evals):
+                            # Correct the number of epochs to be processed for the last
+                            # iteration (should not exceed self.total_epochs in total)
+                            n_rest = (i + 1) * jobs - (self.total_epochs - start)
+                            current_jobs = jobs - n_rest if n_rest > 0 else jobs
 
-                        asked, is_random = self.get_asked_points(n_points=current_jobs)
-                        f_val = self.run_optimizer_parallel(parallel, asked)
-                        self.opt.tell(asked, [v['loss'] for v in f_val])
+                            asked, is_random = self.get_asked_points(n_points=current_jobs)
+                            f_val = self.run_optimizer_parallel(parallel, asked)
+                            self.opt.tell(asked, [v['loss'] for v in f_val])
 
-                        for j, val in enumerate(f_val):
-                            # Use human-friendly indexes here (starting from 1)
-                            current = i * jobs + j + 1 + start
+                            for j, val in enumerate(f_val):
+                                # Use human-friendly indexes here (starting from 1)
+                                current = i * jobs + j + 1 + start
 
-                            self.evaluate_result(val, current, is_random[j])
-                            pbar.update(task, advance=1)
+                                self.evaluate_result(val, current, is_random[j])
+                                pbar.update(task, advance=1)
 
         except KeyboardInterrupt:
             print('User interrupted..')
+        finally:
+            self.results_store.flush()
 
         logger.info(f"{self.num_epochs_saved} {plural(self.num_epochs_saved, 'epoch')} "
                     f"saved to '{self.results_file}'.")
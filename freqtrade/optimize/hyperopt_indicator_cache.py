@@ -0,0 +1,97 @@
+"""
+Indicator cache for hyperopt runs using --analyze-per-epoch
+"""
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+from pandas import DataFrame
+
+from freqtrade.strategy.interface import IStrategy
+from freqtrade.strategy.parameters import record_parameter_reads
+
+
+logger = logging.getLogger(__name__)
+
+
+class HyperoptIndicatorCache:
+    """
+    Memoizes indicators calculated by `advise_indicators()`, per pair.
+
+    While calculating indicators, all hyperoptable parameters read by the strategy are
+    recorded. Results are then keyed by the values of exactly these parameters - so epochs
+    which only change parameters used for entry / exit signals never recalculate indicators.
+    Least recently used results are evicted once the memory limit is exceeded.
+
+    Assumes indicators only depend on the candle data and hyperoptable parameters.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        # (pair, parameter names, parameter values) -> (analyzed dataframe, size in bytes)
+        self._results: 'OrderedDict[Tuple[str, Tuple[str, ...], Tuple], Tuple[DataFrame, int]]' \
+            = OrderedDict()
+        # Parameter names indicators depended on, per pair
+        self._dependencies: Dict[str, List[Tuple[str, ...]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def advise_all_indicators(self, strategy: IStrategy,
+                              data: Dict[str, DataFrame]) -> Dict[str, DataFrame]:
+        """
+        Cached counterpart of `IStrategy.advise_all_indicators()`.
+        """
+        parameters = dict(strategy.enumerate_parameters())
+        return {pair: self._advise_indicators(strategy, parameters, pair, pair_data)
+                for pair, pair_data in data.items()}
+
+    def _advise_indicators(self, strategy: IStrategy, parameters: Dict[str, Any],
+                           pair: str, pair_data: DataFrame) -> DataFrame:
+        for names in self._dependencies.get(pair, []):
+            key = (pair, names, tuple(parameters[name].value for name in names))
+            cached = self._results.get(key) if _hashable(key) else None
+            if cached is not None:
+                self._results.move_to_end(key)
+                # Copy, so signal generation can't modify the cached dataframe
+                return cached[0].copy()
+
+        with record_parameter_reads() as reads:
+            analyzed = strategy.advise_indicators(pair_data.copy(), {'pair': pair}).copy()
+
+        names_by_param = {id(param): name for name, param in parameters.items()}
+        names = tuple(sorted(names_by_param.get(id(param), '') for param in reads))
+        key = (pair, names, tuple(parameters[name].value for name in names if name))
+        # Parameters which are not part of the strategy, or unhashable values can't be cached.
+        if '' not in names and _hashable(key):
+            self._store(key, analyzed)
+            if names not in self._dependencies.setdefault(pair, []):
+                logger.debug(f"Indicators for {pair} depend on {', '.join(names) or 'nothing'}.")
+                self._dependencies[pair].append(names)
+            return analyzed.copy()
+        return analyzed
+
+    def _store(self, key: Tuple[str, Tuple[str, ...], Tuple], analyzed: DataFrame) -> None:
+        # deep=True - object columns (e.g. tags) would be undercounted otherwise
+        size = int(analyzed.memory_usage(index=True, deep=True).sum())
+        if size > self.max_bytes:
+            return
+        self._results[key] = (analyzed, size)
+        self.size += size
+        while self.size > self.max_bytes:
+            _, (_, evicted_size) = self._results.popitem(last=False)
+            self.size -= evicted_size
+
+    def clear(self) -> None:
+        self._results.clear()
+        self._dependencies.clear()
+        self.size = 0
+
+
+def _hashable(key: Tuple) -> bool:
+    try:
+        hash(key)
+    except TypeError:
+        return False
+    return True
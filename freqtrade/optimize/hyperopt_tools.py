@@ -1,8 +1,10 @@
 import logging
+import time
 from copy import deepcopy
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Iterator, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+from zlib import crc32
 
 import numpy as np
 import pandas as pd
@@ -14,7 +16,8 @@ from pandas import isna, json_normalize
 from freqtrade.constants import FTHYPT_FILEVERSION, Config
 from freqtrade.enums import HyperoptState
 from freqtrade.exceptions import OperationalException
-from freqtrade.misc import deep_merge_dicts, round_coin_value, round_dict, safe_value_fallback2
+from freqtrade.misc import (deep_merge_dicts, plural, round_coin_value, round_dict,
+                            safe_value_fallback2)
 from freqtrade.optimize.hyperopt_epoch_filters import hyperopt_filter_epochs
 from freqtrade.optimize.optimize_reports import generate_wins_draws_losses
 
@@ -25,6 +28,15 @@ NON_OPT_PARAM_APPENDIX = "  # value loaded from strategy"
 
 HYPER_PARAMS_FILE_FORMAT = rapidjson.NM_NATIVE | rapidjson.NM_NAN
 
+# Epoch attributes and result metrics kept in the results index.
+# Covers everything required to filter epochs and to show the result table.
+INDEX_EPOCH_KEYS = ['current_epoch', 'loss', 'is_initial_point', 'is_random', 'is_best', 'pruned']
+INDEX_METRIC_KEYS = [
+    'total_trades', 'wins', 'draws', 'losses', 'profit_mean', 'profit_median', 'profit_total',
+    'profit_total_abs', 'holding_avg', 'holding_avg_s', 'max_drawdown', 'max_drawdown_account',
+    'max_drawdown_abs', 'trade_count_long', 'trade_count_short',
+]
+
 
 def hyperopt_serializer(x):
     if isinstance(x, np.integer):
@@ -35,6 +47,179 @@ def hyperopt_serializer(x):
     return str(x)
 
 
+def summarize_epoch(epoch: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Index entry of a hyperopt epoch - a copy of the epoch reduced to its key metrics.
+    """
+    metrics = epoch.get('results_metrics', {})
+    summary = {key: epoch[key] for key in INDEX_EPOCH_KEYS if key in epoch}
+    summary['results_metrics'] = {key: metrics[key] for key in INDEX_METRIC_KEYS if key in metrics}
+    return summary
+
+
+class HyperoptResultsStore:
+    """
+    Hyperopt results file (one json object per epoch and line), accompanied by an index file.
+
+    The index (`<results_file>.idx`) holds the key metrics of every epoch, as well as
+    its position in the results file and a checksum of its line. Epochs can therefore be
+    filtered and sorted without deserializing the full epoch, and single epochs are loaded by
+    seeking to their position.
+    Results files without (or with an outdated) index are indexed on first use - the index
+    is outdated if the last indexed epoch doesn't match its checksum.
+    """
+
+    def __init__(self, results_file: Path, flush_interval: float = 0) -> None:
+        """
+        :param results_file: Results file (.fthypt)
+        :param flush_interval: Buffer appended epochs for up to this many seconds before
+            writing them to disk. 0 writes every epoch immediately.
+        """
+        self.results_file = results_file
+        self.index_file = results_file.with_name(f'{results_file.name}.idx')
+        self.flush_interval = flush_interval
+        # Serialized epochs and their index entry, not yet written to disk
+        self._buffer: List[Tuple[bytes, Dict[str, Any]]] = []
+        self._last_flush: Optional[float] = None
+        # Size of the results file covered by the index file - None if not verified yet
+        self._index_end: Optional[int] = None
+
+    def append(self, epoch: Dict[str, Any]) -> None:
+        """
+        Add an epoch to the results file, flushing buffered epochs once flush_interval passed.
+        """
+        line = rapidjson.dumps(epoch, default=hyperopt_serializer,
+                               number_mode=HYPER_PARAMS_FILE_FORMAT) + '\n'
+        self._buffer.append((line.encode(), summarize_epoch(epoch)))
+        if (self._last_flush is None
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write buffered epochs to the results file and the index.
+        """
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+        if self._index_end is None and self.results_file.is_file():
+            # Index needs to be up to date before appending to it
+            self.load_index()
+
+        index_lines = []
+        with self.results_file.open('ab') as f:
+            offset = start = f.tell()
+            for line, summary in self._buffer:
+                f.write(line)
+                index_lines.append(self._dump_index_entry(
+                    {**summary, '_position': [offset, len(line)], '_checksum': crc32(line)}))
+                offset += len(line)
+        self._buffer = []
+
+        if start == (self._index_end or 0):
+            self._index_end = offset
+            # A new results file replaces a leftover index
+            self._write_index(index_lines, append=start > 0)
+        # Otherwise, the index is updated the next time it's loaded.
+
+    def load_index(self) -> List[Dict[str, Any]]:
+        """
+        Index entries of all epochs (see `summarize_epoch()`) in results file order.
+        The position of every epoch is available as `_position` ([offset, length]).
+        """
+        if not self.results_file.is_file():
+            return []
+        entries, clean = self._read_index()
+        end = sum(entries[-1]['_position']) if entries else 0
+
+        new_entries: List[Dict[str, Any]] = []
+        with self.results_file.open('rb') as f:
+            if entries:
+                f.seek(entries[-1]['_position'][0])
+                if crc32(f.read(entries[-1]['_position'][1])) != entries[-1]['_checksum']:
+                    # Index belongs to a different (or rewritten) file
+                    entries, clean, end = [], False, 0
+            f.seek(end)
+            offset = end
+            for line in f:
+                if not line.endswith(b'\n'):
+                    # Epoch currently being written
+                    break
+                if line.strip():
+                    summary = summarize_epoch(rapidjson.loads(line))
+                    summary['_position'] = [offset, len(line)]
+                    summary['_checksum'] = crc32(line)
+                    new_entries.append(summary)
+                offset += len(line)
+
+        if new_entries:
+            logger.info(f"Indexed {len(new_entries)} {plural(len(new_entries), 'epoch')} "
+                        f"of '{self.results_file}'.")
+        if new_entries or not clean:
+            self._write_index([self._dump_index_entry(entry)
+                               for entry in (new_entries if clean else entries + new_entries)],
+                              append=clean)
+        self._index_end = offset
+        return entries + new_entries
+
+    def load_epochs(self, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Load the full epochs of the given index entries.
+        """
+        epochs = []
+        with self.results_file.open('rb') as f:
+            for entry in entries:
+                offset, length = entry['_position']
+                f.seek(offset)
+                epochs.append(rapidjson.loads(f.read(length)))
+        return epochs
+
+    def _read_index(self) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Read the index file.
+        :return: Index entries and whether the index file can be appended to
+        """
+        entries: List[Dict[str, Any]] = []
+        end = 0
+        try:
+            with self.index_file.open('rb') as f:
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        # Interrupted while writing - keep the complete entries
+                        return entries, False
+                    offset, length, checksum, summary = rapidjson.loads(line)
+                    if offset < end:
+                        return [], False
+                    summary['_position'] = [offset, length]
+                    summary['_checksum'] = checksum
+                    entries.append(summary)
+                    end = offset + length
+        except FileNotFoundError:
+            return [], True
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read '{self.index_file}', rebuilding it. Error: {e}")
+            return [], False
+        if end > self.results_file.stat().st_size:
+            return [], False
+        return entries, True
+
+    @staticmethod
+    def _dump_index_entry(entry: Dict[str, Any]) -> str:
+        summary = {key: value for key, value in entry.items()
+                   if key not in ('_position', '_checksum')}
+        return rapidjson.dumps([*entry['_position'], entry['_checksum'], summary],
+                               default=hyperopt_serializer,
+                               number_mode=HYPER_PARAMS_FILE_FORMAT) + '\n'
+
+    def _write_index(self, lines: List[str], append: bool) -> None:
+        try:
+            with self.index_file.open('a' if append else 'w') as f:
+                f.writelines(lines)
+        except OSError as e:
+            # Read-only results directory - the index is rebuilt in memory every time.
+            logger.warning(f"Could not write '{self.index_file}'. Error: {e}")
+
+
 class HyperoptStateContainer:
     """ Singleton class to track state of hyperopt"""
     state: HyperoptState = HyperoptState.OPTIMIZE
@@ -111,22 +296,6 @@ class HyperoptTools:
         else:
             return any(s in config['spaces'] for s in [space, 'all', 'default'])
 
-    @staticmethod
-    def _read_results(results_file: Path, batch_size: int = 10) -> Iterator[List[Any]]:
-        """
-        Stream hyperopt results from file
-        """
-        import rapidjson
-        logger.info(f"Reading epochs from '{results_file}'")
-        with results_file.open('r') as f:
-            data = []
-            for line in f:
-                data += [rapidjson.loads(line)]
-                if len(data) >= batch_size:
-                    yield data
-                    data = []
-        yield data
-
     @staticmethod
     def _test_hyperopt_results_exist(results_file) -> bool:
         if results_file.is_file() and results_file.stat().st_size > 0:
@@ -141,7 +310,12 @@ class HyperoptTools:
             return False
 
     @staticmethod
-    def load_filtered_results(results_file: Path, config: Config) -> Tuple[List, int]:
+    def load_filtered_index(results_file: Path, config: Config) -> Tuple[List, int]:
+        """
+        Filter epochs using the hyperopt-list filters, based on the results index.
+        :return: Tuple of filtered index entries (key metrics only, see `summarize_epoch()`)
+            and the total number of epochs
+        """
         filteroptions = {
             'only_best': config.get('hyperopt_list_best', False),
             'only_profitable': config.get('hyperopt_list_profitable', False),
@@ -161,22 +335,35 @@ class HyperoptTools:
             logger.warning(f"Hyperopt file {results_file} not found.")
             return [], 0
 
-        epochs = []
-        total_epochs = 0
-        for epochs_tmp in HyperoptTools._read_results(results_file):
-            if total_epochs == 0 and epochs_tmp[0].get('is_best') is None:
-                raise OperationalException(
-                    "The file with HyperoptTools results is incompatible with this version "
-                    "of Freqtrade and cannot be loaded.")
-            total_epochs += len(epochs_tmp)
-            epochs += hyperopt_filter_epochs(epochs_tmp, filteroptions, log=False)
+        logger.info(f"Reading epochs from '{results_file}'")
+        entries = HyperoptResultsStore(results_file).load_index()
+        if entries and entries[0].get('is_best') is None:
+            raise OperationalException(
+                "The file with HyperoptTools results is incompatible with this version "
+                "of Freqtrade and cannot be loaded.")
 
-        logger.info(f"Loaded {total_epochs} previous evaluations from disk.")
+        logger.info(f"Loaded {len(entries)} previous evaluations from disk.")
 
-        # Final filter run ...
-        epochs = hyperopt_filter_epochs(epochs, filteroptions, log=True)
+        return hyperopt_filter_epochs(entries, filteroptions, log=True), len(entries)
 
-        return epochs, total_epochs
+    @staticmethod
+    def load_filtered_results(results_file: Path, config: Config) -> Tuple[List, int]:
+        """
+        Load all epochs matching the hyperopt-list filters from the results file.
+        Only epochs passing the filters are deserialized.
+        :return: Tuple of filtered epochs and the total number of epochs
+        """
+        entries, total_epochs = HyperoptTools.load_filtered_index(results_file, config)
+        return HyperoptTools.load_epochs(results_file, entries), total_epochs
+
+    @staticmethod
+    def load_epochs(results_file: Path, entries: List[Dict]) -> List[Dict]:
+        """
+        Load the full epochs for index entries returned by `load_filtered_index()`.
+        """
+        if not entries:
+            return []
+        return HyperoptResultsStore(results_file).load_epochs(entries)
 
     @staticmethod
     def show_epoch_details(results, total_epochs: int, print_json: bool,
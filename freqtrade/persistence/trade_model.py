@@ -2,6 +2,7 @@
 This module contains the class to persist trades into SQLite
 """
 import logging
+from bisect import bisect_right
 from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
@@ -307,6 +308,35 @@ class Order(ModelBase):
         return Order.session.scalars(select(Order).filter(Order.order_id == order_id)).first()
 
 
+class _ClosedTrades:
+    """
+    Closed backtest trades, sorted by close date - so trades closed after a given date
+    can be selected in O(log n + k).
+    Trades without close_date are sorted first.
+    """
+    __slots__ = ('dates', 'trades')
+
+    def __init__(self) -> None:
+        self.dates: List[float] = []
+        self.trades: List['LocalTrade'] = []
+
+    def add(self, trade: 'LocalTrade') -> None:
+        date = trade.close_date.timestamp() if trade.close_date else float('-inf')
+        if not self.dates or date >= self.dates[-1]:
+            # Backtesting closes trades in chronological order
+            self.dates.append(date)
+            self.trades.append(trade)
+        else:
+            idx = bisect_right(self.dates, date)
+            self.dates.insert(idx, date)
+            self.trades.insert(idx, trade)
+
+    def closed_after(self, close_date: Optional[datetime]) -> List['LocalTrade']:
+        if not close_date:
+            return self.trades[:]
+        return self.trades[bisect_right(self.dates, close_date.timestamp()):]
+
+
 class LocalTrade:
     """
     Trade database model.
@@ -319,6 +349,9 @@ class LocalTrade:
     trades_open: List['LocalTrade'] = []
     # Copy of trades_open - but indexed by pair
     bt_trades_open_pp: Dict[str, List['LocalTrade']] = defaultdict(list)
+    # Closed trades indexed by close date - and by pair and close date
+    bt_trades_closed: _ClosedTrades = _ClosedTrades()
+    bt_trades_closed_pp: Dict[str, _ClosedTrades] = defaultdict(_ClosedTrades)
     bt_open_open_trade_count: int = 0
     total_profit: float = 0
     realized_profit: float = 0
@@ -604,6 +637,8 @@ class LocalTrade:
         LocalTrade.trades = []
         LocalTrade.trades_open = []
         LocalTrade.bt_trades_open_pp = defaultdict(list)
+        LocalTrade.bt_trades_closed = _ClosedTrades()
+        LocalTrade.bt_trades_closed_pp = defaultdict(_ClosedTrades)
         LocalTrade.bt_open_open_trade_count = 0
         LocalTrade.total_profit = 0
 
@@ -1164,7 +1199,8 @@ class LocalTrade:
         Helper function to query Trades.
         Returns a List of trades, filtered on the parameters given.
         In live mode, converts the filter to a database query and returns all rows
-        In Backtest mode, uses filters on Trade.trades to get the result.
+        In Backtest mode, uses the backtest trade containers (closed trades are indexed
+        by pair and close date) to get the result.
 
         :param pair: Filter by pair
         :param is_open: Filter by open/closed status
@@ -1175,23 +1211,23 @@ class LocalTrade:
         """
 
         # Offline mode - without database
-        if is_open is not None:
-            if is_open:
-                sel_trades = LocalTrade.trades_open
+        sel_trades: List[LocalTrade] = []
+        if not is_open:
+            # Closed trades are indexed by pair and close date
+            if pair:
+                closed = LocalTrade.bt_trades_closed_pp.get(pair)
+                sel_trades = closed.closed_after(close_date) if closed else []
             else:
-                sel_trades = LocalTrade.trades
-
-        else:
-            # Not used during backtesting, but might be used by a strategy
-            sel_trades = list(LocalTrade.trades + LocalTrade.trades_open)
+                sel_trades = LocalTrade.bt_trades_closed.closed_after(close_date)
+        if is_open is not False and not close_date:
+            # Open trades are only used during backtesting - but might be used by a strategy
+            if pair:
+                sel_trades += LocalTrade.bt_trades_open_pp.get(pair, [])
+            else:
+                sel_trades += LocalTrade.trades_open
 
-        if pair:
-            sel_trades = [trade for trade in sel_trades if trade.pair == pair]
         if open_date:
             sel_trades = [trade for trade in sel_trades if trade.open_date > open_date]
-        if close_date:
-            sel_trades = [trade for trade in sel_trades if trade.close_date
-                          and trade.close_date > close_date]
 
         return sel_trades
 
@@ -1200,7 +1236,7 @@ class LocalTrade:
         LocalTrade.trades_open.remove(trade)
         LocalTrade.bt_trades_open_pp[trade.pair].remove(trade)
         LocalTrade.bt_open_open_trade_count -= 1
-        LocalTrade.trades.append(trade)
+        LocalTrade._add_bt_closed_trade(trade)
         LocalTrade.total_profit += trade.close_profit_abs
 
     @staticmethod
@@ -1210,7 +1246,13 @@ class LocalTrade:
             LocalTrade.bt_trades_open_pp[trade.pair].append(trade)
             LocalTrade.bt_open_open_trade_count += 1
         else:
-            LocalTrade.trades.append(trade)
+            LocalTrade._add_bt_closed_trade(trade)
+
+    @staticmethod
+    def _add_bt_closed_trade(trade):
+        LocalTrade.trades.append(trade)
+        LocalTrade.bt_trades_closed.add(trade)
+        LocalTrade.bt_trades_closed_pp[trade.pair].add(trade)
 
     @staticmethod
     def remove_bt_trade(trade):
@@ -0,0 +1,279 @@
+"""
+Indicators which only calculate values for new candles - for use in
+`populate_indicators_incremental()`.
+"""
+from abc import ABC, abstractmethod
+from typing import Dict, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from pandas import DataFrame, Series
+
+
+def candle_dates(dataframe: DataFrame) -> np.ndarray:
+    """
+    Candle dates of dataframe as int64 (nanoseconds).
+    """
+    return np.asarray(dataframe['date'].values, dtype='datetime64[ns]').view(np.int64)
+
+
+def unchanged_candles(previous_dates: np.ndarray, previous_values: np.ndarray,
+                      dates: np.ndarray, values: np.ndarray) -> Tuple[int, int]:
+    """
+    Find the leading candles which are unchanged since a previous call.
+    :param previous_dates: Candle dates (int64) of the previous call
+    :param previous_values: Values (one row per column) of the previous call
+    :param dates: Candle dates (int64)
+    :param values: Values (one row per column)
+    :return: Tuple of (position of the first candle within the previous candles,
+        number of unchanged candles). (0, 0) if the first candle is not part of the
+        previous candles - e.g. if the candle window jumped.
+    """
+    if not len(dates):
+        return 0, 0
+    offset = int(np.searchsorted(previous_dates, dates[0]))
+    if offset == len(previous_dates) or previous_dates[offset] != dates[0]:
+        return 0, 0
+    count = min(len(previous_dates) - offset, len(dates))
+    previous = previous_values[:, offset:offset + count]
+    current = values[:, :count]
+    same = ((previous_dates[offset:offset + count] == dates[:count])
+            & ((previous == current) | (np.isnan(previous) & np.isnan(current))).all(axis=0))
+    return offset, count if same.all() else int(np.argmin(same))
+
+
+def _smooth(values: np.ndarray, window: int, alpha: float, count: float,
+            acc: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Moving average, seeded with the simple average of the first `window` values and smoothed
+    exponentially afterwards (TA-Lib's EMA - and Wilder's smoothing used by RSI and ATR).
+    :param values: New values
+    :param count: Number of values processed before (capped at window)
+    :param acc: Sum of the values processed before while count < window, average afterwards
+    :return: Averages (NaN until `window` values were processed), counts and accumulators
+        after each value
+    """
+    counts = np.minimum(count + np.arange(1, len(values) + 1), window).astype(np.float64)
+    accs = np.empty(len(values), dtype=np.float64)
+    seeding = int(min(len(values), window - count))
+    if seeding > 0:
+        accs[:seeding] = acc + np.cumsum(values[:seeding])
+        if count + seeding == window:
+            accs[seeding - 1] /= window
+        acc = accs[seeding - 1]
+    seeding = max(seeding, 0)
+    if seeding < len(values):
+        smoothed = Series(np.concatenate((np.array([acc]), values[seeding:]))).ewm(
+            alpha=alpha, adjust=False).mean().to_numpy()
+        accs[seeding:] = smoothed[1:]
+    return np.where(counts >= window, accs, np.nan), counts, accs
+
+
+def _windows(values: np.ndarray, window: int, new: int) -> np.ndarray:
+    """
+    Windows of `window` values ending at each of the `new` last values.
+    Values missing at the start of the data are NaN.
+    """
+    missing = window - 1 - (len(values) - new)
+    if missing > 0:
+        values = np.concatenate((np.full(missing, np.nan), values))
+    return sliding_window_view(values, window)[-new:]
+
+
+class _IndicatorCache(NamedTuple):
+    dates: np.ndarray
+    values: np.ndarray
+    outputs: np.ndarray
+    states: np.ndarray
+
+
+class IncrementalIndicator(ABC):
+    """
+    Indicator which keeps its results per pair, and only calculates values for new candles -
+    using the results and state of the previous call.
+    Falls back to calculating all candles if the candle window jumped (e.g. after a restart
+    or missed candles), and recalculates candles whose input values changed.
+
+    Results match calculating the indicator over all candles seen since the first (or
+    fallback) calculation - so recursive indicators (EMA, RSI, ATR) can slightly differ from
+    calculating them over the current candle window only.
+    """
+    #: Names of the returned values - a Series is returned for a single output
+    outputs: Tuple[str, ...] = ('value', )
+    #: Number of state variables kept per candle
+    state_size: int = 0
+
+    def __init__(self, inputs: Sequence[str], lookback: int = 0) -> None:
+        """
+        :param inputs: Dataframe columns the indicator is calculated from
+        :param lookback: Number of preceding candles needed to calculate a candle
+        """
+        self.inputs = list(inputs)
+        self.lookback = lookback
+        self._cache: Dict[str, _IndicatorCache] = {}
+
+    def update(self, dataframe: DataFrame, pair: str) -> Union[Series, DataFrame]:
+        """
+        Indicator values for all candles of dataframe - only new candles are calculated.
+        :param dataframe: Dataframe containing the candles of pair
+        :param pair: Pair the candles belong to - state is kept per pair
+        :return: Series (or DataFrame for indicators with multiple outputs) aligned to dataframe
+        """
+        dates = candle_dates(dataframe)
+        values = dataframe[self.inputs].to_numpy(dtype=np.float64).T
+        previous = self._cache.get(pair)
+        offset, start = 0, 0
+        if previous is not None:
+            offset, start = unchanged_candles(previous.dates, previous.values, dates, values)
+
+        if previous is not None and start:
+            outputs = previous.outputs[:, offset:offset + start]
+            states = previous.states[:, offset:offset + start]
+            if start < len(dates):
+                lookback = min(self.lookback, start)
+                new_outputs, new_states = self._calculate(
+                    values[:, start - lookback:], len(dates) - start, states[:, -1])
+                outputs = np.concatenate((outputs, new_outputs), axis=1)
+                states = np.concatenate((states, new_states), axis=1)
+        else:
+            outputs, states = self._calculate(values, len(dates), None)
+        self._cache[pair] = _IndicatorCache(dates, values, outputs, states)
+
+        if len(self.outputs) == 1:
+            return Series(outputs[0], index=dataframe.index)
+        return DataFrame(dict(zip(self.outputs, outputs)), index=dataframe.index)
+
+    def reset(self, pair: Optional[str] = None) -> None:
+        """
+        Drop the kept results - of one pair, or of all pairs.
+        """
+        if pair is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(pair, None)
+
+    @abstractmethod
+    def _calculate(self, values: np.ndarray, new: int,
+                   state: Optional[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate the indicator for new candles.
+        :param values: Input values (one row per input) - up to `lookback` candles preceding
+            the new candles, followed by the new candles
+        :param new: Number of new candles
+        :param state: State after the candle preceding the new candles.
+            None if there is no preceding candle.
+        :return: Tuple of outputs (one row per output) and states (one row per state variable)
+            of the new candles
+        """
+
+
+class IncrementalSMA(IncrementalIndicator):
+    """
+    Simple moving average (like `ta.SMA()`).
+    """
+
+    def __init__(self, window: int = 30, column: str = 'close') -> None:
+        super().__init__([column], lookback=window - 1)
+        self.window = window
+
+    def _calculate(self, values: np.ndarray, new: int,
+                   state: Optional[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        return _windows(values[0], self.window, new).mean(axis=1)[np.newaxis], np.empty((0, new))
+
+
+class IncrementalEMA(IncrementalIndicator):
+    """
+    Exponential moving average (like `ta.EMA()`), seeded with the simple moving average.
+    """
+    state_size = 2
+
+    def __init__(self, window: int = 30, column: str = 'close') -> None:
+        super().__init__([column])
+        self.window = window
+
+    def _calculate(self, values: np.ndarray, new: int,
+                   state: Optional[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        if state is None:
+            state = np.zeros(self.state_size)
+        ema, counts, accs = _smooth(
+            values[0], self.window, 2 / (self.window + 1), state[0], state[1])
+        return ema[np.newaxis], np.vstack((counts, accs))
+
+
+class IncrementalRSI(IncrementalIndicator):
+    """
+    Relative strength index (like `ta.RSI()`), using Wilder's smoothing.
+    """
+    state_size = 4
+
+    def __init__(self, window: int = 14, column: str = 'close') -> None:
+        super().__init__([column], lookback=1)
+        self.window = window
+
+    def _calculate(self, values: np.ndarray, new: int,
+                   state: Optional[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        deltas = np.diff(values[0])
+        first = np.empty((self.state_size, 0))
+        if state is None:
+            # The first candle has no preceding candle to compare to
+            state = np.zeros(self.state_size)
+            first = state[:, np.newaxis]
+        gains, gain_counts, gain_accs = _smooth(
+            np.maximum(deltas, 0), self.window, 1 / self.window, state[0], state[1])
+        losses, loss_counts, loss_accs = _smooth(
+            np.maximum(-deltas, 0), self.window, 1 / self.window, state[2], state[3])
+        total = gains + losses
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rsi = np.where(total == 0, 0., 100 * gains / total)
+        states = np.vstack((gain_counts, gain_accs, loss_counts, loss_accs))
+        rsi = np.concatenate((np.full(first.shape[1], np.nan), rsi))
+        return rsi[np.newaxis], np.concatenate((first, states), axis=1)
+
+
+class IncrementalATR(IncrementalIndicator):
+    """
+    Average true range (like `ta.ATR()`), using Wilder's smoothing.
+    """
+    state_size = 2
+
+    def __init__(self, window: int = 14) -> None:
+        super().__init__(['high', 'low', 'close'], lookback=1)
+        self.window = window
+
+    def _calculate(self, values: np.ndarray, new: int,
+                   state: Optional[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        high, low, close = values[:, 1:]
+        previous_close = values[2, :-1]
+        true_range = np.maximum.reduce([
+            high - low, np.abs(high - previous_close), np.abs(low - previous_close)])
+        first = np.empty((self.state_size, 0))
+        if state is None:
+            # The first candle has no preceding candle to compare to
+            state = np.zeros(self.state_size)
+            first = state[:, np.newaxis]
+        atr, counts, accs = _smooth(true_range, self.window, 1 / self.window, state[0], state[1])
+        atr = np.concatenate((np.full(first.shape[1], np.nan), atr))
+        return atr[np.newaxis], np.concatenate((first, np.vstack((counts, accs))), axis=1)
+
+
+class IncrementalBollingerBands(IncrementalIndicator):
+    """
+    Bollinger bands (like `qtpylib.bollinger_bands()`) - returns `upper`, `mid` and `lower`.
+    """
+    outputs = ('upper', 'mid', 'lower')
+
+    def __init__(self, window: int = 20, stds: float = 2, column: str = 'close') -> None:
+        super().__init__([column], lookback=window - 1)
+        self.window = window
+        self.stds = stds
+
+    def _calculate(self, values: np.ndarray, new: int,
+                   state: Optional[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        windows = _windows(values[0], self.window, new)
+        valid = ~np.isnan(windows)
+        counts = valid.sum(axis=1)
+        mid = np.where(valid, windows, 0).sum(axis=1) / counts
+        squares = np.where(valid, (windows - mid[:, np.newaxis]) ** 2, 0).sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std = np.where(counts > 1, np.sqrt(squares / (counts - 1)), np.nan)
+        return np.vstack((mid + std * self.stds, mid, mid - std * self.stds)), np.empty((0, new))
@@ -4,12 +4,16 @@ This module defines the interface to apply for strategies
 """
 import logging
 from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional, Tuple, Union
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
 
-from pandas import DataFrame
+import numpy as np
+from pandas import DataFrame, concat
 
-from freqtrade.constants import CUSTOM_TAG_MAX_LENGTH, Config, IntOrInf, ListPairsWithTimeframes
+from freqtrade.constants import (CUSTOM_TAG_MAX_LENGTH, DEFAULT_DATAFRAME_COLUMNS, Config, IntOrInf,
+                                 ListPairsWithTimeframes)
 from freqtrade.data.dataprovider import DataProvider
 from freqtrade.enums import (CandleType, ExitCheckTuple, ExitType, MarketDirection, RunMode,
                              SignalDirection, SignalTagType, SignalType, TradingMode)
@@ -18,6 +22,7 @@ from freqtrade.exchange import timeframe_to_minutes, timeframe_to_next_date, tim
 from freqtrade.misc import remove_entry_exit_signals
 from freqtrade.persistence import Order, PairLocks, Trade
 from freqtrade.strategy.hyper import HyperStrategyMixin
+from freqtrade.strategy.incremental_indicators import candle_dates, unchanged_candles
 from freqtrade.strategy.informative_decorator import (InformativeData, PopulateIndicators,
                                                       _create_and_merge_informative_pair,
                                                       _format_pair_name)
@@ -128,6 +133,8 @@ class IStrategy(ABC, HyperStrategyMixin):
         self.config = config
         # Dict to determine if analysis is necessary
         self._last_candle_seen_per_pair: Dict[str, datetime] = {}
+        # Indicators of the previous analysis, per pair (populate_indicators_incremental)
+        self._ft_incremental_indicators: Dict[str, DataFrame] = {}
         super().__init__(config)
 
         # Gather informative pairs from @informative-decorated methods.
@@ -206,6 +213,19 @@ class IStrategy(ABC, HyperStrategyMixin):
         """
         return dataframe
 
+    def populate_indicators_incremental(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        """
+        Incremental alternative to populate_indicators() - used instead of it once implemented.
+        In dry / live mode, dataframe contains the indicators of the previous analysis for
+        all but the newest `metadata['new_candles']` candles - so only these have to be
+        calculated. In all other modes (and after gaps in the candles), all candles are new.
+        :param dataframe: DataFrame with data from the exchange
+        :param metadata: Additional information, like the currently traded pair
+            and the number of new candles (new_candles)
+        :return: a Dataframe with all mandatory indicators for the strategies
+        """
+        return dataframe
+
     def populate_buy_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         """
         DEPRECATED - please migrate to populate_entry_trend
@@ -722,12 +742,12 @@ class IStrategy(ABC, HyperStrategyMixin):
 
     _ft_stop_uses_after_fill = False
 
-    def __informative_pairs_freqai(self) -> ListPairsWithTimeframes:
+    def __informative_pairs_freqai(self, shared_only: bool = False) -> ListPairsWithTimeframes:
         """
         Create informative-pairs needed for FreqAI
         """
         if self.config.get('freqai', {}).get('enabled', False):
-            whitelist_pairs = self.dp.current_whitelist()
+            whitelist_pairs = [] if shared_only else self.dp.current_whitelist()
             candle_type = self.config.get('candle_type_def', CandleType.SPOT)
             corr_pairs = self.config["freqai"]["feature_parameters"]["include_corr_pairlist"]
             informative_pairs = []
@@ -738,9 +758,12 @@ class IStrategy(ABC, HyperStrategyMixin):
 
         return []
 
-    def gather_informative_pairs(self) -> ListPairsWithTimeframes:
+    def gather_informative_pairs(self, shared_only: bool = False) -> ListPairsWithTimeframes:
         """
         Internal method which gathers all informative pairs (user or automatically defined).
+        :param shared_only: Only gather informative pairs which may be used while analyzing
+            any pair - omitting the informative timeframes of the analyzed pair itself,
+            which are added for every whitelisted pair.
         """
         informative_pairs = self.informative_pairs()
         # Compatibility code for 2 tuple informative pairs
@@ -759,10 +782,10 @@ class IStrategy(ABC, HyperStrategyMixin):
                     candle_type,
                 )
                 informative_pairs.append(pair_tf)
-            else:
+            elif not shared_only:
                 for pair in self.dp.current_whitelist():
                     informative_pairs.append((pair, inf_data.timeframe, candle_type))
-        informative_pairs.extend(self.__informative_pairs_freqai())
+        informative_pairs.extend(self.__informative_pairs_freqai(shared_only))
         return list(set(informative_pairs))
 
     def get_strategy_name(self) -> str:
@@ -857,12 +880,7 @@ class IStrategy(ABC, HyperStrategyMixin):
 
             # Defs that only make change on new candle data.
             dataframe = self.analyze_ticker(dataframe, metadata)
-
-            self._last_candle_seen_per_pair[pair] = dataframe.iloc[-1]['date']
-
-            candle_type = self.config.get('candle_type_def', CandleType.SPOT)
-            self.dp._set_cached_df(pair, self.timeframe, dataframe, candle_type=candle_type)
-            self.dp._emit_df((pair, self.timeframe, candle_type), dataframe, new_candle)
+            self._store_analyzed_dataframe(pair, dataframe, new_candle)
 
         else:
             logger.debug("Skipping TA Analysis for already analyzed candle")
@@ -872,28 +890,39 @@ class IStrategy(ABC, HyperStrategyMixin):
 
         return dataframe
 
-    def analyze_pair(self, pair: str) -> None:
+    def _store_analyzed_dataframe(self, pair: str, dataframe: DataFrame,
+                                  new_candle: bool) -> None:
         """
-        Fetch data for this pair from dataprovider and analyze.
-        Stores the dataframe into the dataprovider.
-        The analyzed dataframe is then accessible via `dp.get_analyzed_dataframe()`.
-        :param pair: Pair to analyze.
+        Store the analyzed dataframe in the dataprovider (and send it to consumers).
+        """
+        self._last_candle_seen_per_pair[pair] = dataframe.iloc[-1]['date']
+
+        candle_type = self.config.get('candle_type_def', CandleType.SPOT)
+        self.dp._set_cached_df(pair, self.timeframe, dataframe, candle_type=candle_type)
+        self.dp._emit_df((pair, self.timeframe, candle_type), dataframe, new_candle)
+
+    def _get_pair_ohlcv(self, pair: str) -> Optional[DataFrame]:
+        """
+        Candles to analyze for this pair - None if there are none.
         """
         dataframe = self.dp.ohlcv(
             pair, self.timeframe, candle_type=self.config.get('candle_type_def', CandleType.SPOT)
         )
         if not isinstance(dataframe, DataFrame) or dataframe.empty:
             logger.warning('Empty candle (OHLCV) data for pair %s', pair)
-            return
+            return None
+        return dataframe
 
+    def _check_analyzed_dataframe(self, pair: str, analyze: Callable[[], DataFrame],
+                                  preserved: Tuple[int, float, datetime]) -> None:
+        """
+        Run the analysis of a pair and verify the resulting dataframe.
+        :param analyze: Callable returning the analyzed dataframe
+        :param preserved: Dataframe properties, as returned by `preserve_df()` before analysis
+        """
         try:
-            df_len, df_close, df_date = self.preserve_df(dataframe)
-
-            dataframe = strategy_safe_wrapper(
-                self._analyze_ticker_internal, message=""
-            )(dataframe, {'pair': pair})
-
-            self.assert_df(dataframe, df_len, df_close, df_date)
+            dataframe = analyze()
+            self.assert_df(dataframe, *preserved)
         except StrategyError as error:
             logger.warning(f"Unable to analyze candle (OHLCV) data for pair {pair}: {error}")
             return
@@ -902,14 +931,91 @@ class IStrategy(ABC, HyperStrategyMixin):
             logger.warning('Empty dataframe for pair %s', pair)
             return
 
+    def analyze_pair(self, pair: str) -> None:
+        """
+        Fetch data for this pair from dataprovider and analyze.
+        Stores the dataframe into the dataprovider.
+        The analyzed dataframe is then accessible via `dp.get_analyzed_dataframe()`.
+        :param pair: Pair to analyze.
+        """
+        dataframe = self._get_pair_ohlcv(pair)
+        if dataframe is None:
+            return
+
+        self._check_analyzed_dataframe(
+            pair,
+            lambda: strategy_safe_wrapper(
+                self._analyze_ticker_internal, message=""
+            )(dataframe, {'pair': pair}),
+            self.preserve_df(dataframe))
+
     def analyze(self, pairs: List[str]) -> None:
         """
         Analyze all pairs using analyze_pair().
+        With `internals.analyze_workers` > 1, pairs are analyzed concurrently.
         :param pairs: List of pairs to analyze
         """
+        workers = self.config.get('internals', {}).get('analyze_workers', 1)
+        if workers > 1 and len(pairs) > 1:
+            self._analyze_concurrently(pairs, workers)
+            return
         for pair in pairs:
             self.analyze_pair(pair)
 
+    def analyze_stream(self, pairs: Iterable[str]) -> None:
+        """
+        Analyze pairs while they are produced - e.g. as soon as their candles are refreshed.
+        Uses `internals.analyze_workers` threads (at least one), so the calling thread
+        keeps consuming pairs while analysis is running.
+        :param pairs: Pairs to analyze
+        """
+        workers = self.config.get('internals', {}).get('analyze_workers', 1)
+        self._analyze_concurrently(pairs, workers)
+
+    def _analyze_concurrently(self, pairs: Iterable[str], workers: int) -> None:
+        """
+        Concurrent counterpart of `analyze()`.
+        Only `analyze_ticker()` runs in worker threads. Analyzed dataframes are stored
+        in the dataprovider from the calling thread, in the order of pairs - so the result
+        is identical to analyzing pairs one by one.
+        :param pairs: Pairs to analyze - consumed while analysis of earlier pairs is running
+        :param workers: Number of worker threads
+        """
+        jobs = []
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='analyze') as executor:
+            for pair in pairs:
+                dataframe = self._get_pair_ohlcv(pair)
+                if dataframe is None:
+                    continue
+                new_candle = (self._last_candle_seen_per_pair.get(pair, None)
+                              != dataframe.iloc[-1]['date'])
+                preserved = self.preserve_df(dataframe)
+                future = None
+                if not self.process_only_new_candles or new_candle:
+                    future = executor.submit(self.analyze_ticker, dataframe, {'pair': pair})
+                jobs.append((pair, dataframe, future, new_candle, preserved))
+
+            for pair, dataframe, future, new_candle, preserved in jobs:
+                self._check_analyzed_dataframe(
+                    pair,
+                    partial(strategy_safe_wrapper(self._collect_analyzed_dataframe, message=""),
+                            pair, dataframe, future, new_candle),
+                    preserved)
+
+    def _collect_analyzed_dataframe(self, pair: str, dataframe: DataFrame,
+                                    future: Optional['Future[DataFrame]'],
+                                    new_candle: bool) -> DataFrame:
+        """
+        Result of the analysis started by `_analyze_concurrently()` - stored like
+        `_analyze_ticker_internal()` does.
+        """
+        if future is None:
+            # Candle was analyzed before
+            return self._analyze_ticker_internal(dataframe, {'pair': pair})
+        dataframe = future.result()
+        self._store_analyzed_dataframe(pair, dataframe, new_candle)
+        return dataframe
+
     @staticmethod
     def preserve_df(dataframe: DataFrame) -> Tuple[int, float, datetime]:
         """ keep some data for dataframes """
@@ -1361,8 +1467,41 @@ class IStrategy(ABC, HyperStrategyMixin):
             dataframe = _create_and_merge_informative_pair(
                 self, dataframe, metadata, inf_data, populate_fn)
 
+        if (type(self).populate_indicators_incremental
+                is not IStrategy.populate_indicators_incremental):
+            return self._advise_indicators_incremental(dataframe, metadata)
         return self.populate_indicators(dataframe, metadata)
 
+    def _advise_indicators_incremental(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        """
+        Call populate_indicators_incremental() - in dry / live mode with the indicators of
+        candles which are unchanged since the previous analysis.
+        """
+        pair = metadata['pair']
+        live = self.config.get('runmode') in (RunMode.DRY_RUN, RunMode.LIVE)
+        previous = self._ft_incremental_indicators.get(pair) if live else None
+        new_candles = len(dataframe)
+        if previous is not None:
+            columns = DEFAULT_DATAFRAME_COLUMNS[1:]
+            offset, start = unchanged_candles(
+                candle_dates(previous), previous[columns].to_numpy(dtype=np.float64).T,
+                candle_dates(dataframe), dataframe[columns].to_numpy(dtype=np.float64).T)
+            # The newest candle is always calculated
+            start = min(start, len(dataframe) - 1)
+            carried = [column for column in previous.columns if column not in dataframe.columns]
+            if start > 0 and carried:
+                indicators = previous[carried].iloc[offset:offset + start].set_axis(
+                    dataframe.index[:start]).reindex(dataframe.index)
+                dataframe = concat([dataframe, indicators], axis=1)
+                new_candles -= start
+
+        dataframe = self.populate_indicators_incremental(
+            dataframe, {**metadata, 'new_candles': new_candles})
+        if live:
+            # Copy, as entry / exit signals are added to dataframe
+            self._ft_incremental_indicators[pair] = dataframe.copy()
+        return dataframe
+
     def advise_entry(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         """
         Based on TA indicators, populates the entry order signal for the given dataframe
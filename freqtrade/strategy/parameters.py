@@ -4,8 +4,8 @@ This module defines a base class for auto-hyperoptable strategies.
 """
 import logging
 from abc import ABC, abstractmethod
-from contextlib import suppress
-from typing import Any, Optional, Sequence, Union
+from contextlib import contextmanager, suppress
+from typing import Any, Iterator, List, Optional, Sequence, Set, Union
 
 from freqtrade.enums import HyperoptState
 from freqtrade.optimize.hyperopt_tools import HyperoptStateContainer
@@ -20,6 +20,23 @@ from freqtrade.exceptions import OperationalException
 
 logger = logging.getLogger(__name__)
 
+# Active recorders of record_parameter_reads()
+_read_recorders: List[Set['BaseParameter']] = []
+
+
+@contextmanager
+def record_parameter_reads() -> Iterator[Set['BaseParameter']]:
+    """
+    Record all parameters whose value is read within this context.
+    Used by hyperopt to find out which parameters indicators depend on.
+    """
+    reads: Set[BaseParameter] = set()
+    _read_recorders.append(reads)
+    try:
+        yield reads
+    finally:
+        _read_recorders.remove(reads)
+
 
 class BaseParameter(ABC):
     """
@@ -27,7 +44,6 @@ class BaseParameter(ABC):
     """
     category: Optional[str]
     default: Any
-    value: Any
     in_space: bool = False
     name: str
 
@@ -54,6 +70,16 @@ class BaseParameter(ABC):
     def __repr__(self):
         return f'{self.__class__.__name__}({self.value})'
 
+    @property
+    def value(self) -> Any:
+        for reads in _read_recorders:
+            reads.add(self)
+        return self._value
+
+    @value.setter
+    def value(self, value: Any) -> None:
+        self._value = value
+
     @abstractmethod
     def get_space(self, name: str) -> Union['Integer', 'Real', 'SKDecimal', 'Categorical']:
         """
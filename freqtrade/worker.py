@@ -4,22 +4,30 @@ Main Freqtrade worker class.
 import logging
 import time
 import traceback
+from datetime import timedelta
 from os import getpid
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Set
 
 import sdnotify
 
 from freqtrade import __version__
 from freqtrade.configuration import Configuration
-from freqtrade.constants import PROCESS_THROTTLE_SECS, RETRY_TIMEOUT, Config
+from freqtrade.constants import (MAINTENANCE_INTERVAL_SECS, PROCESS_THROTTLE_SECS, RETRY_TIMEOUT,
+                                 Config)
 from freqtrade.enums import RPCMessageType, State
 from freqtrade.exceptions import OperationalException, TemporaryError
-from freqtrade.exchange import timeframe_to_next_date
+from freqtrade.exchange import timeframe_to_next_date, timeframe_to_prev_date, timeframe_to_seconds
 from freqtrade.freqtradebot import FreqtradeBot
 
 
 logger = logging.getLogger(__name__)
 
+# Initial delay after candle close before candles are refreshed - adapted to the exchange
+CANDLE_CLOSE_OFFSET = 1.0  # sec
+CANDLE_CLOSE_MIN_OFFSET = 0.1  # sec
+# Delay before retrying if the closed candle was not yet available
+CANDLE_CLOSE_RETRY = 0.5  # sec
+
 
 class Worker:
     """
@@ -56,6 +64,8 @@ class Worker:
         self._throttle_secs = internals_config.get('process_throttle_secs',
                                                    PROCESS_THROTTLE_SECS)
         self._heartbeat_interval = internals_config.get('heartbeat_interval', 60)
+        self._candle_scheduler = internals_config.get('candle_scheduler', False)
+        self._reset_schedule()
 
         self._sd_notify = sdnotify.SystemdNotifier() if \
             self._config.get('internals', {}).get('sd_notify', False) else None
@@ -94,6 +104,7 @@ class Worker:
                 f"Changing state{f' from {old_state.name}' if old_state else ''} to: {state.name}")
             if state == State.RUNNING:
                 self.freqtrade.startup()
+                self._reset_schedule()
 
             if state == State.STOPPED:
                 self.freqtrade.check_for_open_trades()
@@ -112,10 +123,13 @@ class Worker:
             # Ping systemd watchdog before throttling
             self._notify("WATCHDOG=1\nSTATUS=State: RUNNING.")
 
-            # Use an offset of 1s to ensure a new candle has been issued
-            self._throttle(func=self._process_running, throttle_secs=self._throttle_secs,
-                           timeframe=self._config['timeframe'] if self._config else None,
-                           timeframe_offset=1)
+            if self._candle_scheduler:
+                self._process_scheduled()
+            else:
+                # Use an offset of 1s to ensure a new candle has been issued
+                self._throttle(func=self._process_running, throttle_secs=self._throttle_secs,
+                               timeframe=self._config['timeframe'] if self._config else None,
+                               timeframe_offset=1)
 
         if self._heartbeat_interval:
             now = time.time()
@@ -175,9 +189,104 @@ class Worker:
     def _process_stopped(self) -> None:
         self.freqtrade.process_stopped()
 
-    def _process_running(self) -> None:
+    def _reset_schedule(self) -> None:
+        """
+        Run all tasks of the candle-close scheduler right away.
+        """
+        self._next_maintenance = 0.0
+        self._next_candle_task = 0.0
+        self._candle_offset = CANDLE_CLOSE_OFFSET
+        self._candle_retry = False
+        # Pairs which were still late when giving up on the previous candle
+        self._late_pairs: Set[str] = set()
+        # Late pairs refreshed again on retry
+        self._waiting_for: Set[str] = set()
+
+    def _process_scheduled(self) -> None:
+        """
+        One iteration of the candle-close scheduler (`internals.candle_scheduler`).
+        Candles are refreshed and analyzed as soon as the exchange has the closed candle,
+        markets and the whitelist are refreshed every MAINTENANCE_INTERVAL_SECS (and before
+        refreshing candles). Orders and trades are handled every `process_throttle_secs`.
+        """
+        logger.debug("========================================")
+        if time.time() >= self._next_candle_task and not self._candle_retry:
+            self._next_maintenance = 0.0
+        if time.time() >= self._next_maintenance:
+            self._process_running(self.freqtrade.process_maintenance)
+            self._next_maintenance = time.time() + MAINTENANCE_INTERVAL_SECS
+
+        if time.time() >= self._next_candle_task:
+            self._process_candle_close()
+        else:
+            self._process_running(self.freqtrade.process_trades)
+
+        sleep_duration = max(min(self._next_candle_task, self._next_maintenance,
+                                 time.time() + self._throttle_secs) - time.time(), 0.0)
+        logger.debug(f"Candle-close scheduler: sleep for {sleep_duration:.2f} s.")
+        self._sleep(sleep_duration)
+
+    def _process_candle_close(self) -> None:
+        """
+        Refresh and analyze candles, then handle trades.
+        Retries shortly (refreshing only the late pairs) if the closed candle was not yet
+        available, and adapts the delay after candle close to the latency observed.
+        Trades are handled once the candle is available, or waiting for it was given up.
+        Pairs which were late for the previous candle are not waited for, so a single
+        illiquid pair doesn't delay every candle.
+        """
+        timeframe = self.freqtrade.strategy.timeframe
+        candle_close = timeframe_to_prev_date(timeframe)
+        # Latency of the exchange - at most the time candles were refreshed at
+        latency = time.time() - candle_close.timestamp()
+        if self._candle_retry:
+            late = sorted(self._waiting_for)
+            self._process_running(lambda: self.freqtrade.process_late_candles(late))
+        else:
+            self._process_running(self.freqtrade.process_candles)
+
+        # Give up waiting for late candles after a quarter of the timeframe (30s at most)
+        max_latency = min(timeframe_to_seconds(timeframe) / 4, 30)
+        closed_candle = candle_close - timedelta(seconds=timeframe_to_seconds(timeframe))
+        late_pairs = set(self.freqtrade.late_pairs(closed_candle))
+        waiting_for = late_pairs - self._late_pairs
+        if not waiting_for:
+            if late_pairs:
+                logger.debug(f"Not waiting for late pairs {', '.join(sorted(late_pairs))}.")
+            if latency < max_latency:
+                if self._candle_retry:
+                    # The candle became available since the previous attempt
+                    self._candle_offset = latency
+                else:
+                    # Available on the first attempt - try earlier next time
+                    self._candle_offset = max(self._candle_offset * 0.9, CANDLE_CLOSE_MIN_OFFSET)
+        elif time.time() - candle_close.timestamp() < max_latency:
+            logger.debug(f"Candle closed at {candle_close} not yet available for "
+                         f"{', '.join(sorted(waiting_for))}, retrying.")
+            self._candle_retry = True
+            self._waiting_for = waiting_for
+            self._next_candle_task = time.time() + CANDLE_CLOSE_RETRY
+            return
+        else:
+            logger.info(f"Candle closed at {candle_close} not available for "
+                        f"{', '.join(sorted(waiting_for))} "
+                        f"after {time.time() - candle_close.timestamp():.1f} s.")
+        self._late_pairs = late_pairs
+        self._candle_retry = False
+        self._waiting_for = set()
+        self._process_running(self.freqtrade.process_trades)
+        self._next_candle_task = (timeframe_to_next_date(timeframe).timestamp()
+                                  + self._candle_offset)
+
+    def _process_running(self, func: Optional[Callable[[], None]] = None) -> None:
+        """
+        Run one iteration of the bot (or func) - handling errors.
+        """
         try:
-            self.freqtrade.process()
+            if func is None:
+                self.freqtrade.process()
+            else:
+                func()
         except TemporaryError as error:
             logger.warning(f"Error: {error}, retrying in {RETRY_TIMEOUT} seconds...")
             time.sleep(RETRY_TIMEOUT)
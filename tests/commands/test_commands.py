@@ -1,5 +1,6 @@
 import json
 import re
+import shutil
 from datetime import datetime, timedelta
 from io import BytesIO
 from pathlib import Path
@@ -22,6 +23,7 @@ from freqtrade.commands.list_commands import start_list_freqAI_models
 from freqtrade.configuration import setup_utils_configuration
 from freqtrade.enums import RunMode
 from freqtrade.exceptions import OperationalException
+from freqtrade.optimize.hyperopt_tools import HyperoptResultsStore
 from freqtrade.persistence.models import init_db
 from freqtrade.persistence.pairlock_middleware import PairLocks
 from freqtrade.util import dt_floor_day, dt_now, dt_utc
@@ -1010,20 +1012,22 @@ def test_start_test_pairlist(mocker, caplog, tickers, default_conf, capsys):
         pytest.fail(f'Expected well formed JSON, but failed to parse: {captured.out}')
 
 
-def test_hyperopt_list(mocker, capsys, caplog, saved_hyperopt_results, tmpdir):
-    csv_file = Path(tmpdir) / "test.csv"
-    mocker.patch(
-        'freqtrade.optimize.hyperopt_tools.HyperoptTools._test_hyperopt_results_exist',
-        return_value=True
-    )
+def save_hyperopt_results(mocker, epochs, tmpdir) -> Path:
+    results_file = Path(tmpdir) / 'hyperopt_results.fthypt'
+    store = HyperoptResultsStore(results_file)
+    for epoch in epochs:
+        # Hyperopt stores roi keys as strings
+        params_details = {space: {str(k): v for k, v in params.items()}
+                          for space, params in epoch['params_details'].items()}
+        store.append({**epoch, 'params_details': params_details})
+    mocker.patch('freqtrade.commands.hyperopt_commands.get_latest_hyperopt_file',
+                 return_value=results_file)
+    return results_file
 
-    def fake_iterator(*args, **kwargs):
-        yield from [saved_hyperopt_results]
 
-    mocker.patch(
-        'freqtrade.optimize.hyperopt_tools.HyperoptTools._read_results',
-        side_effect=fake_iterator
-    )
+def test_hyperopt_list(mocker, capsys, caplog, saved_hyperopt_results, tmpdir):
+    csv_file = Path(tmpdir) / "test.csv"
+    save_hyperopt_results(mocker, saved_hyperopt_results, tmpdir)
 
     args = [
         "hyperopt-list",
@@ -1249,23 +1253,14 @@ def test_hyperopt_list(mocker, capsys, caplog, saved_hyperopt_results, tmpdir):
     assert csv_file.is_file()
     line = csv_file.read_text()
     assert ('Best,1,2,-1.25%,-1.2222,-0.00125625,,-2.51,"3,930.0 m",0.43662' in line
-            or "Best,1,2,-1.25%,-1.2222,-0.00125625,,-2.51,2 days 17:30:00,2,0,0.43662" in line)
+            or "Best,1,2,-1.25%,-1.2222,-0.00125625,,-2.51,2 days 17:30:00,2,0,0.43662" in line
+            # Durations are stored as string in the results file
+            or 'Best,1,2,-1.25%,-1.2222,-0.00125625,,-2.51,"2 days, 17:30:00",2,0,0.43662' in line)
     csv_file.unlink()
 
 
-def test_hyperopt_show(mocker, capsys, saved_hyperopt_results):
-    mocker.patch(
-        'freqtrade.optimize.hyperopt_tools.HyperoptTools._test_hyperopt_results_exist',
-        return_value=True
-    )
-
-    def fake_iterator(*args, **kwargs):
-        yield from [saved_hyperopt_results]
-
-    mocker.patch(
-        'freqtrade.optimize.hyperopt_tools.HyperoptTools._read_results',
-        side_effect=fake_iterator
-    )
+def test_hyperopt_show(mocker, capsys, saved_hyperopt_results, tmpdir):
+    save_hyperopt_results(mocker, saved_hyperopt_results, tmpdir)
     mocker.patch('freqtrade.commands.hyperopt_commands.show_backtest_result')
 
     args = [
@@ -1386,7 +1381,7 @@ def test_convert_data_trades(mocker, testdatadir):
     assert trades_mock.call_args[1]['erase'] is False
 
 
-def test_start_list_data(testdatadir, capsys):
+def test_start_list_data(mocker, testdatadir, tmp_path, capsys):
     args = [
         "list-data",
         "--datadir",
@@ -1433,11 +1428,14 @@ def test_start_list_data(testdatadir, capsys):
     assert "\n|      XRP/USDT:USDT |      5m, 1h |      futures |\n" in captured.out
     assert "\n|      XRP/USDT:USDT |      1h, 8h |         mark |\n" in captured.out
 
+    # --show-timerange creates the ohlcv catalog - so use a copy of the data.
+    for file in ('XRP_ETH-1m.feather', 'XRP_ETH-5m.feather'):
+        shutil.copy(testdatadir / file, tmp_path / file)
     args = [
         "list-data",
         "--pairs", "XRP/ETH",
         "--datadir",
-        str(testdatadir),
+        str(tmp_path),
         "--show-timerange",
     ]
     pargs = get_args(args)
@@ -1451,6 +1449,14 @@ def test_start_list_data(testdatadir, capsys):
     assert (
             "\n| XRP/ETH |          1m |   spot | 2019-10-11 00:00:00 | 2019-10-13 11:19:00 |\n"
             in captured.out)
+    assert (tmp_path / '.ohlcv-catalog.json').is_file()
+
+    # Second run is served from the catalog
+    load_mock = mocker.patch(
+        'freqtrade.data.history.featherdatahandler.FeatherDataHandler._ohlcv_load')
+    start_list_data(pargs)
+    assert load_mock.call_count == 0
+    assert captured.out == capsys.readouterr().out
 
 
 @pytest.mark.usefixtures("init_persistence")
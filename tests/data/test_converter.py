@@ -6,15 +6,17 @@ from shutil import copyfile
 import numpy as np
 import pandas as pd
 import pytest
+from pandas.testing import assert_frame_equal
 
 from freqtrade.configuration.timerange import TimeRange
 from freqtrade.data.converter import (convert_ohlcv_format, convert_trades_format,
                                       ohlcv_fill_up_missing_data, ohlcv_to_dataframe,
-                                      reduce_dataframe_footprint, trades_df_remove_duplicates,
+                                      reduce_dataframe_footprint, resample_ohlcv,
+                                      trades_chunks_to_ohlcv, trades_df_remove_duplicates,
                                       trades_dict_to_list, trades_to_ohlcv, trim_dataframe)
 from freqtrade.data.history import (get_timerange, load_data, load_pair_history,
                                     validate_backtest_data)
-from freqtrade.data.history.idatahandler import IDataHandler
+from freqtrade.data.history.idatahandler import IDataHandler, get_datahandler
 from freqtrade.enums import CandleType
 from tests.conftest import generate_test_data, log_has, log_has_re
 from tests.data.test_history import _clean_test_file
@@ -52,6 +54,48 @@ def test_trades_to_ohlcv(trades_history_df, caplog):
     assert df.loc[:, 'low'][0] == 0.019626
 
 
+def test_trades_chunks_to_ohlcv(testdatadir):
+    trades = get_datahandler(testdatadir, 'feather').trades_load('XRP/ETH')
+    timeframes = ['1m', '5m', '1h', '1w']
+    # Split between trades of the same candle
+    chunks = [trades.iloc[:1000], trades.iloc[1000:1001], trades.iloc[1001:1001],
+              trades.iloc[1001:7777], trades.iloc[7777:]]
+
+    result = trades_chunks_to_ohlcv(chunks, timeframes)
+    assert list(result) == timeframes
+    for timeframe in timeframes:
+        assert_frame_equal(result[timeframe], trades_to_ohlcv(trades, timeframe))
+
+    with pytest.raises(ValueError, match="Trade-list empty."):
+        trades_chunks_to_ohlcv([trades.iloc[:0]], timeframes)
+
+
+def test_resample_ohlcv():
+    data = generate_test_data('5m', 100, '2022-01-01 00:10')
+
+    df = resample_ohlcv(data, '5m', '1h')
+    assert list(df.columns) == ['date', 'open', 'high', 'low', 'close', 'volume']
+    # First and last hour are incomplete
+    assert len(df) == 7
+    assert df['date'].iloc[0] == pd.Timestamp('2022-01-01 01:00', tz='UTC')
+    assert df['date'].iloc[-1] == pd.Timestamp('2022-01-01 07:00', tz='UTC')
+
+    hour = data.loc[(data['date'] >= df['date'].iloc[0])
+                    & (data['date'] < df['date'].iloc[0] + pd.Timedelta(hours=1))]
+    assert len(hour) == 12
+    assert df['open'].iloc[0] == hour['open'].iloc[0]
+    assert df['high'].iloc[0] == hour['high'].max()
+    assert df['low'].iloc[0] == hour['low'].min()
+    assert df['close'].iloc[0] == hour['close'].iloc[-1]
+    assert df['volume'].iloc[0] == pytest.approx(hour['volume'].sum())
+
+    # Last hour becomes complete with its last 5m candle
+    assert len(resample_ohlcv(data.iloc[:-1], '5m', '1h')) == 7
+    assert len(resample_ohlcv(generate_test_data('5m', 96, '2022-01-01'), '5m', '1h')) == 8
+    assert len(resample_ohlcv(generate_test_data('5m', 96, '2022-01-01'), '5m', '4h')) == 2
+    assert resample_ohlcv(data.iloc[:0], '5m', '1h').empty
+
+
 def test_ohlcv_fill_up_missing_data(testdatadir, caplog):
     data = load_pair_history(datadir=testdatadir,
                              timeframe='1m',
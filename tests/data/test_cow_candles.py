@@ -0,0 +1,33 @@
+import pickle
+
+from freqtrade.data.cow_candles import CopyOnWriteCandles
+from tests.conftest import generate_test_data
+
+
+def test_cow_candles():
+    data = generate_test_data('5m', 100, '2022-01-01')
+    store = CopyOnWriteCandles()
+    assert 'a' not in store
+    store.add('a', data)
+    store.add('empty', data.iloc[:0])
+    assert 'a' in store
+
+    assert (store.dates('a') == data['date'].values.view('int64')).all()
+    assert not store.dates('a').flags.writeable
+
+    df = store.get('a', 50)
+    assert df.equals(data.iloc[:50])
+    assert store.get('a', 0).equals(data.iloc[:0])
+    assert store.get('empty', 0).equals(data.iloc[:0])
+
+    df.loc[df.index[0], 'close'] = 0
+    df.loc[df.index[1], 'date'] = data['date'].iloc[5]
+    assert df.loc[df.index[0], 'close'] == 0
+    assert df.loc[df.index[1], 'date'] == data['date'].iloc[5]
+    assert store.get('a', 100).equals(data)
+
+    # The temporary file is not pickled
+    store = pickle.loads(pickle.dumps(store))
+    assert 'a' not in store
+    store.add('a', data)
+    assert store.get('a', 100).equals(data)
@@ -6,11 +6,12 @@ from pathlib import Path
 from unittest.mock import MagicMock
 
 import pytest
-from pandas import DataFrame, Timestamp
+from pandas import DataFrame, Timestamp, concat
 from pandas.testing import assert_frame_equal
 
 from freqtrade.configuration import TimeRange
 from freqtrade.constants import AVAILABLE_DATAHANDLERS
+from freqtrade.data.converter import trim_dataframe
 from freqtrade.data.history.featherdatahandler import FeatherDataHandler
 from freqtrade.data.history.hdf5datahandler import HDF5DataHandler
 from freqtrade.data.history.idatahandler import IDataHandler, get_datahandler, get_datahandlerclass
@@ -162,6 +163,91 @@ def test_datahandler_ohlcv_data_min_max(testdatadir):
     assert min_max[0] == min_max[1]
 
 
+@pytest.mark.parametrize('datahandler', ['json', 'feather', 'hdf5'])
+def test_datahandler_ohlcv_catalog(mocker, testdatadir, tmp_path, datahandler):
+    # Data goes from 2018-01-10 - 2018-01-30
+    ohlcv = get_datahandler(testdatadir, 'feather')._ohlcv_load(
+        'UNITTEST/BTC', '5m', None, candle_type='spot')
+    # Remove 3 candles
+    ohlcv = ohlcv.drop(index=[10, 11, 12]).reset_index(drop=True)
+
+    dh = get_datahandler(tmp_path, datahandler)
+    dh.ohlcv_store('UNITTEST/BTC', '5m', ohlcv, candle_type='spot')
+    assert dh.catalog.filename.is_file()
+
+    # New handler - catalog is loaded from disk
+    dh = get_datahandler(tmp_path, datahandler)
+    load_mock = mocker.spy(dh, '_ohlcv_load')
+    info = dh.ohlcv_data_info('UNITTEST/BTC', '5m', 'spot')
+    assert info['rows'] == len(ohlcv)
+    assert info['start'] == ohlcv.iloc[0]['date'].value // 10**6
+    assert info['end'] == ohlcv.iloc[-1]['date'].value // 10**6
+    assert info['gaps'] == [[ohlcv.iloc[9]['date'].value // 10**6 + 300_000,
+                             ohlcv.iloc[10]['date'].value // 10**6 - 300_000]]
+    assert len(info['checksum']) == 64
+    assert dh.ohlcv_data_min_max('UNITTEST/BTC', '5m', 'spot') == (
+        ohlcv.iloc[0]['date'].to_pydatetime(), ohlcv.iloc[-1]['date'].to_pydatetime())
+    assert load_mock.call_count == 0
+
+    # Files changed outside of freqtrade are loaded again
+    dh._ohlcv_store('UNITTEST/BTC', '5m', ohlcv.iloc[:100], candle_type='spot')
+    info = dh.ohlcv_data_info('UNITTEST/BTC', '5m', 'spot')
+    assert load_mock.call_count == 1
+    assert info['rows'] == 100
+    assert dh.ohlcv_data_info('UNITTEST/BTC', '5m', 'spot') == info
+    assert load_mock.call_count == 1
+
+    assert dh.ohlcv_data_info('UNITTEST/BTC', '1h', 'spot') is None
+
+    assert dh.ohlcv_purge('UNITTEST/BTC', '5m', 'spot')
+    assert dh.ohlcv_data_info('UNITTEST/BTC', '5m', 'spot') is None
+    assert get_datahandler(tmp_path, datahandler).catalog._read() == {}
+
+
+def test_ohlcv_catalog_deferred_save(mocker, testdatadir, tmp_path):
+    ohlcv = get_datahandler(testdatadir, 'feather')._ohlcv_load(
+        'UNITTEST/BTC', '5m', None, candle_type='spot')
+    dh = get_datahandler(tmp_path, 'feather')
+    save_mock = mocker.spy(dh.catalog, '_save')
+    mocker.patch('freqtrade.data.history.ohlcv_catalog.CATALOG_SAVE_BATCH', 3)
+    pairs = [f'PAIR{idx}/BTC' for idx in range(5)]
+
+    with dh.catalog.deferred_save():
+        for pair in pairs:
+            dh.ohlcv_store(pair, '5m', ohlcv, candle_type='spot')
+        # Saved once the batch is full
+        assert save_mock.call_count == 1
+        assert len(get_datahandler(tmp_path, 'feather').catalog._read()) == 3
+        # Pending changes are served
+        assert dh.ohlcv_data_info(pairs[-1], '5m', 'spot')['rows'] == len(ohlcv)
+    assert save_mock.call_count == 2
+    assert len(get_datahandler(tmp_path, 'feather').catalog._read()) == 5
+
+    dh.ohlcv_purge(pairs[0], '5m', 'spot')
+    assert save_mock.call_count == 3
+
+
+def test_ohlcv_catalog_save_readonly(mocker, testdatadir, tmp_path, caplog):
+    ohlcv = get_datahandler(testdatadir, 'feather')._ohlcv_load(
+        'UNITTEST/BTC', '5m', None, candle_type='spot')
+    dh = get_datahandler(tmp_path, 'feather')
+    dh._ohlcv_store('UNITTEST/BTC', '5m', ohlcv, candle_type='spot')
+    mocker.patch('freqtrade.data.history.ohlcv_catalog.tempfile.mkstemp',
+                 side_effect=PermissionError('Read-only file system'))
+    load_mock = mocker.spy(dh, '_ohlcv_load')
+
+    info = dh.ohlcv_data_info('UNITTEST/BTC', '5m', 'spot')
+    dh.catalog.save()
+    assert log_has_re(r"Could not write ohlcv catalog .*Read-only file system", caplog)
+    assert not dh.catalog.filename.exists()
+    assert list(tmp_path.iterdir()) == [dh._pair_data_filename(
+        tmp_path, 'UNITTEST/BTC', '5m', CandleType.SPOT)]
+    # Served from memory
+    assert dh.ohlcv_data_info('UNITTEST/BTC', '5m', 'spot') == info
+    assert info['rows'] == len(ohlcv)
+    assert load_mock.call_count == 1
+
+
 def test_datahandler__check_empty_df(testdatadir, caplog):
     dh = JsonDataHandler(testdatadir)
     expected_text = r"Price jump in UNITTEST/USDT, 1h, spot between"
@@ -264,12 +350,60 @@ def test_jsondatahandler_trades_load(testdatadir, caplog):
 
 
 @pytest.mark.parametrize('datahandler', AVAILABLE_DATAHANDLERS)
-def test_datahandler_ohlcv_append(datahandler, testdatadir, ):
-    dh = get_datahandler(testdatadir, datahandler)
-    with pytest.raises(NotImplementedError):
-        dh.ohlcv_append('UNITTEST/ETH', '5m', DataFrame(), CandleType.SPOT)
-    with pytest.raises(NotImplementedError):
-        dh.ohlcv_append('UNITTEST/ETH', '5m', DataFrame(), CandleType.MARK)
+def test_datahandler_ohlcv_append(mocker, datahandler, testdatadir, tmp_path):
+    mocker.patch('freqtrade.data.history.idatahandler.OHLCV_MAX_SEGMENTS', 2)
+    # Data goes from 2018-01-10 - 2018-01-30
+    ohlcv = get_datahandler(testdatadir, 'feather')._ohlcv_load(
+        'UNITTEST/BTC', '5m', None, candle_type='spot')
+    dh = get_datahandler(tmp_path, datahandler)
+    filename = dh._pair_data_filename(tmp_path, 'UNITTEST/BTC', '5m', CandleType.SPOT)
+
+    # No data yet - data is stored
+    dh.ohlcv_append('UNITTEST/BTC', '5m', ohlcv.iloc[:3000], CandleType.SPOT)
+    assert filename.is_file()
+    assert dh._ohlcv_segments(filename) == []
+
+    # Overlapping candles are ignored
+    store_mock = mocker.spy(dh, '_ohlcv_store')
+    dh.ohlcv_append('UNITTEST/BTC', '5m', ohlcv.iloc[2990:4000], CandleType.SPOT)
+    dh.ohlcv_append('UNITTEST/BTC', '5m', ohlcv.iloc[3500:3600], CandleType.SPOT)
+    assert store_mock.call_count == 0
+    assert len(dh._ohlcv_segments(filename)) == (0 if datahandler == 'hdf5' else 1)
+    loaded = dh.ohlcv_load('UNITTEST/BTC', '5m', CandleType.SPOT, fill_missing=False)
+    assert_frame_equal(loaded, ohlcv.iloc[:4000], check_dtype=False)
+
+    timerange = TimeRange.parse_timerange('20180119-20180125')
+    loaded = dh.ohlcv_load('UNITTEST/BTC', '5m', CandleType.SPOT, timerange=timerange)
+    assert_frame_equal(loaded.reset_index(drop=True),
+                       trim_dataframe(ohlcv.iloc[:4000], timerange).reset_index(drop=True),
+                       check_dtype=False)
+
+    # Catalog is updated without loading the data
+    load_mock = mocker.spy(dh, '_ohlcv_load')
+    info = dh.ohlcv_data_info('UNITTEST/BTC', '5m', CandleType.SPOT)
+    assert info['rows'] == 4000
+    assert info['end'] == ohlcv.iloc[3999]['date'].value // 10**6
+    assert load_mock.call_count == 0
+    # Reading the catalog from disk returns the same
+    dh1 = get_datahandler(tmp_path, datahandler)
+    assert dh1.ohlcv_data_info('UNITTEST/BTC', '5m', CandleType.SPOT) == info
+
+    dh.ohlcv_append('UNITTEST/BTC', '5m', ohlcv.iloc[4000:4500], CandleType.SPOT)
+    assert store_mock.call_count == 0
+    assert len(dh._ohlcv_segments(filename)) == (0 if datahandler == 'hdf5' else 2)
+
+    # Segments are merged into the data file
+    dh.ohlcv_append('UNITTEST/BTC', '5m', ohlcv.iloc[4500:], CandleType.SPOT)
+    assert store_mock.call_count == (0 if datahandler == 'hdf5' else 1)
+    assert dh._ohlcv_segments(filename) == []
+    assert not dh._ohlcv_segment_dir(filename).exists()
+    assert dh.ohlcv_data_info('UNITTEST/BTC', '5m', CandleType.SPOT)['rows'] == len(ohlcv)
+    assert load_mock.call_count == (0 if datahandler == 'hdf5' else 1)
+    loaded = dh.ohlcv_load('UNITTEST/BTC', '5m', CandleType.SPOT, fill_missing=False)
+    assert_frame_equal(loaded, ohlcv, check_dtype=False)
+
+    assert dh.ohlcv_purge('UNITTEST/BTC', '5m', CandleType.SPOT)
+    assert not filename.exists()
 
 
 @pytest.mark.parametrize('datahandler', AVAILABLE_DATAHANDLERS)
@@ -430,6 +564,65 @@ def test_generic_datahandler_ohlcv_load_and_resave(
     assert ohlcv.empty
 
 
+@pytest.mark.parametrize('datahandler', ['json', 'jsongz', 'feather', 'parquet'])
+def test_datahandler_ohlcv_load_timerange(mocker, testdatadir, tmp_path, datahandler):
+    # Split the file into multiple batches / row groups
+    mocker.patch('freqtrade.data.history.featherdatahandler.BATCH_SIZE', 500)
+    mocker.patch('freqtrade.data.history.parquetdatahandler.ROW_GROUP_SIZE', 500)
+    # Data goes from 2018-01-10 - 2018-01-30
+    ohlcv = get_datahandler(testdatadir, 'feather')._ohlcv_load(
+        'UNITTEST/BTC', '5m', None, candle_type='spot')
+    dh = get_datahandler(tmp_path, datahandler)
+    dh.ohlcv_store('UNITTEST/BTC', '5m', ohlcv, candle_type='spot')
+
+    for timerange_str, expected_len in [
+        ('20180115-20180119', 1153),
+        ('20180120-', 2939),
+        ('-20180111', 230),
+        ('20100101-20100102', 0),
+    ]:
+        timerange = TimeRange.parse_timerange(timerange_str)
+        loaded = dh._ohlcv_load('UNITTEST/BTC', '5m', timerange, candle_type='spot')
+        # Only the required part of the file is read
+        assert len(loaded) < len(ohlcv)
+        loaded = trim_dataframe(loaded, timerange).reset_index(drop=True)
+        assert len(loaded) == expected_len
+        assert_frame_equal(loaded, trim_dataframe(ohlcv, timerange).reset_index(drop=True),
+                           check_index_type=expected_len > 0)
+
+
+@pytest.mark.parametrize('unit', ['s', 'ms', 'us', 'ns'])
+def test_featherdatahandler_ohlcv_load_timerange_resolution(mocker, testdatadir, tmp_path, unit):
+    mocker.patch('freqtrade.data.history.featherdatahandler.BATCH_SIZE', 500)
+    ohlcv = get_datahandler(testdatadir, 'feather')._ohlcv_load(
+        'UNITTEST/BTC', '5m', None, candle_type='spot')
+    dh = get_datahandler(tmp_path, 'feather')
+    # Files written by other tools keep the resolution of their date column
+    filename = dh._pair_data_filename(tmp_path, 'UNITTEST/BTC', '5m', CandleType.SPOT)
+    ohlcv.assign(date=ohlcv['date'].dt.as_unit(unit)).to_feather(filename, chunksize=500)
+
+    timerange = TimeRange.parse_timerange('20180115-20180119')
+    loaded = dh._ohlcv_load('UNITTEST/BTC', '5m', timerange, candle_type='spot')
+    assert len(loaded) < len(ohlcv)
+    loaded = trim_dataframe(loaded, timerange).reset_index(drop=True)
+    assert len(loaded) == 1153
+    assert_frame_equal(loaded, trim_dataframe(ohlcv, timerange).reset_index(drop=True))
+
+
+@pytest.mark.parametrize('datahandler', ['jsongz', 'feather', 'parquet'])
+def test_datahandler_trades_load_timerange(testdatadir, datahandler):
+    # data goes from 2019-10-11 - 2019-10-13
+    timerange = TimeRange.parse_timerange('20191011-20191012')
+    expected = get_datahandler(testdatadir, 'hdf5')._trades_load('XRP/ETH', timerange)
+
+    trades = get_datahandler(testdatadir, datahandler)._trades_load('XRP/ETH', timerange)
+    assert len(trades) == len(expected)
+    assert trades['timestamp'].tolist() == expected['timestamp'].tolist()
+    assert trades['id'].tolist() == expected['id'].tolist()
+    assert trades['timestamp'].min() >= timerange.startts * 1000
+    assert trades['timestamp'].max() < timerange.stopts * 1000
+
+
 def test_hdf5datahandler_ohlcv_purge(mocker, testdatadir):
     mocker.patch.object(Path, "exists", MagicMock(return_value=False))
     unlinkmock = mocker.patch.object(Path, "unlink", MagicMock())
@@ -458,6 +651,34 @@ def test_datahandler_trades_load(testdatadir, datahandler):
     assert trades1.empty
 
 
+@pytest.mark.parametrize('datahandler', ['jsongz', 'hdf5', 'feather', 'parquet'])
+def test_datahandler_trades_load_chunks(mocker, testdatadir, tmpdir, datahandler):
+    dh = get_datahandler(testdatadir, datahandler)
+    trades = dh.trades_load('XRP/ETH')
+    # Store with small batches / row groups, so files are read in multiple parts
+    dh1 = get_datahandler(Path(tmpdir), datahandler)
+    mocker.patch('freqtrade.data.history.featherdatahandler.BATCH_SIZE', 50)
+    mocker.patch('freqtrade.data.history.parquetdatahandler.ROW_GROUP_SIZE', 50)
+    dh1.trades_store('XRP/ETH', trades)
+
+    chunks = list(dh1.trades_load_chunks('XRP/ETH', chunk_size=100))
+    assert len(chunks) > 1
+    for chunk, next_chunk in zip(chunks, chunks[1:]):
+        # Trades of one timestamp are never split between chunks
+        assert chunk['timestamp'].iloc[-1] < next_chunk['timestamp'].iloc[0]
+    assert_frame_equal(concat(chunks, ignore_index=True), trades.reset_index(drop=True),
+                       check_exact=True)
+
+    assert list(dh1.trades_load_chunks('UNITTEST/NONEXIST')) == []
+
+
+def test_jsondatahandler_trades_load_chunks_old_format(testdatadir, caplog):
+    dh = JsonGzDataHandler(testdatadir)
+    chunks = list(dh.trades_load_chunks('XRP/OLD', chunk_size=100))
+    assert log_has('Old trades format detected - converting', caplog)
+    assert_frame_equal(concat(chunks), dh.trades_load('XRP/OLD'))
+
+
 @pytest.mark.parametrize('datahandler', ['jsongz', 'hdf5', 'feather', 'parquet'])
 def test_datahandler_trades_store(testdatadir, tmpdir, datahandler):
     tmpdir1 = Path(tmpdir)
@@ -1,12 +1,18 @@
-from datetime import datetime, timezone
+import sys
+from datetime import datetime, timedelta, timezone
+from threading import Event
 from unittest.mock import MagicMock
 
+import psutil
 import pytest
 from pandas import DataFrame, Timestamp
 
+from freqtrade.data.converter import resample_ohlcv
+from freqtrade.data.cow_candles import MAX_PRIVATE_MAPS
 from freqtrade.data.dataprovider import DataProvider
 from freqtrade.enums import CandleType, RunMode
 from freqtrade.exceptions import ExchangeError, OperationalException
+from freqtrade.exchange import timeframe_to_prev_date
 from freqtrade.plugins.pairlistmanager import PairListManager
 from tests.conftest import EXMS, generate_test_data, get_patched_exchange
 
@@ -61,6 +67,30 @@ def test_historic_ohlcv(mocker, default_conf, ohlcv_history):
     assert historymock.call_args_list[0][1]["timeframe"] == "5m"
 
 
+@pytest.mark.parametrize('timeframe,derived', [
+    ('1h', True),
+    ('4h', True),
+    ('5m', False),
+    ('1w', False),
+])
+def test_historic_ohlcv_derive_timeframes(mocker, default_conf, timeframe, derived):
+    default_conf['derive_timeframes'] = True
+    data = generate_test_data('5m', 600, '2022-01-01')
+    historymock = MagicMock(return_value=data)
+    mocker.patch("freqtrade.data.dataprovider.load_pair_history", historymock)
+
+    dp = DataProvider(default_conf, None)
+    res = dp.historic_ohlcv("UNITTEST/BTC", timeframe)
+    assert historymock.call_count == 1
+    if derived:
+        # Loads the strategy timeframe
+        assert historymock.call_args_list[0][1]["timeframe"] == "5m"
+        assert res.equals(resample_ohlcv(data, '5m', timeframe))
+    else:
+        assert historymock.call_args_list[0][1]["timeframe"] == timeframe
+        assert res.equals(data)
+
+
 def test_historic_ohlcv_dataformat(mocker, default_conf, ohlcv_history):
     hdf5loadmock = MagicMock(return_value=ohlcv_history)
     featherloadmock = MagicMock(return_value=ohlcv_history)
@@ -139,6 +169,72 @@ def test_get_pair_dataframe(mocker, default_conf, ohlcv_history, candle_type):
     assert len(df) == 2  # ohlcv_history is limited to 2 rows now
 
 
+def test_get_pair_dataframe_backtest_slicing(mocker, default_conf):
+    data = generate_test_data('5m', 500, '2022-01-01')
+    historymock = MagicMock(return_value=data)
+    mocker.patch("freqtrade.data.dataprovider.load_pair_history", historymock)
+    default_conf["runmode"] = RunMode.BACKTEST
+    dp = DataProvider(default_conf, None)
+
+    dp._set_dataframe_max_date(data['date'].iloc[300].to_pydatetime())
+    df = dp.get_pair_dataframe("UNITTEST/BTC", '5m')
+    assert df.equals(data.iloc[:300])
+    # Slicing again doesn't reload the data
+    df1 = dp.get_pair_dataframe("UNITTEST/BTC", '5m')
+    assert historymock.call_count == 1
+    assert df1.equals(data.iloc[:300])
+    # Data is handed out copy-on-write - in-place modifications don't affect other calls
+    df.loc[df.index[0], 'close'] = 0
+    df.iloc[1, df.columns.get_loc('open')] = 0
+    df.loc[df.index[2], 'date'] = data['date'].iloc[0]
+    assert df.loc[df.index[0], 'close'] == 0
+    assert df.loc[df.index[1], 'open'] == 0
+    df['close'] = 0.0
+    df['new_column'] = 1
+    assert df1.equals(data.iloc[:300])
+    assert dp.get_pair_dataframe("UNITTEST/BTC", '5m').equals(data.iloc[:300])
+    assert dp.historic_ohlcv("UNITTEST/BTC", '5m').equals(data)
+
+    # Cutoff is aligned to the requested timeframe
+    dp._set_dataframe_max_date(data['date'].iloc[310].to_pydatetime() + timedelta(minutes=3))
+    assert len(dp.get_pair_dataframe("UNITTEST/BTC", '5m')) == 310
+    df = dp.get_pair_dataframe("UNITTEST/BTC", '1h')
+    assert df['date'].iloc[-1] < timeframe_to_prev_date('1h', data['date'].iloc[310])
+    assert len(df) == 300
+
+    # The full history is still returned as a (writable) copy
+    dp._set_dataframe_max_date(None)
+    df = dp.get_pair_dataframe("UNITTEST/BTC", '5m')
+    assert df.equals(data)
+    df.loc[df.index[0], 'close'] = 0
+    assert dp.historic_ohlcv("UNITTEST/BTC", '5m').equals(data)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="does not run on windows")
+def test_get_pair_dataframe_backtest_slicing_fds(mocker, default_conf):
+    data = generate_test_data('5m', 500, '2022-01-01')
+    mocker.patch("freqtrade.data.dataprovider.load_pair_history", MagicMock(return_value=data))
+    default_conf["runmode"] = RunMode.BACKTEST
+    dp = DataProvider(default_conf, None)
+    dp._set_dataframe_max_date(data['date'].iloc[300].to_pydatetime())
+    process = psutil.Process()
+
+    # Dataframes kept by the strategy don't hold on to one file descriptor each
+    kept = [dp.get_pair_dataframe("UNITTEST/BTC", '5m') for _ in range(MAX_PRIVATE_MAPS)]
+    fds = process.num_fds()
+    kept += [dp.get_pair_dataframe("UNITTEST/BTC", '5m') for _ in range(500)]
+    assert process.num_fds() <= fds + 1
+    kept[-1].loc[kept[-1].index[0], 'close'] = 0
+    assert all(df.equals(data.iloc[:300]) for df in kept[:-1])
+
+    # Dataframes which are not kept don't hold file descriptors either
+    kept.clear()
+    fds = process.num_fds()
+    for _ in range(500):
+        dp.get_pair_dataframe("UNITTEST/BTC", '5m')
+    assert process.num_fds() == fds
+
+
 def test_available_pairs(mocker, default_conf, ohlcv_history):
     exchange = get_patched_exchange(mocker, default_conf)
     timeframe = default_conf["timeframe"]
@@ -253,6 +349,46 @@ def test_refresh(mocker, default_conf):
     assert refresh_mock.call_args[0][0] == pairs + pairs_non_trad
 
 
+def test_refresh_stream(mocker, default_conf):
+    timeframe = default_conf["timeframe"]
+    pairs = [("XRP/BTC", timeframe, ''), ("UNITTEST/BTC", timeframe, ''),
+             ("ETH/BTC", timeframe, '')]
+    informative = [("XRP/BTC", "1h", ''), ("UNITTEST/BTC", "1h", ''), ("BTC/USDT", "1d", '')]
+    shared = [("BTC/USDT", "1d", '')]
+    consumed = Event()
+
+    def refresh_latest_ohlcv(pair_list, on_refreshed):
+        assert set(pair_list) == set(pairs + informative)
+        for pair_tf in [pairs[1], shared[0], informative[1], informative[0]]:
+            on_refreshed(pair_tf)
+        # Consumer gets pairs while the refresh is still running
+        assert consumed.wait(5)
+        # Download of pairs[0] and pairs[2] failed, pairs[2] was refreshed twice.
+        on_refreshed(pairs[2])
+        on_refreshed(pairs[2])
+
+    refresh_mock = mocker.patch(f"{EXMS}.refresh_latest_ohlcv", side_effect=refresh_latest_ohlcv)
+    exchange = get_patched_exchange(mocker, default_conf, id="binance")
+    dp = DataProvider(default_conf, exchange)
+
+    result = []
+    for pair in dp.refresh_stream(pairs, informative, shared):
+        result.append(pair)
+        consumed.set()
+    assert refresh_mock.call_count == 1
+    # Pairs are yielded once all their own and all shared candles are refreshed.
+    # Incomplete pairs are yielded once the refresh is done.
+    assert result == ["UNITTEST/BTC", "ETH/BTC", "XRP/BTC"]
+
+    refresh_mock.side_effect = ExchangeError("Failed")
+    with pytest.raises(ExchangeError, match="Failed"):
+        list(dp.refresh_stream(pairs))
+
+    dp = DataProvider(default_conf, None)
+    with pytest.raises(OperationalException, match=r"Exchange is not available to DataProvider."):
+        list(dp.refresh_stream(pairs))
+
+
 def test_orderbook(mocker, default_conf, order_book_l2):
     api_mock = MagicMock()
     api_mock.fetch_l2_order_book = order_book_l2
@@ -1,9 +1,12 @@
 # pragma pylint: disable=missing-docstring, protected-access, C0103
 
+import asyncio
 import json
 import logging
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
+from itertools import product
 from pathlib import Path
 from shutil import copyfile
 from unittest.mock import MagicMock, PropertyMock
@@ -18,18 +21,20 @@ from freqtrade.data.converter import ohlcv_to_dataframe
 from freqtrade.data.history.history_utils import (_download_pair_history, _download_trades_history,
                                                   _load_cached_data_for_updating,
                                                   convert_trades_to_ohlcv, get_timerange, load_data,
-                                                  load_pair_history, refresh_backtest_ohlcv_data,
+                                                  load_funding_and_mark_data, load_pair_history,
+                                                  refresh_backtest_ohlcv_data,
                                                   refresh_backtest_trades_data, refresh_data,
                                                   validate_backtest_data)
 from freqtrade.data.history.idatahandler import get_datahandler
 from freqtrade.data.history.jsondatahandler import JsonDataHandler, JsonGzDataHandler
 from freqtrade.enums import CandleType
+from freqtrade.exceptions import OperationalException
 from freqtrade.exchange import timeframe_to_minutes
 from freqtrade.misc import file_dump_json
 from freqtrade.resolvers import StrategyResolver
 from freqtrade.util import dt_ts, dt_utc
-from tests.conftest import (CURRENT_TEST_STRATEGY, EXMS, get_patched_exchange, log_has, log_has_re,
-                            patch_exchange)
+from tests.conftest import (CURRENT_TEST_STRATEGY, EXMS, get_mock_coro, get_patched_exchange,
+                            log_has, log_has_re, patch_exchange)
 
 
 def _clean_test_file(file: Path) -> None:
@@ -104,6 +109,46 @@ def test_load_data_startup_candles(mocker, testdatadir) -> None:
     assert ltfmock.call_args_list[0][1]['timerange'].startts == timerange.startts - 20 * 60
 
 
+@pytest.mark.parametrize('data_format,concurrent', [('feather', True), ('hdf5', False)])
+def test_load_data_concurrent(mocker, testdatadir, data_format, concurrent) -> None:
+    pairs = ['XLM/BTC', 'UNITTEST/BTC', 'ADA/BTC', 'NOPAIR/BTC', 'ETH/BTC']
+    executor_mock = mocker.patch('freqtrade.data.history.history_utils.ThreadPoolExecutor',
+                                 wraps=ThreadPoolExecutor)
+    data = load_data(testdatadir, '5m', pairs, data_format=data_format)
+    assert executor_mock.call_count == (1 if concurrent else 0)
+    expected_pairs = ['XLM/BTC', 'UNITTEST/BTC', 'ADA/BTC', 'ETH/BTC'] if concurrent else [
+        'UNITTEST/BTC']
+    # Order of pairs is kept
+    assert list(data) == expected_pairs
+    for pair in expected_pairs:
+        assert_frame_equal(data[pair], load_pair_history(pair, '5m', testdatadir,
+                                                         data_format=data_format))
+
+
+def test_load_funding_and_mark_data(mocker, testdatadir) -> None:
+    pairs = ['XRP/USDT:USDT', 'NOPAIR/USDT:USDT']
+    executor_mock = mocker.patch('freqtrade.data.history.history_utils.ThreadPoolExecutor',
+                                 wraps=ThreadPoolExecutor)
+    funding_rates, mark_rates = load_funding_and_mark_data(
+        testdatadir, '8h', pairs, mark_candle_type=CandleType.MARK, fail_without_data=True)
+    # Both candle types are loaded in one batch
+    assert executor_mock.call_count == 1
+
+    expected_funding = load_data(testdatadir, '8h', pairs, candle_type=CandleType.FUNDING_RATE)
+    expected_mark = load_data(testdatadir, '8h', pairs, candle_type=CandleType.MARK)
+    assert list(funding_rates) == list(expected_funding) == pairs
+    assert list(mark_rates) == list(expected_mark) == pairs
+    for pair in pairs:
+        assert_frame_equal(funding_rates[pair], expected_funding[pair])
+        assert_frame_equal(mark_rates[pair], expected_mark[pair])
+    assert not funding_rates['XRP/USDT:USDT'].empty
+    assert mark_rates['NOPAIR/USDT:USDT'].empty
+
+    with pytest.raises(OperationalException, match='No data found. Terminating.'):
+        load_funding_and_mark_data(testdatadir, '8h', ['NOPAIR/USDT:USDT'],
+                                   mark_candle_type=CandleType.FUTURES, fail_without_data=True)
+
+
 @pytest.mark.parametrize('candle_type', ['mark', ''])
 def test_load_data_with_new_pair_1min(ohlcv_history_list, mocker, caplog,
                                       default_conf, tmpdir, candle_type) -> None:
@@ -111,8 +156,9 @@ def test_load_data_with_new_pair_1min(ohlcv_history_list, mocker, caplog,
     Test load_pair_history() with 1 min timeframe
     """
     tmpdir1 = Path(tmpdir)
-    mocker.patch(f'{EXMS}.get_historic_ohlcv', return_value=ohlcv_history_list)
-    exchange = get_patched_exchange(mocker, default_conf)
+    api_mock = MagicMock()
+    api_mock.fetch_ohlcv = get_mock_coro(ohlcv_history_list)
+    exchange = get_patched_exchange(mocker, default_conf, api_mock)
     file = tmpdir1 / 'MEME_BTC-1m.feather'
 
     # do not download a new pair if refresh_pairs isn't set
@@ -130,7 +176,7 @@ def test_load_data_with_new_pair_1min(ohlcv_history_list, mocker, caplog,
     load_pair_history(datadir=tmpdir1, timeframe='1m', pair='MEME/BTC', candle_type=candle_type)
     assert file.is_file()
     assert log_has_re(
-        r'\(0/1\) - Download history data for "MEME/BTC", 1m, '
+        r'\(1/1\) - Download history data for "MEME/BTC", 1m, '
         r'spot and store in .*', caplog
     )
 
@@ -329,15 +375,58 @@ def test_download_pair_history2(mocker, default_conf, testdatadir) -> None:
     json_dump_mock = mocker.patch(
         'freqtrade.data.history.featherdatahandler.FeatherDataHandler.ohlcv_store',
         return_value=None)
+    append_mock = mocker.patch(
+        'freqtrade.data.history.featherdatahandler.FeatherDataHandler.ohlcv_append',
+        return_value=None)
     mocker.patch(f'{EXMS}.get_historic_ohlcv', return_value=tick)
     exchange = get_patched_exchange(mocker, default_conf)
+    # Existing data - new candles are appended
     _download_pair_history(datadir=testdatadir, exchange=exchange, pair="UNITTEST/BTC",
                            timeframe='1m', candle_type='spot')
     _download_pair_history(datadir=testdatadir, exchange=exchange, pair="UNITTEST/BTC",
                            timeframe='3m', candle_type='spot')
     _download_pair_history(datadir=testdatadir, exchange=exchange, pair="UNITTEST/USDT",
                            timeframe='1h', candle_type='mark')
-    assert json_dump_mock.call_count == 3
+    assert json_dump_mock.call_count == 2
+    assert append_mock.call_count == 1
+
+
+def test_download_pair_history_append(mocker, default_conf, tmp_path) -> None:
+    candles = [[1509836520000 + idx * 60000, 1.0, 2.0, 0.5, 1.5, 10.0] for idx in range(20)]
+    dl_mock = mocker.patch(f'{EXMS}.get_historic_ohlcv', return_value=candles[:10])
+    exchange = get_patched_exchange(mocker, default_conf)
+    dh = get_datahandler(tmp_path, 'feather')
+    filename = dh._pair_data_filename(tmp_path, 'UNITTEST/BTC', '1m', CandleType.SPOT)
+
+    assert _download_pair_history(datadir=tmp_path, exchange=exchange, pair='UNITTEST/BTC',
+                                  timeframe='1m', candle_type='spot')
+    assert dl_mock.call_args[1]['is_new_pair'] is True
+    # Last (incomplete) candle is dropped
+    assert dh.ohlcv_data_info('UNITTEST/BTC', '1m', CandleType.SPOT)['rows'] == 9
+
+    dl_mock.return_value = candles[8:]
+    load_mock = mocker.spy(dh, '_ohlcv_load')
+    assert _download_pair_history(datadir=tmp_path, exchange=exchange, pair='UNITTEST/BTC',
+                                  timeframe='1m', candle_type='spot', data_handler=dh)
+    assert dl_mock.call_args[1]['since_ms'] == candles[8][0]
+    assert dl_mock.call_args[1]['is_new_pair'] is False
+    # Stored data is not loaded
+    assert load_mock.call_count == 0
+    assert len(dh._ohlcv_segments(filename)) == 1
+
+    data = dh.ohlcv_load('UNITTEST/BTC', '1m', CandleType.SPOT, fill_missing=False)
+    assert len(data) == 19
+    assert data['date'].is_unique
+    assert data.iloc[-1]['date'].value // 10**6 == candles[18][0]
+
+    # Timerange starting before the stored data - everything is downloaded again
+    dl_mock.return_value = candles
+    assert _download_pair_history(datadir=tmp_path, exchange=exchange, pair='UNITTEST/BTC',
+                                  timeframe='1m', candle_type='spot', data_handler=dh,
+                                  timerange=TimeRange('date', None, candles[0][0] // 1000 - 60))
+    assert dl_mock.call_args[1]['since_ms'] == candles[0][0] - 60000
+    assert dh._ohlcv_segments(filename) == []
+    assert len(dh.ohlcv_load('UNITTEST/BTC', '1m', CandleType.SPOT, fill_missing=False)) == 19
 
 
 def test_download_backtesting_data_exception(mocker, caplog, default_conf, tmpdir) -> None:
@@ -506,7 +595,7 @@ def test_validate_backtest_data(default_conf, mocker, caplog, testdatadir) -> No
 def test_refresh_backtest_ohlcv_data(
         mocker, default_conf, markets, caplog, testdatadir, trademode, callcount):
     caplog.set_level(logging.DEBUG)
-    dl_mock = mocker.patch('freqtrade.data.history.history_utils._download_pair_history')
+    dl_mock = mocker.patch('freqtrade.data.history.history_utils._download_pairs_history')
     mocker.patch(f'{EXMS}.markets', PropertyMock(return_value=markets))
 
     mocker.patch.object(Path, "exists", MagicMock(return_value=True))
@@ -514,18 +603,59 @@ def test_refresh_backtest_ohlcv_data(
 
     ex = get_patched_exchange(mocker, default_conf)
     timerange = TimeRange.parse_timerange("20190101-20190102")
-    refresh_backtest_ohlcv_data(exchange=ex, pairs=["ETH/BTC", "XRP/BTC"],
+    refresh_backtest_ohlcv_data(exchange=ex, pairs=["ETH/BTC", "XRP/BTC", "ETH/BTC"],
                                 timeframes=["1m", "5m"], datadir=testdatadir,
                                 timerange=timerange, erase=True,
                                 trading_mode=trademode
                                 )
 
-    assert dl_mock.call_count == callcount
+    # All pairs and timeframes are downloaded at once
+    assert dl_mock.call_count == 1
+    jobs = dl_mock.call_args[0][0]
+    # Duplicates are removed by _download_pairs_history()
+    assert len(set(jobs)) == callcount
+    assert ('ETH/BTC', '1m', CandleType.get_default(trademode)) in jobs
+    if trademode == 'futures':
+        assert ('XRP/BTC', '8h', CandleType.FUNDING_RATE) in jobs
     assert dl_mock.call_args[1]['timerange'].starttype == 'date'
+    assert dl_mock.call_args[1]['erase'] is True
 
     assert log_has_re(r"Downloading pair ETH/BTC, .* interval 1m\.", caplog)
 
 
+def test_refresh_backtest_ohlcv_data_concurrently(mocker, default_conf, markets, caplog,
+                                                  tmp_path, ohlcv_history_list):
+    mocker.patch(f'{EXMS}.markets', PropertyMock(return_value=markets))
+
+    async def fetch_ohlcv(pair, timeframe, since=None, limit=None, params=None):
+        # Fake ccxt exchange
+        await asyncio.sleep(0.01)
+        return ohlcv_history_list
+
+    api_mock = MagicMock()
+    api_mock.fetch_ohlcv = fetch_ohlcv
+    ex = get_patched_exchange(mocker, default_conf, api_mock)
+    timerange = TimeRange.parse_timerange("20171126-20171127")
+    unav_pairs = refresh_backtest_ohlcv_data(
+        exchange=ex, pairs=["ETH/BTC", "XRP/BTC", "NOPE/BTC"], timeframes=["5m", "1h"],
+        datadir=tmp_path, timerange=timerange, trading_mode='spot')
+
+    assert unav_pairs == ["NOPE/BTC"]
+    for pair, timeframe in product(["ETH/BTC", "XRP/BTC"], ["5m", "1h"]):
+        data = load_pair_history(pair, timeframe, tmp_path, candle_type=CandleType.SPOT,
+                                 fill_up_missing=False)
+        # Last candle is dropped as incomplete
+        assert len(data) == len(ohlcv_history_list) - 1
+    assert log_has_re(r'\(\d/4\) - Download history data for "XRP/BTC", 1h, spot.*', caplog)
+    assert log_has("Downloaded 4/4 pairs / timeframes.", caplog)
+
+    # Duplicate pairs are downloaded once
+    caplog.clear()
+    refresh_data(datadir=tmp_path, timeframe='5m', pairs=['ETH/BTC', 'XRP/BTC', 'ETH/BTC'],
+                 exchange=ex, timerange=timerange, candle_type=CandleType.SPOT)
+    assert log_has("Downloaded 2/2 pairs / timeframes.", caplog)
+
+
 def test_download_data_no_markets(mocker, default_conf, caplog, testdatadir):
     dl_mock = mocker.patch('freqtrade.data.history.history_utils._download_pair_history',
                            MagicMock())
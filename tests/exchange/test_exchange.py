@@ -1,3 +1,4 @@
+import asyncio
 import copy
 import logging
 from copy import deepcopy
@@ -9,6 +10,7 @@ import ccxt
 import pytest
 from pandas import DataFrame
 
+from freqtrade.data.converter import resample_ohlcv
 from freqtrade.enums import CandleType, MarginMode, TradingMode
 from freqtrade.exceptions import (DDosProtection, DependencyException, ExchangeError,
                                   InsufficientFundsError, InvalidOrderException,
@@ -2008,6 +2010,51 @@ def test_get_historic_ohlcv(default_conf, mocker, caplog, exchange_name, candle_
     assert log_has_re(r"Async code raised an exception: .*", caplog)
 
 
+def test_get_historic_ohlcv_concurrently(default_conf, mocker, caplog):
+    api_mock = MagicMock()
+    running = []
+    max_running = []
+
+    async def fetch_ohlcv(pair, timeframe, since=None, limit=None, params=None):
+        # Fake ccxt exchange - returns one candle per call after a network delay.
+        running.append(pair)
+        max_running.append(len(set(running)))
+        await asyncio.sleep(0.01)
+        running.remove(pair)
+        return [[since, 1, 2, 3, 4, 5]]
+
+    api_mock.fetch_ohlcv = fetch_ohlcv
+    exchange = get_patched_exchange(mocker, default_conf, api_mock)
+    # Two calls per download
+    since = dt_ts(dt_now() - timedelta(minutes=5 * exchange.ohlcv_candle_limit('5m', 'spot') * 1.8))
+    jobs = [(pair, '5m', CandleType.SPOT) for pair in ['ETH/BTC', 'LTC/BTC', 'XRP/BTC', 'NEO/BTC']]
+    jobs.append(('TKN/BTC', '5m', CandleType.SPOT))
+    processed = {}
+
+    def prepare(job):
+        assert job in jobs
+        if job[0] == 'NEO/BTC':
+            # Nothing to download
+            return None
+        return since, None, False
+
+    def process(job, data):
+        if job[0] == 'XRP/BTC':
+            raise ValueError('Storing failed')
+        processed[job] = data
+
+    res = exchange.get_historic_ohlcv_concurrently(jobs, prepare, process, max_concurrent=2)
+
+    assert res == {job: job[0] != 'XRP/BTC' for job in jobs}
+    assert set(processed) == {jobs[0], jobs[1], jobs[4]}
+    assert all(len(data) == 2 for data in processed.values())
+    # Downloads overlap - but are limited to max_concurrent
+    assert max(max_running) == 2
+    assert log_has_re(r'Failed to download history data for pair: "XRP/BTC", timeframe: 5m.*',
+                      caplog)
+    assert log_has("Downloaded 5/5 pairs / timeframes.", caplog)
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize("exchange_name", EXCHANGES)
 @pytest.mark.parametrize('candle_type', [CandleType.MARK, CandleType.SPOT])
@@ -2220,6 +2267,9 @@ def test_refresh_latest_ohlcv_cache(mocker, default_conf, candle_type, time_mach
     assert len(res[pair2]) == 100
     # Verify index starts at 0
     assert res[pair2].at[0, 'open']
+    # Merged into the cached candles in place
+    assert res[pair1] is exchange._kline_buffers[pair1].view
+    assert exchange.klines(pair1, copy=False) is res[pair1]
     assert refresh_pior != exchange._pairs_last_refresh_time[pair1]
 
     assert exchange._pairs_last_refresh_time[pair1] == ohlcv[-2][0] // 1000
@@ -2248,6 +2298,100 @@ def test_refresh_latest_ohlcv_cache(mocker, default_conf, candle_type, time_mach
     assert res[pair2].at[0, 'open']
 
 
+@pytest.mark.parametrize('candle_type', [CandleType.FUTURES, CandleType.SPOT])
+def test_refresh_latest_ohlcv_derive_timeframes(mocker, default_conf, candle_type,
+                                                time_machine) -> None:
+    start = datetime(2021, 8, 1, 0, 0, 0, 0, tzinfo=timezone.utc)
+    time_machine.move_to(start + timedelta(minutes=300 * 5 - 2))
+    default_conf['derive_timeframes'] = True
+    exchange = get_patched_exchange(mocker, default_conf)
+    mocker.patch(f"{EXMS}.ohlcv_candle_limit", return_value=300)
+    candles = {
+        '5m': generate_test_data_raw('5m', 300, start.strftime('%Y-%m-%d')),
+        '1h': generate_test_data_raw('1h', 300, (start - timedelta(hours=275)).strftime(
+            '%Y-%m-%d %H:%M')),
+    }
+
+    async def fetch_ohlcv(pair, timeframe, since=None, limit=None, params=None):
+        return candles[timeframe]
+
+    exchange._api_async.fetch_ohlcv = MagicMock(side_effect=fetch_ohlcv)
+    base = ('IOTA/ETH', '5m', candle_type)
+    derived = ('IOTA/ETH', '1h', candle_type)
+    # Only available in one timeframe - nothing to derive from
+    single = ('XRP/ETH', '1h', candle_type)
+
+    res = exchange.refresh_latest_ohlcv([base, derived, single])
+    assert exchange._api_async.fetch_ohlcv.call_count == 2
+    fetched = {(c[0][0], c[1]['timeframe']) for c in exchange._api_async.fetch_ohlcv.call_args_list}
+    assert fetched == {('IOTA/ETH', '5m'), ('XRP/ETH', '1h')}
+    assert len(res) == 3
+    assert len(res[base]) == 299
+    # 299 5m candles cover 24 complete hours
+    assert len(res[derived]) == 24
+    assert res[derived].equals(resample_ohlcv(res[base], '5m', '1h'))
+    assert exchange.klines(derived).equals(res[derived])
+    assert len(res[single]) == 299
+
+    # One hour later - the derived candles are extended in place
+    time_machine.move_to(start + timedelta(minutes=312 * 5 - 2))
+    candles['5m'] = generate_test_data_raw('5m', 13, (start + timedelta(minutes=299 * 5)
+                                                      ).strftime('%Y-%m-%d %H:%M'))
+    exchange._api_async.fetch_ohlcv.reset_mock()
+    res = exchange.refresh_latest_ohlcv([base, derived])
+    assert exchange._api_async.fetch_ohlcv.call_count == 1
+    assert len(res[derived]) == 25
+    assert res[derived] is exchange._kline_buffers[derived].view
+    # Derived candles are kept, even once their base candles are aged out
+    assert res[derived].iloc[1:].reset_index(drop=True).equals(
+        resample_ohlcv(res[base], '5m', '1h'))
+
+    # Base candles don't cover startup_candle_count - download instead
+    exchange._startup_candle_count = 30
+    exchange._api_async.fetch_ohlcv.reset_mock()
+    exchange.refresh_latest_ohlcv([base, derived], cache=True)
+    fetched = {(c[0][0], c[1]['timeframe']) for c in exchange._api_async.fetch_ohlcv.call_args_list}
+    assert ('IOTA/ETH', '1h') in fetched
+
+
+def test_refresh_latest_ohlcv_on_refreshed(mocker, default_conf, time_machine) -> None:
+    start = datetime(2021, 8, 1, 0, 0, 0, 0, tzinfo=timezone.utc)
+    time_machine.move_to(start + timedelta(minutes=300 * 5 - 2))
+    default_conf['derive_timeframes'] = True
+    exchange = get_patched_exchange(mocker, default_conf)
+    mocker.patch(f"{EXMS}.ohlcv_candle_limit", return_value=300)
+    candles = generate_test_data_raw('5m', 300, start.strftime('%Y-%m-%d'))
+
+    async def fetch_ohlcv(pair, timeframe, since=None, limit=None, params=None):
+        if pair == 'XRP/ETH':
+            raise ccxt.BadSymbol('Unknown symbol')
+        if pair == 'IOTA/ETH':
+            # Slow download
+            await asyncio.sleep(0.1)
+        return candles
+
+    exchange._api_async.fetch_ohlcv = MagicMock(side_effect=fetch_ohlcv)
+    pairs = [
+        ('IOTA/ETH', '5m', CandleType.SPOT),
+        ('IOTA/ETH', '1h', CandleType.SPOT),
+        ('LTC/ETH', '5m', CandleType.SPOT),
+        ('XRP/ETH', '5m', CandleType.SPOT),
+    ]
+    refreshed = []
+    res = exchange.refresh_latest_ohlcv(pairs, on_refreshed=refreshed.append)
+    assert len(res) == 3
+    # Reported as they arrive - derived timeframes right after their base.
+    # Failed downloads are not reported.
+    assert refreshed == [pairs[2], pairs[0], pairs[1]]
+
+    # Cached candles are reported right away
+    refreshed.clear()
+    res = exchange.refresh_latest_ohlcv(pairs[:3], on_refreshed=refreshed.append)
+    assert len(res) == 3
+    assert set(refreshed) == set(pairs[:3])
+    assert refreshed.index(pairs[0]) < refreshed.index(pairs[1])
+
+
 @pytest.mark.parametrize("exchange_name", EXCHANGES)
 async def test__async_get_candle_history(default_conf, mocker, caplog, exchange_name):
     ohlcv = [
@@ -8,9 +8,9 @@ from ccxt import (DECIMAL_PLACES, ROUND, ROUND_DOWN, ROUND_UP, SIGNIFICANT_DIGIT
 from freqtrade.enums import RunMode
 from freqtrade.exceptions import OperationalException
 from freqtrade.exchange import (amount_to_contract_precision, amount_to_precision,
-                                date_minus_candles, price_to_precision, timeframe_to_minutes,
-                                timeframe_to_msecs, timeframe_to_next_date, timeframe_to_prev_date,
-                                timeframe_to_seconds)
+                                date_minus_candles, price_to_precision, timeframe_is_derivable,
+                                timeframe_to_minutes, timeframe_to_msecs, timeframe_to_next_date,
+                                timeframe_to_prev_date, timeframe_to_seconds)
 from freqtrade.exchange.check_exchange import check_exchange
 from tests.conftest import log_has_re
 
@@ -124,6 +124,22 @@ def test_timeframe_to_msecs():
     assert timeframe_to_msecs("1d") == 86400000
 
 
+@pytest.mark.parametrize('base,timeframe,expected', [
+    ('5m', '15m', True),
+    ('5m', '1h', True),
+    ('1h', '4h', True),
+    ('5m', '1d', True),
+    ('5m', '5m', False),
+    ('1h', '5m', False),
+    ('2h', '3h', False),
+    ('5m', '7m', False),  # Doesn't divide a day evenly
+    ('1h', '1w', False),
+    ('1d', '1M', False),
+])
+def test_timeframe_is_derivable(base, timeframe, expected):
+    assert timeframe_is_derivable(base, timeframe) is expected
+
+
 def test_timeframe_to_prev_date():
     # 2019-08-12 13:22:08
     date = datetime.fromtimestamp(1565616128, tz=timezone.utc)
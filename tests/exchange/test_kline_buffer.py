@@ -0,0 +1,128 @@
+import numpy as np
+import pytest
+from pandas import concat
+
+from freqtrade.data.converter import clean_ohlcv_dataframe, ohlcv_to_dataframe
+from freqtrade.exchange.kline_buffer import KlineBuffer
+from tests.conftest import generate_test_data, generate_test_data_raw
+
+
+def test_kline_buffer_view():
+    data = generate_test_data('1h', 50, '2022-01-01')
+    buffer = KlineBuffer(data, '1h', 30)
+
+    assert len(buffer) == 30
+    view = buffer.view
+    assert view is buffer.view
+    assert list(view.columns) == ['date', 'open', 'high', 'low', 'close', 'volume']
+    assert view.equals(data.tail(30).reset_index(drop=True))
+    # No copy of the data
+    assert np.shares_memory(view['close'].values, buffer._values)
+
+
+def test_kline_buffer_update():
+    data = generate_test_data('1h', 50, '2022-01-01')
+    buffer = KlineBuffer(data.iloc[:40], '1h', 30)
+    view = buffer.view
+
+    # Overlapping candles are replaced
+    new = data.iloc[38:45].copy()
+    new['close'] += 1
+    assert buffer.update(new)
+    assert buffer.view is not view
+    assert len(buffer) == 30
+    assert buffer.view['date'].iloc[-1] == data['date'].iloc[44]
+    assert buffer.view['close'].iloc[-7:].tolist() == new['close'].tolist()
+    assert buffer.view['close'].iloc[-8] == data['close'].iloc[37]
+
+    assert buffer.update(data.iloc[:0])
+    assert len(buffer) == 30
+
+    # Missing candles are filled up
+    last_close = buffer.view['close'].iloc[-1]
+    assert buffer.update(data.iloc[47:50])
+    assert buffer.view['date'].iloc[-1] == data['date'].iloc[49]
+    filled = buffer.view.iloc[-5:-3]
+    assert filled['date'].tolist() == data['date'].iloc[45:47].tolist()
+    assert (filled[['open', 'high', 'low', 'close']] == last_close).all().all()
+    assert (filled['volume'] == 0).all()
+    assert buffer.view['date'].diff().iloc[1:].nunique() == 1
+
+
+def test_kline_buffer_view_stable():
+    """
+    Views stay valid - and read-only - across updates.
+    """
+    data = generate_test_data('1h', 200, '2022-01-01')
+    buffer = KlineBuffer(data.iloc[:30], '1h', 30)
+    view = buffer.view
+    with pytest.raises(ValueError, match='read-only'):
+        view.loc[view.index[-1], 'close'] = 0
+
+    # Unchanged overlapping candles - appended without moving the buffered candles
+    storage = buffer._values
+    assert buffer.update(data.iloc[28:32])
+    assert buffer._values is storage
+    view1 = buffer.view
+    # The last candle is replaced - the buffered candles are copied to new storage
+    changed = data.iloc[31:34].copy()
+    changed['close'] += 1
+    assert buffer.update(changed)
+    assert buffer._values is not storage
+    assert buffer.view['close'].iloc[-3:].tolist() == changed['close'].tolist()
+
+    assert view.equals(data.iloc[:30].reset_index(drop=True))
+    assert view1.equals(data.iloc[2:32].reset_index(drop=True))
+
+    # Storage is compacted many times
+    views = []
+    for idx in range(34, 200, 7):
+        assert buffer.update(data.iloc[idx - 1:idx + 7])
+        views.append((buffer.view, buffer.view.copy()))
+    assert buffer.view.equals(data.tail(30).reset_index(drop=True))
+    for view, expected in views:
+        assert view.equals(expected)
+
+
+@pytest.mark.parametrize('start,stop', [
+    (5, 45),    # Starts before the buffered candles
+    (25, 35),   # Ends before the newest buffered candle
+    (200, 210),  # Gap larger than the window
+])
+def test_kline_buffer_update_rejected(start, stop):
+    data = generate_test_data('1h', 250, '2022-01-01')
+    buffer = KlineBuffer(data.iloc[10:40], '1h', 30)
+    view = buffer.view
+
+    assert not buffer.update(data.iloc[start:stop])
+    assert buffer.view is view
+    assert buffer.view.equals(data.iloc[10:40].reset_index(drop=True))
+
+    # Not aligned to the buffered candles
+    assert not KlineBuffer(data.iloc[10:40], '2h', 30).update(data.iloc[39:42])
+
+
+def test_kline_buffer_matches_dataframe_merge():
+    """
+    Repeated updates give the same result as concatenating and cleaning dataframes.
+    """
+    ticks = generate_test_data_raw('5m', 600, '2022-01-01')
+    window = 100
+    expected = ohlcv_to_dataframe(ticks[:80], '5m', 'UNITTEST/USDT', fill_missing=True,
+                                  drop_incomplete=False)
+    buffer = KlineBuffer(expected, '5m', window)
+    idx = 80
+    for step in range(1, 60):
+        # Skip candles every once in a while, to create gaps
+        start = idx - 1 + (step % 7 == 0)
+        idx += step % 5 + 1
+        new = ohlcv_to_dataframe(ticks[start:idx], '5m', 'UNITTEST/USDT', fill_missing=True,
+                                 drop_incomplete=False)
+        assert buffer.update(new)
+        # Reference: merged dataframe - with overlapping candles taken from `new`.
+        expected = expected[expected['date'] < new['date'].iloc[0]]
+        expected = clean_ohlcv_dataframe(concat([expected, new], axis=0), '5m',
+                                         'UNITTEST/USDT', fill_missing=True,
+                                         drop_incomplete=False).tail(window)
+        expected = expected.reset_index(drop=True)
+        assert buffer.view.equals(expected)
@@ -22,6 +22,7 @@ from freqtrade.enums import CandleType, ExitType, RunMode
 from freqtrade.exceptions import DependencyException, OperationalException
 from freqtrade.exchange import timeframe_to_next_date, timeframe_to_prev_date
 from freqtrade.optimize.backtest_caching import get_backtest_metadata_filename, get_strategy_run_id
+from freqtrade.optimize.backtest_columnar import DetailPairData, shift_signals
 from freqtrade.optimize.backtesting import Backtesting
 from freqtrade.persistence import LocalTrade, Trade
 from freqtrade.resolvers import StrategyResolver
@@ -768,9 +769,49 @@ def test_backtest_one(default_conf, fee, mocker, testdatadir) -> None:
                 t["close_rate"], 6) < round(ln1.iloc[0]["high"], 6))
 
 
+@pytest.mark.parametrize('backtest_engine', constants.BACKTEST_ENGINES)
+def test_backtest_checkpoints(default_conf, fee, mocker, testdatadir, backtest_engine) -> None:
+    default_conf['use_exit_signal'] = False
+    default_conf['max_open_trades'] = 10
+    default_conf['backtest_engine'] = backtest_engine
+    mocker.patch(f'{EXMS}.get_fee', fee)
+    mocker.patch(f"{EXMS}.get_min_pair_stake_amount", return_value=0.00001)
+    mocker.patch(f"{EXMS}.get_max_pair_stake_amount", return_value=float('inf'))
+    patch_exchange(mocker)
+    backtesting = Backtesting(default_conf)
+    backtesting._set_strategy(backtesting.strategylist[0])
+    timerange = TimeRange('date', None, 1517227800, 0)
+    data = history.load_data(datadir=testdatadir, timeframe='5m', pairs=['UNITTEST/BTC'],
+                             timerange=timerange)
+    processed = backtesting.strategy.advise_all_indicators(data)
+    min_date, max_date = get_timerange(processed)
+
+    checkpoints = []
+
+    def checkpoint_callback(results, current_time):
+        checkpoints.append((current_time, len(results['results'])))
+
+    backtesting.checkpoints = [dt_utc(2018, 1, 29, 20), dt_utc(2018, 1, 30, 4)]
+    backtesting.checkpoint_callback = checkpoint_callback
+    result = backtesting.backtest(deepcopy(processed), min_date, max_date)
+    assert len(result['results']) == 2
+    # Only closed trades are reported
+    assert checkpoints == [(dt_utc(2018, 1, 29, 20), 0), (dt_utc(2018, 1, 30, 4), 1)]
+
+    # Callback can stop the backtest
+    checkpoint_callback = MagicMock(side_effect=DependencyException('Pruned'))
+    backtesting.checkpoint_callback = checkpoint_callback
+    with pytest.raises(DependencyException, match='Pruned'):
+        backtesting.backtest(deepcopy(processed), min_date, max_date)
+    assert checkpoint_callback.call_count == 1
+
+
+@pytest.mark.parametrize('backtest_engine', constants.BACKTEST_ENGINES)
 @pytest.mark.parametrize('use_detail', [True, False])
-def test_backtest_one_detail(default_conf_usdt, fee, mocker, testdatadir, use_detail) -> None:
+def test_backtest_one_detail(default_conf_usdt, fee, mocker, testdatadir, use_detail,
+                             backtest_engine) -> None:
     default_conf_usdt['use_exit_signal'] = False
+    default_conf_usdt['backtest_engine'] = backtest_engine
     mocker.patch(f'{EXMS}.get_fee', fee)
     mocker.patch(f"{EXMS}.get_min_pair_stake_amount", return_value=0.00001)
     mocker.patch(f"{EXMS}.get_max_pair_stake_amount", return_value=float('inf'))
@@ -1302,9 +1343,11 @@ def test_backtest_alternate_buy_sell(default_conf, fee, mocker, testdatadir):
     assert len(results.loc[results['is_open']]) == 0
 
 
+@pytest.mark.parametrize('backtest_engine', constants.BACKTEST_ENGINES)
 @pytest.mark.parametrize("pair", ['ADA/BTC', 'LTC/BTC'])
 @pytest.mark.parametrize("tres", [0, 20, 30])
-def test_backtest_multi_pair(default_conf, fee, mocker, tres, pair, testdatadir):
+def test_backtest_multi_pair(default_conf, fee, mocker, tres, pair, testdatadir,
+                             backtest_engine):
 
     def _trend_alternate_hold(dataframe=None, metadata=None):
         """
@@ -1335,6 +1378,7 @@ def test_backtest_multi_pair(default_conf, fee, mocker, tres, pair, testdatadir)
         data[pair] = data[pair][tres:].reset_index()
     default_conf['timeframe'] = '5m'
     default_conf['max_open_trades'] = 3
+    default_conf['backtest_engine'] = backtest_engine
 
     backtesting = Backtesting(default_conf)
     backtesting._set_strategy(backtesting.strategylist[0])
@@ -1376,6 +1420,184 @@ def test_backtest_multi_pair(default_conf, fee, mocker, tres, pair, testdatadir)
     assert len(evaluate_result_multi(results['results'], '5m', 1)) == 0
 
 
+@pytest.mark.parametrize('use_detail', [True, False])
+def test_backtest_columnar_engine_identical(default_conf, fee, mocker, testdatadir, use_detail):
+
+    def _trend_tagged(dataframe=None, metadata=None):
+        multi = 17 if metadata['pair'] == 'ETH/BTC' else 13
+        dataframe['enter_long'] = np.where(dataframe.index % multi == 0, 1, 0)
+        dataframe['enter_tag'] = np.where(dataframe.index % 2 == 0, 'even', None)
+        dataframe['exit_long'] = np.where((dataframe.index + multi - 4) % multi == 0, 1, 0)
+        dataframe['exit_tag'] = np.where(dataframe['exit_long'] == 1, 'exit_sig', None)
+        dataframe['enter_short'] = 0
+        dataframe['exit_short'] = 0
+        return dataframe
+
+    mocker.patch(f"{EXMS}.get_min_pair_stake_amount", return_value=0.00001)
+    mocker.patch(f"{EXMS}.get_max_pair_stake_amount", return_value=float('inf'))
+    mocker.patch(f'{EXMS}.get_fee', fee)
+    patch_exchange(mocker)
+    default_conf['timeframe'] = '5m'
+    default_conf['max_open_trades'] = 2
+    default_conf['export'] = 'signals'
+    pairs = ['ADA/BTC', 'DASH/BTC', 'ETH/BTC', 'LTC/BTC']
+    timerange = TimeRange.parse_timerange('20180127-20180130')
+    data = history.load_data(datadir=testdatadir, timeframe='5m', pairs=pairs,
+                             timerange=timerange)
+    # Pair with missing start and a gap in the data
+    data['DASH/BTC'] = data['DASH/BTC'].drop(index=range(100, 120)).iloc[20:].reset_index()
+    if use_detail:
+        default_conf['timeframe_detail'] = '1m'
+
+    results = {}
+    loop_starts = {}
+    analyzed_len = {}
+    for engine in constants.BACKTEST_ENGINES:
+        default_conf['backtest_engine'] = engine
+        backtesting = Backtesting(default_conf)
+        backtesting._set_strategy(backtesting.strategylist[0])
+        backtesting.strategy.advise_entry = _trend_tagged
+        backtesting.strategy.advise_exit = _trend_tagged
+        backtesting.strategy.bot_loop_start = MagicMock()
+        if use_detail:
+            # Spread 5m candles out into 1m candles
+            for pair in ('ETH/BTC', 'LTC/BTC'):
+                detail = data[pair].loc[data[pair].index.repeat(5)].reset_index(drop=True)
+                detail['date'] += pd.to_timedelta(np.tile(np.arange(5), len(data[pair])),
+                                                  unit='m')
+                backtesting.detail_data[pair] = detail
+        processed = backtesting.strategy.advise_all_indicators(data)
+        min_date, max_date = get_timerange(processed)
+        results[engine] = backtesting.backtest(
+            processed=deepcopy(processed), start_date=min_date, end_date=max_date)
+        loop_starts[engine] = backtesting.strategy.bot_loop_start.call_count
+        analyzed_len[engine] = len(
+            backtesting.dataprovider.get_analyzed_dataframe('LTC/BTC', '5m')[0])
+        assert analyzed_len[engine] > 0
+
+    rows, columnar = results['rows'], results['columnar']
+    assert len(rows['results']) > 5
+    assert rows['results']['enter_tag'].notnull().any()
+    assert (rows['results']['exit_reason'] == 'exit_sig').any()
+    pd.testing.assert_frame_equal(rows['results'], columnar['results'])
+    assert rows['rejected_signals'] == columnar['rejected_signals']
+    assert rows['final_balance'] == columnar['final_balance']
+    assert loop_starts['rows'] == loop_starts['columnar']
+    assert analyzed_len['rows'] == analyzed_len['columnar']
+
+    # Sparse engine skips candles without signal or open trade - results don't change.
+    sparse = results['sparse']
+    pd.testing.assert_frame_equal(rows['results'], sparse['results'])
+    assert rows['rejected_signals'] == sparse['rejected_signals']
+    assert rows['final_balance'] == sparse['final_balance']
+    assert 0 < loop_starts['sparse'] < loop_starts['rows']
+    assert analyzed_len['rows'] == analyzed_len['sparse']
+
+
+def test_backtest_sparse_engine_bot_loop_start(default_conf, mocker, caplog):
+    patch_exchange(mocker)
+    default_conf['backtest_engine'] = 'sparse'
+    backtesting = Backtesting(default_conf)
+    assert not log_has_re(r".*implements bot_loop_start\(\).*", caplog)
+
+    strategy = backtesting.strategylist[0]
+    mocker.patch.object(type(strategy), 'bot_loop_start', MagicMock())
+    backtesting._set_strategy(strategy)
+    assert log_has_re(r".*implements bot_loop_start\(\), which is not called on candles "
+                      r"skipped by the `sparse` backtest engine.*", caplog)
+
+
+def test_columnar_pair_data(default_conf, mocker, testdatadir):
+    patch_exchange(mocker)
+    default_conf['timeframe'] = '1m'
+    backtesting = Backtesting(default_conf)
+    backtesting._set_strategy(backtesting.strategylist[0])
+    backtesting.strategy.advise_entry = _trend_alternate
+    data = history.load_data(datadir=testdatadir, timeframe='1m', pairs=['UNITTEST/BTC'])
+    processed = backtesting.strategy.advise_all_indicators(data)
+    as_lists = backtesting._get_ohlcv_as_lists(deepcopy(processed))['UNITTEST/BTC']
+    as_columns = backtesting._get_ohlcv_as_columns(deepcopy(processed))['UNITTEST/BTC']
+
+    assert len(as_columns) == len(as_lists)
+    assert as_columns.ohlc.dtype == np.float64
+    assert as_columns.signals.dtype == np.int8
+    for idx in (0, 5, 99, -1):
+        assert list(as_columns[idx]) == as_lists[idx]
+    with pytest.raises(IndexError):
+        as_columns[len(as_lists)]
+
+    as_columns.assign_steps(as_columns.dates[0] - 60 * 10**9, 60 * 10**9)
+    assert as_columns.row_index_at(1) == 0
+    assert as_columns.row_index_at(len(as_lists)) == len(as_lists) - 1
+    assert as_columns.row_index_at(len(as_lists) + 1) == -1
+
+
+def test_shift_signals(testdatadir):
+    data = history.load_data(datadir=testdatadir, timeframe='5m',
+                             pairs=['UNITTEST/BTC', 'ETH/BTC', 'LTC/BTC'])
+    df = data['UNITTEST/BTC']
+    df['enter_long'] = np.where(df.index % 3 == 0, 1, 0)
+    df['exit_long'] = np.where(df.index % 5 == 0, 2.0, np.nan)
+    df['enter_short'] = df.index % 7 == 0
+    df['enter_tag'] = np.where(df.index % 2 == 0, 'even', None)
+    df['exit_tag'] = np.nan
+    # Tags are shared between pairs
+    data['ETH/BTC']['enter_tag'] = np.where(data['ETH/BTC'].index % 2 == 0, 'even', 'odd')
+    data['LTC/BTC'] = data['LTC/BTC'].iloc[0:0]
+
+    shifted = shift_signals(data)
+    assert len(shifted['LTC/BTC']) == 0
+    assert shifted['LTC/BTC'].to_lists() == []
+    assert shifted['UNITTEST/BTC'].tags is shifted['ETH/BTC'].tags
+    assert sorted(shifted['ETH/BTC'].tags[:-1]) == ['even', 'odd']
+
+    rows = shifted['UNITTEST/BTC'].to_lists()
+    assert len(rows) == len(df) - 1
+    for idx in (0, 1, 4, 5, 6, 29):
+        # Candle of idx + 1 with signals of the previous candle
+        candle = df.iloc[idx + 1]
+        assert rows[idx][:5] == [candle['date'], candle['open'], candle['high'],
+                                 candle['low'], candle['close']]
+        assert rows[idx][5:] == [
+            int(idx % 3 == 0), 2 if idx % 5 == 0 else 0, int(idx % 7 == 0), 0,
+            'even' if idx % 2 == 0 else None, None]
+        assert list(shifted['UNITTEST/BTC'][idx]) == rows[idx]
+    # Unchanged input
+    assert df['exit_long'].isnull().any()
+
+
+def test_detail_pair_data(testdatadir):
+    detail = history.load_pair_history(pair='UNITTEST/BTC', timeframe='1m', datadir=testdatadir)
+    # Introduce a gap of 2 hours
+    detail = detail.drop(detail.index[200:320]).reset_index(drop=True)
+    indexed = DetailPairData(detail, 5)
+    assert indexed.source is detail
+
+    signals = (1, 0, 0, 0, 'tag', None)
+    candle_starts = [
+        detail['date'].iloc[0].floor('5min'),
+        detail['date'].iloc[120].floor('5min'),
+        detail['date'].iloc[200].floor('5min') - timedelta(minutes=30),  # in the gap
+        detail['date'].iloc[300] + timedelta(minutes=2),  # not aligned to the grid
+        detail['date'].iloc[0] - timedelta(days=1),
+        detail['date'].iloc[-1] + timedelta(days=1),
+    ]
+    for candle_start in candle_starts:
+        expected = detail.loc[
+            (detail['date'] >= candle_start) &
+            (detail['date'] < candle_start + timedelta(minutes=5))
+        ]
+        start, stop = indexed.candle_range(candle_start.value)
+        assert stop - start == len(expected)
+        rows = indexed.rows(start, stop, signals)
+        assert [list(row[:5]) for row in rows] == expected[
+            ['date', 'open', 'high', 'low', 'close']].values.tolist()
+        assert all(row[5:] == signals for row in rows)
+
+    empty = DetailPairData(detail.iloc[0:0], 5)
+    assert empty.candle_range(candle_starts[0].value) == (0, 0)
+
+
 def test_backtest_start_timerange(default_conf, mocker, caplog, testdatadir):
 
     patch_exchange(mocker)
@@ -2004,6 +2226,14 @@ def test_get_strategy_run_id(default_conf_usdt):
     x = get_strategy_run_id(strategy)
     assert isinstance(x, str)
 
+    # Engines with identical results share cached results - the sparse engine doesn't
+    strategy.config['backtest_engine'] = 'rows'
+    assert get_strategy_run_id(strategy) == x
+    strategy.config['backtest_engine'] = 'columnar'
+    assert get_strategy_run_id(strategy) == x
+    strategy.config['backtest_engine'] = 'sparse'
+    assert get_strategy_run_id(strategy) != x
+
 
 def test_get_backtest_metadata_filename():
     # Test with a file path
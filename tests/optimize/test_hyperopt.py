@@ -1,20 +1,25 @@
 # pragma pylint: disable=missing-docstring,W0212,C0103
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from functools import wraps
 from pathlib import Path
+from time import sleep
 from unittest.mock import ANY, MagicMock, PropertyMock
 
+import numpy as np
 import pandas as pd
 import pytest
 from filelock import Timeout
+from joblib import dump, load
 from skopt.space import Integer
 
 from freqtrade.commands.optimize_commands import setup_optimize_configuration, start_hyperopt
 from freqtrade.data.history import load_data
 from freqtrade.enums import ExitType, RunMode
 from freqtrade.exceptions import OperationalException
-from freqtrade.optimize.hyperopt import Hyperopt
+from freqtrade.optimize.hyperopt import MAX_LOSS, Hyperopt
 from freqtrade.optimize.hyperopt_auto import HyperOptAuto
+from freqtrade.optimize.hyperopt_indicator_cache import HyperoptIndicatorCache
 from freqtrade.optimize.hyperopt_tools import HyperoptTools
 from freqtrade.optimize.optimize_reports import generate_strategy_stats
 from freqtrade.optimize.space import SKDecimal
@@ -457,7 +462,7 @@ def test_generate_optimizer(mocker, hyperopt_conf) -> None:
     patch_exchange(mocker)
     mocker.patch.object(Path, 'open')
     mocker.patch('freqtrade.configuration.config_validation.validate_config_schema')
-    mocker.patch('freqtrade.optimize.hyperopt.load', return_value={'XRP/BTC': None})
+    mocker.patch('freqtrade.optimize.hyperopt.load', return_value={'XRP/BTC': pd.DataFrame()})
 
     optimizer_param = {
         'buy_plusdi': 0.02,
@@ -520,6 +525,163 @@ def test_generate_optimizer(mocker, hyperopt_conf) -> None:
     assert generate_optimizer_value == response_expected
 
 
+def test_generate_optimizer_prune(mocker, hyperopt_conf) -> None:
+    hyperopt_conf.update({'spaces': ['buy'], 'hyperopt_min_trades': 0,
+                          'hyperopt_prune_interval': 25})
+    patch_exchange(mocker)
+    mocker.patch('freqtrade.optimize.hyperopt.load', return_value={'XRP/BTC': pd.DataFrame()})
+    mocker.patch('freqtrade.optimize.hyperopt.PRUNE_MIN_EPOCHS', 1)
+    mocker.patch.object(Path, 'open')
+    hyperopt = Hyperopt(hyperopt_conf)
+    hyperopt.min_date = dt_utc(2017, 12, 10)
+    hyperopt.max_date = dt_utc(2017, 12, 14)
+    hyperopt.init_spaces()
+    backtesting = hyperopt.backtesting
+    backtesting.prepare_backtest(False)
+    bt_results = backtesting._get_backtest_results()
+
+    def backtest(processed, start_date, end_date):
+        for checkpoint in backtesting.checkpoints:
+            backtesting.checkpoint_callback(bt_results, checkpoint)
+        return bt_results
+
+    mocker.patch('freqtrade.optimize.hyperopt.Backtesting.backtest', side_effect=backtest)
+    assert hyperopt._get_checkpoints() == [dt_utc(2017, 12, 11), dt_utc(2017, 12, 12),
+                                           dt_utc(2017, 12, 13)]
+
+    hyperopt.calculate_loss = MagicMock(side_effect=[0.3, 0.2, 0.1, 0.0])
+    result = hyperopt.generate_optimizer([35, 0.02])
+    assert result['loss'] == 0.0
+    assert result['pruned'] is False
+    assert result['checkpoint_losses'] == [0.3, 0.2, 0.1]
+    # Epoch data isn't kept referenced by backtesting
+    assert backtesting.checkpoint_callback is None
+    assert backtesting.checkpoints == []
+
+    hyperopt._update_prune_thresholds(result['checkpoint_losses'])
+    assert hyperopt.prune_thresholds == {0: 0.3, 1: 0.2, 2: 0.1}
+
+    # Worse than the threshold at the 2nd checkpoint
+    hyperopt.calculate_loss = MagicMock(side_effect=[0.3, 0.25])
+    result = hyperopt.generate_optimizer([35, 0.02])
+    assert result['loss'] == MAX_LOSS
+    assert result['pruned'] is True
+    assert result['checkpoint_losses'] == [0.3, 0.25]
+    assert result['results_explanation'].endswith('Pruned at 2017-12-12 00:00:00.')
+    # Loss of the partial backtest is not calculated again
+    assert hyperopt.calculate_loss.call_count == 2
+    assert backtesting.checkpoint_callback is None
+
+    hyperopt._update_prune_thresholds(result['checkpoint_losses'])
+    assert hyperopt.prune_thresholds == {0: 0.3, 1: 0.225, 2: 0.1}
+
+
+def test_load_processed_data(mocker, hyperopt_conf, tmp_path, testdatadir) -> None:
+    patch_exchange(mocker)
+    hyperopt_conf['user_data_dir'] = tmp_path
+    (tmp_path / 'hyperopt_results').mkdir()
+    hyperopt = Hyperopt(hyperopt_conf)
+    data = load_data(testdatadir, '5m', ['UNITTEST/BTC', 'ETH/BTC'])
+    data['ETH/BTC']['enter_long'] = 0
+    data['ETH/BTC']['enter_tag'] = None
+    dump(data, hyperopt.data_pickle_file)
+    load_mock = mocker.patch('freqtrade.optimize.hyperopt.load', side_effect=load)
+
+    processed = hyperopt._load_processed_data()
+    assert load_mock.call_count == 1
+    assert list(processed) == ['UNITTEST/BTC', 'ETH/BTC']
+    pd.testing.assert_frame_equal(processed['ETH/BTC'], data['ETH/BTC'])
+    # Numeric columns are memory-mapped - shared between worker processes
+    for col in ['date', 'open', 'high', 'low', 'close', 'volume', 'enter_long']:
+        values = processed['ETH/BTC'][col].values
+        while values is not None and not isinstance(values, np.memmap):
+            values = values.base
+        assert isinstance(values, np.memmap)
+    # Existing columns can be modified in place within an epoch
+    df = processed['ETH/BTC']
+    mask = df['close'] > df['close'].median()
+    df.loc[mask, 'enter_long'] = 1
+    df.loc[mask, 'enter_tag'] = 'tag'
+    df.loc[df.index[0], 'date'] = df['date'].iloc[1]
+    assert df['enter_long'].sum() == mask.sum()
+    processed['UNITTEST/BTC']['close'] *= 2
+    processed['ETH/BTC']['new_column'] = 1
+
+    # Loaded only once - columns added or modified in one epoch don't leak into the next epoch
+    processed = hyperopt._load_processed_data()
+    assert load_mock.call_count == 1
+    assert 'new_column' not in processed['ETH/BTC'].columns
+    pd.testing.assert_frame_equal(processed['ETH/BTC'], data['ETH/BTC'])
+    pd.testing.assert_frame_equal(processed['UNITTEST/BTC'], data['UNITTEST/BTC'])
+
+    # Data was rewritten
+    hyperopt.data_pickle_version = 'new_version'
+    hyperopt._load_processed_data()
+    assert load_mock.call_count == 2
+    hyperopt.clean_hyperopt()
+    assert not hyperopt.data_pickle_file.is_file()
+
+
+def test_hyperopt_indicator_cache(mocker, hyperopt_conf, testdatadir) -> None:
+    patch_exchange(mocker)
+    hyperopt_conf['analyze_per_epoch'] = True
+    strategy = Hyperopt(hyperopt_conf).backtesting.strategy
+    calls = []
+
+    def populate_indicators(dataframe, metadata):
+        calls.append(metadata['pair'])
+        dataframe['close_scaled'] = dataframe['close'] * strategy.buy_rsi.value
+        dataframe['tag'] = 'long_tag_' * 10
+        return dataframe
+
+    strategy.populate_indicators = populate_indicators
+    data = load_data(testdatadir, '5m', ['UNITTEST/BTC', 'ETH/BTC'])
+    cache = HyperoptIndicatorCache(max_bytes=10**9)
+    initial_rsi = strategy.buy_rsi.value
+
+    analyzed = cache.advise_all_indicators(strategy, data)
+    assert len(calls) == 2
+    assert len(cache) == 2
+    # Object columns are measured including their contents
+    assert cache.size == sum(df.memory_usage(index=True, deep=True).sum()
+                             for df in analyzed.values())
+    assert 'close_scaled' not in data['ETH/BTC'].columns
+    analyzed['ETH/BTC']['enter_long'] = 1
+
+    # Parameter not used for indicators changed - indicators are not calculated again
+    strategy.sell_rsi.value = 80
+    cached = cache.advise_all_indicators(strategy, data)
+    assert len(calls) == 2
+    assert 'enter_long' not in cached['ETH/BTC'].columns
+    pd.testing.assert_frame_equal(cached['UNITTEST/BTC'], analyzed['UNITTEST/BTC'])
+
+    strategy.buy_rsi.value = 20
+    changed = cache.advise_all_indicators(strategy, data)
+    assert len(calls) == 4
+    assert (changed['ETH/BTC']['close_scaled'] == data['ETH/BTC']['close'] * 20).all()
+
+    # Back to the initial value
+    strategy.buy_rsi.value = initial_rsi
+    cache.advise_all_indicators(strategy, data)
+    assert len(calls) == 4
+    assert len(cache) == 4
+
+    # Least recently used results are evicted
+    entry_size = cache.size // 4
+    small_cache = HyperoptIndicatorCache(max_bytes=int(entry_size * 2.5))
+    small_cache.advise_all_indicators(strategy, {'ETH/BTC': data['ETH/BTC']})
+    strategy.buy_rsi.value = 20
+    small_cache.advise_all_indicators(strategy, {'ETH/BTC': data['ETH/BTC']})
+    strategy.buy_rsi.value = 10
+    small_cache.advise_all_indicators(strategy, {'ETH/BTC': data['ETH/BTC']})
+    assert len(small_cache) == 2
+    assert small_cache.size <= small_cache.max_bytes
+    strategy.buy_rsi.value = initial_rsi
+    calls.clear()
+    small_cache.advise_all_indicators(strategy, {'ETH/BTC': data['ETH/BTC']})
+    assert calls == ['ETH/BTC']
+
+
 def test_clean_hyperopt(mocker, hyperopt_conf, caplog):
     patch_exchange(mocker)
 
@@ -529,8 +691,9 @@ def test_clean_hyperopt(mocker, hyperopt_conf, caplog):
     unlinkmock = mocker.patch("freqtrade.optimize.hyperopt.Path.unlink", MagicMock())
     h = Hyperopt(hyperopt_conf)
 
-    assert unlinkmock.call_count == 2
+    assert unlinkmock.call_count == 3
     assert log_has(f"Removing `{h.data_pickle_file}`.", caplog)
+    assert log_has(f"Removing `{h.results_store.index_file}`.", caplog)
 
 
 def test_print_json_spaces_all(mocker, hyperopt_conf, capsys) -> None:
@@ -913,6 +1076,7 @@ def test_in_strategy_auto_hyperopt_with_parallel(mocker, hyperopt_conf, tmpdir,
         # Enforce parallelity
         'epochs': 2,
         'hyperopt_jobs': 2,
+        'hyperopt_indicator_cache_size': 100,
         'fee': fee.return_value,
     })
     hyperopt = Hyperopt(hyperopt_conf)
@@ -936,6 +1100,8 @@ def test_in_strategy_auto_hyperopt_with_parallel(mocker, hyperopt_conf, tmpdir,
     assert len(list(buy_rsi_range)) == 51
 
     hyperopt.start()
+    # Indicator cache memory is split between the worker processes
+    assert hyperopt.indicator_cache_max_bytes == 50 * 1024 * 1024
 
 
 def test_in_strategy_auto_hyperopt_per_epoch(mocker, hyperopt_conf, tmpdir, fee) -> None:
@@ -978,6 +1144,94 @@ def test_in_strategy_auto_hyperopt_per_epoch(mocker, hyperopt_conf, tmpdir, fee)
     assert go.call_count == 3
 
 
+def test_run_optimizer_async(mocker, hyperopt_conf, tmpdir, caplog) -> None:
+    patch_exchange(mocker)
+    (Path(tmpdir) / 'hyperopt_results').mkdir(parents=True)
+    hyperopt_conf.update({
+        'user_data_dir': Path(tmpdir),
+        'hyperopt_random_state': 42,
+        'epochs': 7,
+    })
+    hyperopt = Hyperopt(hyperopt_conf)
+    hyperopt.init_spaces()
+    hyperopt.random_state = 42
+    hyperopt.opt = hyperopt.get_optimizer(hyperopt.dimensions, 1)
+    mocker.patch('freqtrade.optimize.hyperopt.get_reusable_executor',
+                 return_value=ThreadPoolExecutor(max_workers=3))
+    calls = []
+
+    def generate_optimizer(raw_params):
+        calls.append(raw_params)
+        # Epochs take different amounts of time
+        sleep(0.01 * (len(calls) % 3))
+        return {'loss': len(calls)}
+
+    mocker.patch.object(hyperopt, 'generate_optimizer', side_effect=generate_optimizer)
+    evaluate_mock = mocker.patch.object(hyperopt, 'evaluate_result')
+    pbar = MagicMock()
+
+    hyperopt.run_optimizer_async(3, 0, pbar, 0)
+    assert len(calls) == 7
+    assert [call[0][1] for call in evaluate_mock.call_args_list] == [1, 2, 3, 4, 5, 6, 7]
+    assert pbar.update.call_count == 7
+    # Every point was told to the optimizer, without evaluating duplicates
+    assert len(hyperopt.opt.Xi) == 7
+    assert len({tuple(x) for x in hyperopt.opt.Xi}) == 7
+
+    # Continue after epochs evaluated already
+    evaluate_mock.reset_mock()
+    hyperopt.run_optimizer_async(3, 5, pbar, 0)
+    assert [call[0][1] for call in evaluate_mock.call_args_list] == [6, 7]
+
+    # No new points and nothing pending - stops instead of waiting forever
+    evaluate_mock.reset_mock()
+    mocker.patch.object(hyperopt, 'get_asked_points', return_value=([], []))
+    hyperopt.run_optimizer_async(3, 0, pbar, 0)
+    assert evaluate_mock.call_count == 0
+    assert log_has("No new points to evaluate, stopping hyperopt after 0 epochs.", caplog)
+
+
+def test_get_asked_points(mocker, hyperopt_conf, tmpdir) -> None:
+    patch_exchange(mocker)
+    (Path(tmpdir) / 'hyperopt_results').mkdir(parents=True)
+    hyperopt_conf.update({
+        'user_data_dir': Path(tmpdir),
+        'hyperopt_random_state': 42,
+        'spaces': ['buy'],
+    })
+    hyperopt = Hyperopt(hyperopt_conf)
+    hyperopt.init_spaces()
+    hyperopt.random_state = 42
+    hyperopt.opt = hyperopt.get_optimizer(hyperopt.dimensions, 1)
+
+    asked, is_random = hyperopt.get_asked_points(n_points=4)
+    assert len(asked) == 4
+    assert is_random == [False] * 4
+    assert len({tuple(x) for x in asked}) == 4
+
+    hyperopt.opt.tell(asked[:2], [1.0, 2.0])
+    # Index picks up told points
+    assert hyperopt._get_evaluated_points() == {tuple(x) for x in asked[:2]}
+
+    ask_mock = mocker.patch.object(hyperopt.opt, 'ask', return_value=asked)
+    rvs_mock = mocker.patch.object(hyperopt.opt.space, 'rvs', return_value=asked)
+    asked2, is_random = hyperopt.get_asked_points(n_points=4, pending=[asked[2]])
+    # Evaluated and pending points are never asked again
+    assert asked2 == [asked[3]]
+    assert is_random == [False]
+    assert ask_mock.call_count == 3
+    assert rvs_mock.call_count == 2
+
+    # Not pickled to workers
+    state = hyperopt.__getstate__()
+    assert state['_evaluated_points'] == set()
+    assert state['_evaluated_points_opt'] is None
+
+    # A new optimizer resets the index
+    hyperopt.opt = hyperopt.get_optimizer(hyperopt.dimensions, 1)
+    assert hyperopt._get_evaluated_points() == set()
+
+
 def test_SKDecimal():
     space = SKDecimal(1, 2, decimals=2)
     assert 1.5 in space
@@ -9,7 +9,8 @@ import rapidjson
 
 from freqtrade.constants import FTHYPT_FILEVERSION
 from freqtrade.exceptions import OperationalException
-from freqtrade.optimize.hyperopt_tools import HyperoptTools, hyperopt_serializer
+from freqtrade.optimize.hyperopt_tools import (HyperoptResultsStore, HyperoptTools,
+                                               hyperopt_serializer)
 from tests.conftest import CURRENT_TEST_STRATEGY, log_has, log_has_re
 
 
@@ -38,22 +39,65 @@ def test_save_results_saves_epochs(hyperopt, tmpdir, caplog) -> None:
 
     hyperopt._save_result(epochs[0])
     assert log_has(f"2 epochs saved to '{hyperopt.results_file}'.", caplog)
+    # Epochs are buffered
+    hyperopt.results_store.flush()
 
     hyperopt_epochs = HyperoptTools.load_filtered_results(hyperopt.results_file, {})
     assert len(hyperopt_epochs) == 2
     assert hyperopt_epochs[1] == 2
     assert len(hyperopt_epochs[0]) == 2
-
-    result_gen = HyperoptTools._read_results(hyperopt.results_file, 1)
-    epoch = next(result_gen)
-    assert len(epoch) == 1
-    assert epoch[0] == epochs[0]
-    epoch = next(result_gen)
-    assert len(epoch) == 1
-    epoch = next(result_gen)
-    assert len(epoch) == 0
-    with pytest.raises(StopIteration):
-        next(result_gen)
+    assert hyperopt_epochs[0] == [epochs[0], epochs[0]]
+
+
+def test_hyperopt_results_store(tmpdir, caplog) -> None:
+    results_file = Path(tmpdir / 'ut_results.fthypt')
+    epochs = [{'loss': float(i), 'is_best': i == 0, 'current_epoch': i + 1,
+               'params_dict': {'buy_rsi': i},
+               'results_metrics': {'total_trades': i, 'trades': [{'pair': 'ETH/BTC'}] * i}}
+              for i in range(4)]
+    # Results file written without index (e.g. by an older version)
+    with results_file.open('w') as f:
+        for epoch in epochs[:2]:
+            f.write(rapidjson.dumps(epoch) + '\n')
+
+    store = HyperoptResultsStore(results_file, flush_interval=60)
+    assert not store.index_file.is_file()
+    entries = store.load_index()
+    assert log_has(f"Indexed 2 epochs of '{results_file}'.", caplog)
+    assert store.index_file.is_file()
+    assert [e['loss'] for e in entries] == [0.0, 1.0]
+    # Only key metrics are part of the index
+    assert entries[1]['results_metrics'] == {'total_trades': 1}
+    assert 'params_dict' not in entries[1]
+    assert store.load_epochs(entries[::-1]) == epochs[1::-1]
+
+    # First epoch is written immediately, following epochs are buffered
+    store.append(epochs[2])
+    store.append(epochs[3])
+    assert len(HyperoptResultsStore(results_file).load_index()) == 3
+    store.flush()
+    caplog.clear()
+    entries = HyperoptResultsStore(results_file).load_index()
+    # Index is up to date - no epoch was parsed
+    assert not log_has_re("Indexed .*", caplog)
+    assert len(entries) == 4
+    assert store.load_epochs(entries) == epochs
+
+    # Outdated index is rebuilt
+    results_file.write_text(rapidjson.dumps(epochs[3]) + '\n')
+    entries = HyperoptResultsStore(results_file).load_index()
+    assert log_has(f"Indexed 1 epoch of '{results_file}'.", caplog)
+    assert len(entries) == 1
+    assert store.load_epochs(entries) == [epochs[3]]
+
+    # Rewritten to the same size - detected by the checksum of the last indexed epoch
+    caplog.clear()
+    changed = rapidjson.dumps({**epochs[3], 'loss': 4.0}) + '\n'
+    assert len(changed) == results_file.stat().st_size
+    results_file.write_text(changed)
+    entries = HyperoptResultsStore(results_file).load_index()
+    assert log_has(f"Indexed 1 epoch of '{results_file}'.", caplog)
+    assert [e['loss'] for e in entries] == [4.0]
 
 
 def test_load_previous_results2(mocker, testdatadir, caplog) -> None:
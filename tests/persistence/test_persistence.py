@@ -1842,6 +1842,55 @@ def test_get_trades_proxy(fee, use_db, is_short):
     Trade.use_db = True
 
 
+def test_get_trades_proxy_backtest_index(fee):
+    Trade.use_db = False
+    Trade.reset_trades()
+    start = datetime(2023, 1, 1, tzinfo=timezone.utc)
+    pairs = ['ETH/BTC', 'XRP/BTC', 'NEO/BTC']
+    trades = []
+    for i in range(30):
+        trade = Trade(
+            pair=pairs[i % 3], stake_amount=0.001, amount=10, open_rate=0.01,
+            fee_open=fee.return_value, fee_close=fee.return_value, exchange='binance',
+            open_date=start + timedelta(hours=i), is_open=True,
+        )
+        LocalTrade.add_bt_trade(trade)
+        trades.append(trade)
+    # Close trades out of order
+    for i in [*range(0, 20, 2), *range(1, 20, 2)]:
+        trade = trades[i]
+        trade.close_date = start + timedelta(hours=i + 2)
+        trade.is_open = False
+        trade.close_profit_abs = 0.0
+        LocalTrade.close_bt_trade(trade)
+
+    def expected(pair=None, is_open=None, open_date=None, close_date=None):
+        return {id(t) for t in trades
+                if (not pair or t.pair == pair)
+                and (is_open is None or t.is_open == is_open)
+                and (not open_date or t.open_date > open_date)
+                and (not close_date or (t.close_date and t.close_date > close_date))}
+
+    for pair in (None, *pairs, 'LTC/BTC'):
+        for is_open in (None, True, False):
+            for open_date in (None, start + timedelta(hours=5)):
+                for close_date in (None, start + timedelta(hours=10), start + timedelta(hours=50)):
+                    params = dict(pair=pair, is_open=is_open, open_date=open_date,
+                                  close_date=close_date)
+                    result = Trade.get_trades_proxy(**params)
+                    assert len(result) == len(expected(**params))
+                    assert {id(t) for t in result} == expected(**params)
+
+    closed = Trade.get_trades_proxy(is_open=False, close_date=start)
+    assert [t.close_date for t in closed] == sorted(t.close_date for t in closed)
+    assert 'LTC/BTC' not in LocalTrade.bt_trades_closed_pp
+    assert 'LTC/BTC' not in LocalTrade.bt_trades_open_pp
+
+    Trade.reset_trades()
+    assert Trade.get_trades_proxy(is_open=False) == []
+    Trade.use_db = True
+
+
 @pytest.mark.usefixtures("init_persistence")
 @pytest.mark.parametrize('is_short', [True, False])
 def test_get_trades__query(fee, is_short):
@@ -2076,8 +2125,8 @@ def test_Trade_object_idem():
         'from_json',
         'validate_string_len',
     )
-    EXCLUDES2 = ('trades', 'trades_open', 'bt_trades_open_pp', 'bt_open_open_trade_count',
-                 'total_profit')
+    EXCLUDES2 = ('trades', 'trades_open', 'bt_trades_open_pp', 'bt_trades_closed',
+                 'bt_trades_closed_pp', 'bt_open_open_trade_count', 'total_profit')
 
     # Parent (LocalTrade) should have the same attributes
     for item in trade:
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+import talib.abstract as ta
+
+from freqtrade.strategy import (IncrementalATR, IncrementalBollingerBands, IncrementalEMA,
+                                IncrementalRSI, IncrementalSMA)
+from freqtrade.vendor.qtpylib import indicators as qtpylib
+from tests.conftest import generate_test_data
+
+
+INDICATORS = [
+    (lambda: IncrementalSMA(20), lambda df: ta.SMA(df, timeperiod=20)),
+    (lambda: IncrementalEMA(20), lambda df: ta.EMA(df, timeperiod=20)),
+    (lambda: IncrementalRSI(14), lambda df: ta.RSI(df, timeperiod=14)),
+    (lambda: IncrementalATR(14), lambda df: ta.ATR(df, timeperiod=14)),
+    (lambda: IncrementalBollingerBands(20, stds=2),
+     lambda df: qtpylib.bollinger_bands(df['close'], window=20, stds=2)),
+]
+
+
+def _values(result):
+    return np.asarray(result, dtype=np.float64)
+
+
+@pytest.mark.parametrize('indicator,reference', INDICATORS)
+def test_incremental_indicator_full(indicator, reference):
+    data = generate_test_data('5m', 300, '2022-01-01')
+    result = indicator().update(data, 'ETH/BTC')
+    assert result.index.equals(data.index)
+    np.testing.assert_allclose(_values(result), _values(reference(data)), rtol=1e-10)
+
+
+@pytest.mark.parametrize('indicator,reference', INDICATORS)
+def test_incremental_indicator_sliding_window(indicator, reference):
+    data = generate_test_data('5m', 500, '2022-01-01')
+    expected = _values(reference(data))
+    ind = indicator()
+    for end in range(200, 501, 3):
+        window = data.iloc[end - 200:end].reset_index(drop=True)
+        result = ind.update(window, 'ETH/BTC')
+        # Carried state - matches calculating the indicator over all candles seen before.
+        np.testing.assert_allclose(_values(result), expected[end - 200:end], rtol=1e-10)
+
+    # Other pairs are independent
+    result = ind.update(data.iloc[300:].reset_index(drop=True), 'XRP/BTC')
+    np.testing.assert_allclose(_values(result), _values(reference(data.iloc[300:])),
+                               rtol=1e-10)
+
+
+def test_incremental_indicator_new_candles_only(mocker):
+    data = generate_test_data('5m', 300, '2022-01-01')
+    ema = IncrementalEMA(20)
+    calculate = mocker.spy(ema, '_calculate')
+    ema.update(data.iloc[:250], 'ETH/BTC')
+    assert calculate.call_args[0][1] == 250
+
+    ema.update(data.iloc[2:252], 'ETH/BTC')
+    assert calculate.call_args[0][1] == 2
+
+    # Unchanged candles - nothing to calculate
+    calculate.reset_mock()
+    result = ema.update(data.iloc[2:252], 'ETH/BTC')
+    assert calculate.call_count == 0
+    assert len(result) == 250
+
+    # Changed candle - calculated again, from the changed candle onwards
+    changed = data.iloc[3:253].copy()
+    changed.loc[250, 'close'] += 1
+    result = ema.update(changed, 'ETH/BTC')
+    assert calculate.call_args[0][1] == 3
+    full = data.iloc[:253].copy()
+    full.loc[250, 'close'] += 1
+    np.testing.assert_allclose(_values(result), _values(ta.EMA(full, timeperiod=20))[3:])
+
+    # Window jumped - all candles are calculated
+    result = ema.update(data.iloc[280:], 'ETH/BTC')
+    assert calculate.call_args[0][1] == 20
+    np.testing.assert_allclose(_values(result), _values(ta.EMA(data.iloc[280:], timeperiod=20)))
+
+    ema.reset('ETH/BTC')
+    ema.update(data.iloc[280:], 'ETH/BTC')
+    assert calculate.call_args[0][1] == 20
+    ema.reset()
+    assert not ema._cache
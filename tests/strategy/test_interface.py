@@ -1,17 +1,19 @@
 # pragma pylint: disable=missing-docstring, C0103
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from unittest.mock import MagicMock
 
 import pytest
 from pandas import DataFrame
+from pandas.testing import assert_frame_equal
 
 from freqtrade.configuration import TimeRange
 from freqtrade.constants import CUSTOM_TAG_MAX_LENGTH
 from freqtrade.data.dataprovider import DataProvider
 from freqtrade.data.history import load_data
-from freqtrade.enums import ExitCheckTuple, ExitType, HyperoptState, SignalDirection
+from freqtrade.enums import ExitCheckTuple, ExitType, HyperoptState, RunMode, SignalDirection
 from freqtrade.exceptions import OperationalException, StrategyError
 from freqtrade.optimize.hyperopt_tools import HyperoptStateContainer
 from freqtrade.optimize.space import SKDecimal
@@ -22,8 +24,8 @@ from freqtrade.strategy.parameters import (BaseParameter, BooleanParameter, Cate
                                            DecimalParameter, IntParameter, RealParameter)
 from freqtrade.strategy.strategy_wrapper import strategy_safe_wrapper
 from freqtrade.util import dt_now
-from tests.conftest import (CURRENT_TEST_STRATEGY, TRADE_SIDES, create_mock_trades, log_has,
-                            log_has_re)
+from tests.conftest import (CURRENT_TEST_STRATEGY, TRADE_SIDES, create_mock_trades,
+                            generate_test_data, log_has, log_has_re)
 
 from .strats.strategy_test_v3 import StrategyTestV3
 
@@ -118,6 +120,51 @@ def test_analyze_pair_empty(default_conf, mocker, caplog, ohlcv_history):
     assert log_has('Empty dataframe for pair ETH/BTC', caplog)
 
 
+def test_analyze_concurrently(default_conf, mocker, caplog):
+    pairs = ['ETH/BTC', 'LTC/BTC', 'XRP/BTC', 'NEO/BTC', 'EMPTY/BTC', 'FAIL/BTC']
+    data = {pair: generate_test_data('5m', 300 + 10 * idx, '2022-01-01')
+            for idx, pair in enumerate(pairs)}
+    data['EMPTY/BTC'] = DataFrame()
+
+    def analyze(workers):
+        default_conf['internals'] = {'analyze_workers': workers}
+        strategy = StrategyResolver.load_strategy(default_conf)
+        strategy.dp = DataProvider(default_conf, None)
+        mocker.patch.object(strategy.dp, 'ohlcv', side_effect=lambda pair, *args, **kwargs:
+                            data[pair].copy())
+        populate_indicators = strategy.populate_indicators
+
+        def fail_populate_indicators(dataframe, metadata):
+            if metadata['pair'] == 'FAIL/BTC':
+                raise ValueError('Indicator failure')
+            return populate_indicators(dataframe, metadata)
+
+        strategy.populate_indicators = fail_populate_indicators
+        set_cached_df = mocker.spy(strategy.dp, '_set_cached_df')
+        strategy.analyze(pairs)
+        return strategy, [call[0][0] for call in set_cached_df.call_args_list]
+
+    expected, expected_order = analyze(1)
+    caplog.clear()
+    executor_mock = mocker.patch('freqtrade.strategy.interface.ThreadPoolExecutor',
+                                 wraps=ThreadPoolExecutor)
+    strategy, order = analyze(3)
+    assert executor_mock.call_args[1]['max_workers'] == 3
+    assert order == expected_order == ['ETH/BTC', 'LTC/BTC', 'XRP/BTC', 'NEO/BTC']
+    for pair in order:
+        result = strategy.dp.get_analyzed_dataframe(pair, strategy.timeframe)[0]
+        assert_frame_equal(result, expected.dp.get_analyzed_dataframe(pair, strategy.timeframe)[0])
+        assert 'enter_long' in result.columns
+    assert log_has('Empty candle (OHLCV) data for pair EMPTY/BTC', caplog)
+    assert log_has('Unable to analyze candle (OHLCV) data for pair FAIL/BTC: Indicator failure',
+                   caplog)
+
+    # Candles were analyzed already
+    caplog.set_level(logging.DEBUG)
+    strategy.analyze(pairs)
+    assert log_has('Skipping TA Analysis for already analyzed candle', caplog)
+
+
 def test_get_signal_empty(default_conf, caplog):
     assert (None, None) == _STRATEGY.get_latest_candle(
         'foo', default_conf['timeframe'], DataFrame()
@@ -678,6 +725,47 @@ def test_analyze_ticker_default(ohlcv_history, mocker, caplog) -> None:
     assert not log_has('Skipping TA Analysis for already analyzed candle', caplog)
 
 
+def test_advise_indicators_incremental(mocker, default_conf) -> None:
+    default_conf['runmode'] = RunMode.DRY_RUN
+    data = generate_test_data('5m', 130, '2022-01-01')
+
+    def populate_indicators_incremental(dataframe, metadata):
+        new = dataframe.index[-metadata['new_candles']:]
+        if 'double' in dataframe:
+            # Indicators of unchanged candles are carried over
+            assert dataframe.loc[new, 'double'].isna().all()
+            assert dataframe['double'].notna().sum() == len(dataframe) - len(new)
+        dataframe.loc[new, 'double'] = dataframe.loc[new, 'close'] * 2
+        return dataframe
+
+    strategy = StrategyResolver.load_strategy(default_conf)
+    populate_mock = mocker.patch.object(
+        type(strategy), 'populate_indicators_incremental',
+        MagicMock(side_effect=populate_indicators_incremental))
+    indicators_mock = mocker.patch.object(type(strategy), 'populate_indicators')
+
+    def advise(dataframe):
+        result = strategy.advise_indicators(dataframe.reset_index(drop=True), {'pair': 'ETH/BTC'})
+        assert (result['double'] == result['close'] * 2).all()
+        return populate_mock.call_args[0][1]['new_candles']
+
+    assert advise(data.iloc[:100]) == 100
+    assert advise(data.iloc[1:101]) == 1
+    assert advise(data.iloc[3:103]) == 2
+    # Unchanged - the newest candle is calculated nevertheless
+    assert advise(data.iloc[3:103]) == 1
+    changed = data.iloc[3:103].copy()
+    changed.loc[50, 'volume'] += 1
+    assert advise(changed) == 53
+    # Gap - all candles are new
+    assert advise(data.iloc[110:130]) == 20
+    assert indicators_mock.call_count == 0
+
+    # Indicators are not carried over outside of dry / live mode
+    strategy.config['runmode'] = RunMode.BACKTEST
+    assert advise(data.iloc[110:130]) == 20
+
+
 def test__analyze_ticker_internal_skip_analyze(ohlcv_history, mocker, caplog) -> None:
     caplog.set_level(logging.DEBUG)
     ind_mock = MagicMock(side_effect=lambda x, meta: x)
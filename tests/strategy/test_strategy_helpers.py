@@ -270,6 +270,9 @@ def test_informative_decorator(mocker, default_conf_usdt, trading_mode):
         ('ETH/USDT', '30m', candle_def)]
     for inf_pair in informative_pairs:
         assert inf_pair in strategy.gather_informative_pairs()
+    # Informative timeframes of the analyzed pair itself are not shared
+    assert sorted(strategy.gather_informative_pairs(shared_only=True)) == sorted(
+        informative_pairs[4:])
 
     def test_historic_ohlcv(pair, timeframe, candle_type):
         return data[
@@ -24,7 +24,7 @@ from freqtrade.persistence.models import PairLock
 from freqtrade.plugins.protections.iprotection import ProtectionReturn
 from freqtrade.util.datetime_helpers import dt_now, dt_utc
 from freqtrade.worker import Worker
-from tests.conftest import (EXMS, create_mock_trades, create_mock_trades_usdt,
+from tests.conftest import (EXMS, create_mock_trades, create_mock_trades_usdt, generate_test_data,
                             get_patched_freqtradebot, get_patched_worker, log_has, log_has_re,
                             patch_edge, patch_exchange, patch_get_signal, patch_wallet,
                             patch_whitelist)
@@ -765,6 +765,77 @@ def test_process_informative_pairs_added(default_conf_usdt, ticker_usdt, mocker)
             CandleType.SPOT) in refresh_mock.call_args[0][0]
 
 
+def test_process_stream_analysis(default_conf_usdt, ticker_usdt, mocker) -> None:
+    patch_RPCManager(mocker)
+    patch_exchange(mocker)
+    default_conf_usdt['internals'] = {'stream_analysis': True}
+
+    def refresh_latest_ohlcv(pair_list, on_refreshed):
+        for pair_tf in pair_list:
+            on_refreshed(pair_tf)
+
+    refresh_mock = MagicMock(side_effect=refresh_latest_ohlcv)
+    mocker.patch.multiple(
+        EXMS,
+        fetch_ticker=ticker_usdt,
+        refresh_latest_ohlcv=refresh_mock,
+    )
+    inf_pairs = MagicMock(return_value=[("BTC/ETH", '1m', CandleType.SPOT)])
+    mocker.patch('time.sleep', return_value=None)
+
+    freqtrade = FreqtradeBot(default_conf_usdt)
+    freqtrade.strategy.informative_pairs = inf_pairs
+    analyze_mock = mocker.spy(freqtrade.strategy, 'analyze')
+    get_ohlcv_mock = mocker.spy(freqtrade.strategy, '_get_pair_ohlcv')
+    bot_loop_start_mock = mocker.spy(freqtrade.strategy, 'bot_loop_start')
+
+    freqtrade.process()
+    assert refresh_mock.call_count == 1
+    assert ("BTC/ETH", "1m", CandleType.SPOT) in refresh_mock.call_args[0][0]
+    assert analyze_mock.call_count == 0
+    assert bot_loop_start_mock.call_count == 1
+    # All pairs were handed to analysis
+    assert {c[0][0] for c in get_ohlcv_mock.call_args_list} == set(
+        freqtrade.active_pair_whitelist)
+
+
+def test_process_late_candles(default_conf_usdt, mocker) -> None:
+    patch_RPCManager(mocker)
+    patch_exchange(mocker)
+    refresh_mock = mocker.patch(f'{EXMS}.refresh_latest_ohlcv')
+    freqtrade = FreqtradeBot(default_conf_usdt)
+    analyze_mock = mocker.patch.object(freqtrade.strategy, 'analyze')
+    bot_loop_start_mock = mocker.spy(freqtrade.strategy, 'bot_loop_start')
+
+    freqtrade.process_late_candles(['ETH/USDT'])
+    # Only the late pairs are refreshed and analyzed
+    assert refresh_mock.call_args[0][0] == [
+        ('ETH/USDT', default_conf_usdt['timeframe'], CandleType.SPOT)]
+    analyze_mock.assert_called_once_with(['ETH/USDT'])
+    assert bot_loop_start_mock.call_count == 0
+
+
+def test_late_pairs(default_conf_usdt, mocker) -> None:
+    default_conf_usdt['runmode'] = RunMode.DRY_RUN
+    patch_RPCManager(mocker)
+    patch_exchange(mocker)
+    freqtrade = FreqtradeBot(default_conf_usdt)
+    freqtrade.active_pair_whitelist = ['ETH/USDT', 'XRP/USDT']
+    data = generate_test_data('5m', 20, '2022-01-01')
+    freqtrade.exchange._klines = {
+        ('ETH/USDT', '5m', CandleType.SPOT): data,
+        ('XRP/USDT', '5m', CandleType.SPOT): data.iloc[:-1],
+    }
+    assert freqtrade.late_pairs(data['date'].iloc[-2]) == []
+    assert freqtrade.late_pairs(data['date'].iloc[-1]) == ['XRP/USDT']
+    # XRP/USDT didn't trade in the previous candle either - the candle may never arrive
+    assert freqtrade.late_pairs(data['date'].iloc[-1] + timedelta(minutes=5)) == ['ETH/USDT']
+
+    # Pairs without candles are not waited for
+    freqtrade.active_pair_whitelist.append('NEO/USDT')
+    assert freqtrade.late_pairs(data['date'].iloc[-1]) == ['XRP/USDT']
+
+
 @pytest.mark.parametrize("is_short,trading_mode,exchange_name,margin_mode,liq_buffer,liq_price", [
     (False, 'spot', 'binance', None, 0.0, None),
     (True, 'spot', 'binance', None, 0.0, None),
@@ -1,8 +1,9 @@
 import logging
 import time
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock, PropertyMock
 
+import pytest
 import time_machine
 
 from freqtrade.data.dataprovider import DataProvider
@@ -124,6 +125,128 @@ def test_throttle_sleep_time(mocker, default_conf, caplog) -> None:
         assert 11.1 < sleep_mock.call_args[0][0] < 13.2
 
 
+def test_worker_candle_scheduler(mocker, default_conf, caplog) -> None:
+    caplog.set_level(logging.DEBUG)
+    default_conf['internals'] = {'candle_scheduler': True, 'process_throttle_secs': 5}
+    worker = get_patched_worker(mocker, default_conf)
+    freqtrade = worker.freqtrade
+    maintenance = mocker.patch.object(freqtrade, 'process_maintenance')
+    candles = mocker.patch.object(freqtrade, 'process_candles')
+    late_candles = mocker.patch.object(freqtrade, 'process_late_candles')
+    trades = mocker.patch.object(freqtrade, 'process_trades')
+    late_pairs = mocker.patch.object(freqtrade, 'late_pairs', return_value=[])
+    sleep_mock = mocker.patch("freqtrade.worker.Worker._sleep")
+    mocker.patch('freqtrade.worker.Worker._throttle', side_effect=Exception('Not called'))
+
+    def reset_mocks():
+        for mock in (maintenance, candles, late_candles, trades, sleep_mock):
+            mock.reset_mock()
+
+    with time_machine.travel("2022-09-01 05:00:00.5 +00:00", tick=False) as t:
+        assert worker._worker(old_state=None) == State.RUNNING
+        # Everything runs at startup
+        assert maintenance.call_count == 1
+        assert candles.call_count == 1
+        assert trades.call_count == 1
+        assert late_pairs.call_args[0][0] == datetime(2022, 9, 1, 4, 55, tzinfo=timezone.utc)
+        # Candle was available right away - candles are refreshed earlier next time
+        assert worker._candle_offset == pytest.approx(0.9)
+        assert worker._next_candle_task == datetime(
+            2022, 9, 1, 5, 5, 0, 900000, tzinfo=timezone.utc).timestamp()
+        assert sleep_mock.call_args[0][0] == pytest.approx(5)
+
+        # Between candles, only trades are handled
+        reset_mocks()
+        t.move_to("2022-09-01 05:00:10 +00:00")
+        worker._process_scheduled()
+        assert maintenance.call_count == 0
+        assert candles.call_count == 0
+        assert trades.call_count == 1
+
+        # Maintenance runs on its own timer
+        reset_mocks()
+        t.move_to("2022-09-01 05:01:01 +00:00")
+        worker._process_scheduled()
+        assert maintenance.call_count == 1
+        assert candles.call_count == 0
+        assert trades.call_count == 1
+
+        # Sleeps until the candle closes
+        reset_mocks()
+        t.move_to("2022-09-01 05:04:59 +00:00")
+        worker._process_scheduled()
+        assert sleep_mock.call_args[0][0] == pytest.approx(1.9)
+
+        # Candle not yet available - retry shortly
+        reset_mocks()
+        late_pairs.return_value = ['ETH/BTC', 'LTC/BTC']
+        t.move_to("2022-09-01 05:05:01 +00:00")
+        worker._process_scheduled()
+        assert maintenance.call_count == 1
+        assert candles.call_count == 1
+        # Trades are handled once the candle is available (or given up on)
+        assert trades.call_count == 0
+        assert sleep_mock.call_args[0][0] == pytest.approx(0.5)
+        assert log_has_re(r"Candle closed at .* not yet available for ETH/BTC, LTC/BTC, retrying\.",
+                          caplog)
+
+        # Only late pairs are refreshed on retry
+        reset_mocks()
+        late_pairs.return_value = ['LTC/BTC']
+        t.move_to("2022-09-01 05:05:01.5 +00:00")
+        worker._process_scheduled()
+        assert maintenance.call_count == 0
+        assert candles.call_count == 0
+        late_candles.assert_called_once_with(['ETH/BTC', 'LTC/BTC'])
+        assert trades.call_count == 0
+        assert sleep_mock.call_args[0][0] == pytest.approx(0.5)
+
+        reset_mocks()
+        late_pairs.return_value = []
+        t.move_to("2022-09-01 05:05:02 +00:00")
+        worker._process_scheduled()
+        assert maintenance.call_count == 0
+        assert candles.call_count == 0
+        late_candles.assert_called_once_with(['LTC/BTC'])
+        assert trades.call_count == 1
+        # Offset adapts to the observed latency
+        assert worker._candle_offset == pytest.approx(2)
+        assert worker._next_candle_task == datetime(
+            2022, 9, 1, 5, 10, 2, tzinfo=timezone.utc).timestamp()
+
+        # Give up waiting after 30s
+        reset_mocks()
+        late_pairs.return_value = ['ETH/BTC']
+        t.move_to("2022-09-01 05:10:31 +00:00")
+        worker._process_scheduled()
+        assert trades.call_count == 1
+        assert log_has_re(r"Candle closed at .* not available for ETH/BTC after 31\.0 s\.",
+                          caplog)
+        assert worker._candle_offset == pytest.approx(2)
+        assert worker._next_candle_task == datetime(
+            2022, 9, 1, 5, 15, 2, tzinfo=timezone.utc).timestamp()
+
+        # Pairs late for the previous candle are not waited for
+        reset_mocks()
+        caplog.clear()
+        t.move_to("2022-09-01 05:15:02 +00:00")
+        worker._process_scheduled()
+        assert candles.call_count == 1
+        assert not log_has_re(r"Candle closed at .* not yet available", caplog)
+        assert log_has_re(r"Not waiting for late pairs ETH/BTC\.", caplog)
+        assert worker._next_candle_task == datetime(
+            2022, 9, 1, 5, 20, 1, 800000, tzinfo=timezone.utc).timestamp()
+
+        # ... but other late pairs still are
+        reset_mocks()
+        late_pairs.return_value = ['ETH/BTC', 'LTC/BTC']
+        t.move_to("2022-09-01 05:20:01.8 +00:00")
+        worker._process_scheduled()
+        assert log_has_re(r"Candle closed at .* not yet available for LTC/BTC, retrying\.",
+                          caplog)
+        assert sleep_mock.call_args[0][0] == pytest.approx(0.5)
+
+
 def test_throttle_with_assets(mocker, default_conf) -> None:
     def throttled_func(nb_assets=-1):
         return nb_assets